@@ -0,0 +1,292 @@
+"""
+PDF 일괄 추출기
+
+폴더나 glob 패턴에 해당하는 PDF들을 여러 프로세스에서 동시에 PDFExtractor로 처리합니다.
+    - 문서마다 별도의 결과 폴더 (입력 폴더 구조 유지)
+    - 문서별 제한 시간 (넘으면 작업 프로세스를 종료하고 timeout으로 기록)
+    - 매니페스트(manifest.jsonl)에 문서별 결과(done/failed/timeout)를 기록하여,
+      중단된 작업을 다시 실행하면 끝난 문서는 건너뛰고 이어서 처리
+    - 처리량 요약 (pages/sec, docs/sec)
+
+사용 예:
+    python batch_extract_pdf_tables.py archive/ -o output -j 8 --timeout 600 -e pymupdf
+    python batch_extract_pdf_tables.py "archive/**/*.pdf" -o output --retry-failed
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from block_classifier import BlockClassifier
+from extract_pdf_tables import PDFExtractor
+
+# 매니페스트에 기록하는 문서 상태
+DONE, FAILED, TIMEOUT = "done", "failed", "timeout"
+
+
+class BatchManifest:
+    """문서별 처리 결과를 한 줄씩 추가 기록하는 JSONL 매니페스트
+
+    추가만 하므로 작업이 중간에 끊겨도 그때까지의 기록이 남고,
+    같은 문서가 여러 번 기록되면 마지막 기록을 사용합니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["pdf"]] = entry
+
+    def status(self, pdf_path: str) -> Optional[str]:
+        """문서의 마지막 처리 상태 (기록이 없으면 None)"""
+        entry = self.entries.get(pdf_path)
+        return entry["status"] if entry else None
+
+    def record(self, entry: Dict[str, Any]):
+        """처리 결과 기록 (바로 파일에 씀)"""
+        self.entries[entry["pdf"]] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def collect_pdfs(inputs: List[str]) -> List[Path]:
+    """파일, 폴더(하위 폴더 포함), glob 패턴에서 PDF 파일 목록 수집"""
+    pdfs = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.rglob("*")
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        pdfs.update(p.resolve() for p in candidates if p.is_file() and p.suffix.lower() == ".pdf")
+    return sorted(pdfs)
+
+
+def document_output_dirs(pdfs: List[Path], output_dir: Path) -> Dict[Path, Path]:
+    """문서별 결과 폴더 (공통 상위 폴더 기준의 상대 경로를 유지하여 이름 충돌 방지)"""
+    if not pdfs:
+        return {}
+    base = Path(os.path.commonpath([pdf.parent for pdf in pdfs]))
+    return {pdf: output_dir / pdf.relative_to(base).with_suffix("") for pdf in pdfs}
+
+
+def _run_document(pdf_path: str, output_dir: str, options: Dict[str, Any], results):
+    """(작업 프로세스) 문서 하나를 추출하고 결과를 큐로 전달
+
+    추출 과정의 출력은 문서 결과 폴더의 extract.log에 기록합니다.
+    """
+    started = time.perf_counter()
+    try:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        with open(Path(output_dir) / "extract.log", "w", encoding="utf-8") as log:
+            with redirect_stdout(log), redirect_stderr(log):
+                extractor = PDFExtractor(pdf_path, output_dir=output_dir, **options)
+                extractor.extract_all()
+                with extractor._open_document() as pdf:
+                    pages = len(extractor._document_pages(pdf))
+        results.put(
+            {
+                "pdf": pdf_path,
+                "status": DONE,
+                "pages": pages,
+                "text_blocks": extractor._count_text_blocks(),
+                "tables": len(extractor.tables),
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+        )
+    except Exception as e:
+        results.put(
+            {
+                "pdf": pdf_path,
+                "status": FAILED,
+                "error": f"{type(e).__name__}: {e}",
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+        )
+
+
+def run_batch(
+    pdfs: List[Path],
+    output_dir: str = "output",
+    jobs: int = 1,
+    timeout: Optional[float] = None,
+    retry_failed: bool = False,
+    start_method: Optional[str] = None,
+    **options,
+) -> Dict[str, Any]:
+    """여러 PDF를 동시에 추출
+
+    Args:
+        pdfs: PDF 파일 목록
+        output_dir: 결과 폴더 (문서별 하위 폴더와 manifest.jsonl 생성)
+        jobs: 동시에 처리할 문서 수 (작업 프로세스 수)
+        timeout: 문서별 제한 시간(초). None이면 제한 없음
+        retry_failed: True이면 이전에 failed/timeout으로 기록된 문서도 다시 처리
+        start_method: 작업 프로세스 시작 방식 ("fork", "spawn", "forkserver").
+            None이면 플랫폼 기본값
+        **options: PDFExtractor에 전달할 옵션 (engine, use_camelot, cache_dir 등)
+
+    Returns:
+        처리량 요약 (상태별 문서 수, 페이지 수, 소요 시간, pages/sec, docs/sec)
+    """
+    output_dir = Path(output_dir)
+    manifest = BatchManifest(output_dir / "manifest.jsonl")
+    output_dirs = document_output_dirs(pdfs, output_dir)
+
+    skip_statuses = {DONE} if retry_failed else {DONE, FAILED, TIMEOUT}
+    pending = [pdf for pdf in pdfs if manifest.status(str(pdf)) not in skip_statuses]
+    summary = {"skipped": len(pdfs) - len(pending), DONE: 0, FAILED: 0, TIMEOUT: 0, "pages": 0}
+    print(f"📚 PDF {len(pdfs)}개 중 {len(pending)}개 처리 (건너뜀: {summary['skipped']}개)")
+
+    def finish(entry: Dict[str, Any]):
+        manifest.record(entry)
+        summary[entry["status"]] += 1
+        summary["pages"] += entry.get("pages", 0)
+        done_count = summary[DONE] + summary[FAILED] + summary[TIMEOUT]
+        detail = entry.get("error") or f"{entry.get('pages', 0)}페이지"
+        print(f"  [{done_count}/{len(pending)}] {entry['status']:<7} {entry['pdf']} ({detail})")
+
+    ctx = multiprocessing.get_context(start_method)
+    results = ctx.Queue()
+    running = {}  # pdf 경로 → (프로세스, 시작 시각, 결과 폴더)
+    messages = {}
+    started = time.perf_counter()
+
+    try:
+        while pending or running:
+            # 빈 자리에 다음 문서 시작
+            while pending and len(running) < max(1, jobs):
+                pdf = pending.pop(0)
+                doc_output = output_dirs[pdf]
+                process = ctx.Process(
+                    target=_run_document,
+                    args=(str(pdf), str(doc_output), options, results),
+                    daemon=True,
+                )
+                process.start()
+                running[str(pdf)] = (process, time.monotonic(), doc_output)
+
+            # 프로세스 상태를 먼저 확인한 뒤 큐를 비워야, 끝난 프로세스의 결과를 놓치지 않음
+            alive = {pdf: process.is_alive() for pdf, (process, _, _) in running.items()}
+            try:
+                message = results.get(timeout=0.1)
+                messages[message["pdf"]] = message
+                while True:
+                    message = results.get_nowait()
+                    messages[message["pdf"]] = message
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            for pdf, (process, process_started, doc_output) in list(running.items()):
+                entry = {"pdf": pdf, "output": str(doc_output)}
+                if pdf in messages:
+                    process.join()
+                    entry.update(messages.pop(pdf))
+                elif not alive[pdf]:
+                    error = f"프로세스 비정상 종료 (exit code {process.exitcode})"
+                    entry.update(status=FAILED, error=error)
+                elif timeout is not None and now - process_started > timeout:
+                    process.terminate()
+                    process.join()
+                    seconds = round(now - process_started, 3)
+                    entry.update(status=TIMEOUT, error=f"{timeout}초 초과", seconds=seconds)
+                else:
+                    continue
+                del running[pdf]
+                finish(entry)
+    finally:
+        # 중단(Ctrl+C 등)되면 실행 중인 작업을 정리 (매니페스트에 없으므로 다음 실행에서 다시 처리)
+        for process, _, _ in running.values():
+            process.terminate()
+            process.join()
+
+    elapsed = time.perf_counter() - started
+    summary["seconds"] = round(elapsed, 3)
+    summary["pages_per_sec"] = round(summary["pages"] / elapsed, 2) if elapsed > 0 else 0.0
+    summary["docs_per_sec"] = round(summary[DONE] / elapsed, 3) if elapsed > 0 else 0.0
+    return summary
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="PDF 텍스트/테이블 일괄 추출기")
+    parser.add_argument("inputs", nargs="+", help="PDF 파일, 폴더 또는 glob 패턴 (예: 'docs/**/*.pdf')")
+    parser.add_argument("-o", "--output", default="output", help="결과 저장 폴더 (기본값: output)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="동시에 처리할 문서 수")
+    parser.add_argument("--timeout", type=float, help="문서별 제한 시간(초)")
+    parser.add_argument(
+        "--retry-failed", action="store_true", help="이전에 실패/시간 초과한 문서도 다시 처리"
+    )
+    parser.add_argument(
+        "-e", "--engine", choices=PDFExtractor.ENGINES, default="pdfplumber", help="페이지 추출 엔진"
+    )
+    parser.add_argument(
+        "--camelot",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Camelot으로 테이블 보완 (기본값: pdfplumber 엔진에서만 사용)",
+    )
+    parser.add_argument("--cache-dir", help="추출 결과 캐시 폴더")
+    parser.add_argument("--rules", help="텍스트 블록 분류 규칙 JSON 파일")
+    parser.add_argument("--streaming", action="store_true", help="문서별 메모리 사용량을 일정하게 유지")
+    parser.add_argument(
+        "--table-formats",
+        nargs="+",
+        choices=PDFExtractor.TABLE_FORMATS,
+        default=["csv", "xlsx"],
+        help="테이블 저장 형식 (기본값: csv xlsx)",
+    )
+    parser.add_argument(
+        "--excel-write-only", action="store_true", help="Excel을 write-only 모드로 저장"
+    )
+    args = parser.parse_args()
+
+    pdfs = collect_pdfs(args.inputs)
+    if not pdfs:
+        print(f"❌ PDF 파일을 찾을 수 없습니다: {' '.join(args.inputs)}")
+        sys.exit(1)
+
+    summary = run_batch(
+        pdfs,
+        output_dir=args.output,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        retry_failed=args.retry_failed,
+        engine=args.engine,
+        use_camelot=args.camelot,
+        cache_dir=args.cache_dir,
+        classifier=BlockClassifier.from_json(args.rules) if args.rules else None,
+        streaming=args.streaming,
+        table_formats=args.table_formats,
+        excel_write_only=args.excel_write_only,
+    )
+
+    print("\n✅ 일괄 처리 완료!")
+    print(
+        f"📊 완료 {summary[DONE]}개, 실패 {summary[FAILED]}개, 시간 초과 {summary[TIMEOUT]}개, "
+        f"건너뜀 {summary['skipped']}개"
+    )
+    print(
+        f"📊 {summary['pages']}페이지 / {summary['seconds']:.1f}초 "
+        f"({summary['pages_per_sec']:.1f} pages/sec, {summary['docs_per_sec']:.2f} docs/sec)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+make_base64_url 메모리/속도 벤치마크
+
+파일 크기별로 아래 방식의 최대 메모리(peak RSS 증가량)와 소요 시간을 비교합니다.
+    - legacy  : 기존 방식 (f.read() → b64encode → 문자열 연결)
+    - chunked : 조각 단위 인코딩 (첫 호출)
+    - memo    : 같은 파일을 다시 변환 (메모 캐시 적중)
+
+측정마다 별도 프로세스를 띄워 ru_maxrss(프로세스 최대 RSS)를 비교합니다.
+(resource 모듈을 사용하므로 Linux/macOS에서 실행하세요.)
+
+실행:
+    python benchmark_base64_url.py [크기(MB) ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD_CODE = """
+import json, resource, sys, time
+from base64 import b64encode
+from utils import get_mime_type, make_base64_url
+
+def legacy(file_path):
+    mime_type = get_mime_type(file_path)
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return f"data:{mime_type};base64," + b64encode(data).decode()
+
+mode, file_path = sys.argv[1], sys.argv[2]
+if mode == "memo":
+    make_base64_url(file_path=file_path)  # 메모 캐시 채우기
+
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+url = legacy(file_path) if mode == "legacy" else make_base64_url(file_path=file_path)
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+scale = 1 if sys.platform == "darwin" else 1024  # macOS는 bytes, Linux는 KB 단위
+print(json.dumps({"seconds": elapsed, "peak_delta": (peak - baseline) * scale}))
+"""
+
+
+def run_child(mode: str, file_path: str) -> dict:
+    """별도 프로세스에서 한 가지 방식을 측정합니다."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD_CODE, mode, file_path],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    sizes_mb = [int(arg) for arg in sys.argv[1:]] or [1, 10, 50]
+
+    print(f"{'크기':>8} {'방식':<8} {'시간(ms)':>10} {'peak RSS 증가(MB)':>18}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in sizes_mb:
+            file_path = os.path.join(tmp_dir, f"sample_{size_mb}mb.pdf")
+            with open(file_path, "wb") as f:
+                f.write(os.urandom(size_mb * 1024 * 1024))
+
+            for mode in ["legacy", "chunked", "memo"]:
+                result = run_child(mode, file_path)
+                print(
+                    f"{size_mb:>6}MB {mode:<8} {result['seconds'] * 1000:>10.1f} "
+                    f"{result['peak_delta'] / 1024 / 1024:>18.1f}"
+                )
+            time.sleep(0.1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+텍스트 블록 분류 속도 벤치마크
+
+한국어/영어 합성 텍스트 줄(기본 100만 줄)을 아래 방식으로 분류하여 초당 처리 줄 수를 비교합니다.
+    - legacy : 기존 _add_text_block 방식 (줄마다 re.match 목록과 키워드 검사를 반복)
+    - single : BlockClassifier.classify (줄마다 호출)
+    - batch  : BlockClassifier.classify_batch (한 번에 호출)
+    - batch+N: 규칙을 N개 더 추가한 분류기 (규칙 수가 늘어도 줄당 비용이 거의 같은지 확인)
+
+legacy와 결과가 같은지도 확인합니다. 기존 방식이 모르는 □ ― 기호 줄은 비교에서 제외하고,
+기존에 1단계 불릿으로 처리하던 ○ 줄은 보고서 2단계 항목으로 바뀐 것(의도된 차이)을 따로 셉니다.
+
+실행:
+    python benchmark_block_classifier.py [줄 수]
+"""
+
+import random
+import re
+import sys
+import time
+
+from block_classifier import DEFAULT_RULES, BlockClassifier, ClassificationRule
+
+KOREAN_WORDS = ["사업", "추진", "계획", "예산", "현황", "결과", "검토", "개선", "지원", "운영", "방안", "회의"]
+ENGLISH_WORDS = ["project", "budget", "plan", "review", "status", "result", "Summary", "Overview", "Évaluation"]
+# 라틴 악센트/그리스 대문자 줄도 넣어 str.isupper() 기반 기존 방식과 같게 판별하는지 확인
+PREFIXES = [
+    "", "", "", "", "1. ", "2) ", "가. ", "a) ", "- ", "• ", "○ ", "□ ", "― ", "제1장 ", "OVERVIEW ",
+    "ÉTAT ", "ΣΚΟΠΟΣ ",
+]
+
+
+def make_lines(count: int, seed: int = 0) -> list:
+    """접두 기호와 길이가 다양한 한국어/영어 합성 줄 생성"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        words = KOREAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS
+        body = " ".join(rng.choices(words, k=rng.choice([2, 5, 12, 30])))
+        lines.append(rng.choice(PREFIXES) + body)
+    return lines
+
+
+def legacy_classify(text: str) -> tuple:
+    """기존 _add_text_block의 판별 로직 (글자 크기 조건 제외)"""
+    is_heading = False
+    heading_level = 0
+    if len(text) < 100:
+        if re.match(r"^\d+[\.\)]\s+", text):
+            is_heading, heading_level = True, 2
+        elif text.isupper() or (text[0].isupper() and len(text) < 50):
+            is_heading, heading_level = True, 1
+        elif any(keyword in text.lower() for keyword in ["장", "절", "부", "팀", "담당"]):
+            is_heading, heading_level = True, 2
+
+    is_list = False
+    list_depth = 0
+    list_patterns = [
+        (r"^[○●▪▫•·]\s+", 1),
+        (r"^[-*+]\s+", 1),
+        (r"^\d+[\.\)]\s+", 1),
+        (r"^[가-하][\.\)]\s+", 2),
+        (r"^[a-z][\.\)]\s+", 2),
+    ]
+    for pattern, depth in list_patterns:
+        if re.match(pattern, text):
+            is_list, list_depth = True, depth
+            break
+
+    if is_heading:
+        return ("heading", heading_level)
+    if is_list:
+        return ("list_item", list_depth)
+    return ("paragraph", 0)
+
+
+def measure(name: str, func, lines: list):
+    """분류 함수의 소요 시간과 초당 줄 수 출력"""
+    start = time.perf_counter()
+    result = func(lines)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {elapsed:>8.2f}s {len(lines) / elapsed:>14,.0f}")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lines = make_lines(count)
+
+    classifier = BlockClassifier()
+    extra_rules = [
+        ClassificationRule(f"extra_{i}", rf"[①-⑳]{{{i + 1}}}\s+", "list_item", 3)
+        for i in range(20)
+    ]
+    extended = BlockClassifier(DEFAULT_RULES + extra_rules)
+
+    print(f"{count:,}줄 분류")
+    print(f"{'방식':<10} {'시간':>9} {'줄/초':>14}")
+    legacy = measure("legacy", lambda ls: [legacy_classify(t) for t in ls], lines)
+    measure("single", lambda ls: [classifier.classify(t) for t in ls], lines)
+    batch = measure("batch", classifier.classify_batch, lines)
+    measure(f"batch+{len(extra_rules)}", extended.classify_batch, lines)
+
+    # 기존 결과와 비교 (새 보고서 기호 □ ―로 시작하는 줄은 기존 방식이 모르므로 제외)
+    compared = mismatches = circle_lines = circle_changed = 0
+    for text, old, new in zip(lines, legacy, batch):
+        if text[0] in "□―":
+            continue
+        if text[0] == "○":
+            # ○는 기존에도 1단계 불릿이었고, 보고서 2단계 항목으로 바뀐 것은 의도된 차이
+            circle_lines += 1
+            if old == ("list_item", 1) and new == ("list_item", 2):
+                circle_changed += 1
+                continue
+        compared += 1
+        mismatches += old != new
+    print(f"\nlegacy와 결과가 다른 줄: {mismatches:,} / {compared:,}")
+    print(f"○ 줄 깊이 변경 (의도된 차이, 1 → 2): {circle_changed:,} / {circle_lines:,}")
+
+
+if __name__ == "__main__":
+    main()
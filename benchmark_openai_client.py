@@ -0,0 +1,73 @@
+"""
+OpenAI 클라이언트 재사용 벤치마크
+
+로컬 스텁 서버를 대상으로 아래 두 방식의 호출당 지연 시간(p50/p99)을 비교합니다.
+    - before: 호출마다 OpenAI 클라이언트를 새로 생성 (기존 make_response 방식)
+    - after : get_openai_client 레지스트리로 클라이언트/커넥션 재사용
+
+실행:
+    python benchmark_openai_client.py [호출 횟수]
+"""
+
+import statistics
+import sys
+import time
+
+from openai import OpenAI
+from openai_stub_server import OpenAIStubServer
+from utils import clear_openai_clients, make_response
+
+API_KEY = "stub-key"
+MESSAGES = [{"role": "user", "content": "안녕하세요"}]
+
+
+def percentile(values: list[float], q: int) -> float:
+    """q 백분위수(1~99)를 반환합니다."""
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def call_with_new_client(base_url: str) -> None:
+    """기존 방식: 매 호출마다 클라이언트(및 커넥션 풀)를 새로 생성"""
+    client = OpenAI(api_key=API_KEY, base_url=base_url)
+    client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+    client.close()
+
+
+def call_with_shared_client(base_url: str) -> None:
+    """개선 방식: make_response가 공유 클라이언트를 사용"""
+    make_response("안녕하세요", api_key=API_KEY, base_url=base_url)
+
+
+def measure(func, base_url: str, n: int) -> list[float]:
+    """func를 n번 호출하여 호출별 소요 시간(ms) 목록을 반환합니다."""
+    func(base_url)  # 워밍업
+    elapsed = []
+    for _ in range(n):
+        start = time.perf_counter()
+        func(base_url)
+        elapsed.append((time.perf_counter() - start) * 1000)
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"호출 횟수: {n}")
+    print(f"{'방식':<8} {'p50(ms)':>10} {'p99(ms)':>10} {'TCP 연결 수':>12}")
+
+    for label, func in [
+        ("before", call_with_new_client),
+        ("after", call_with_shared_client),
+    ]:
+        clear_openai_clients()
+        with OpenAIStubServer() as stub:
+            elapsed = measure(func, stub.base_url, n)
+            connections = stub.connection_count
+        print(
+            f"{label:<8} {percentile(elapsed, 50):>10.2f} "
+            f"{percentile(elapsed, 99):>10.2f} {connections:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+PDF 텍스트 추출 엔진 벤치마크 (PyPDF2 vs pdfplumber vs PyMuPDF)
+
+PyMuPDF로 재현 가능한(seed 고정) 합성 PDF 코퍼스를 만들고, 각 엔진의 아래 지표를 측정합니다.
+    - pages/sec      : 초당 처리 페이지 수
+    - peak RSS       : 추출 프로세스의 최대 메모리 사용량
+    - char agreement : 실제로 넣은 텍스트와 추출 텍스트의 문자 단위 일치율
+                       (공백 제외 문자 빈도의 F1, 페이지별로 비교)
+
+코퍼스 종류:
+    - text   : 영문 본문이 가득한 페이지
+    - table  : 괘선과 셀 텍스트로 이루어진 표 페이지
+    - korean : 한글 본문 페이지 (PyMuPDF 내장 CJK 폰트 "korea")
+
+측정마다 별도 프로세스를 띄워 ru_maxrss(프로세스 최대 RSS)를 비교합니다.
+(resource 모듈을 사용하므로 Linux/macOS에서 실행하세요.)
+결과는 회귀 추적을 위해 JSON 파일로 저장합니다.
+
+실행:
+    python benchmark_pdf_engines.py
+    python benchmark_pdf_engines.py --pages 1 10 100 2000 --kinds text korean -o result.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from itertools import zip_longest
+from pathlib import Path
+
+import pymupdf
+from pdf_text_engines import ENGINE_MODULES, available_engines
+
+CORPUS_KINDS = ("text", "table", "korean")
+CORPUS_VERSION = 1  # 코퍼스 생성 방식이 바뀌면 올려서 이전 파일을 다시 만들도록 함
+
+ENGLISH_WORDS = (
+    "the quarterly report shows revenue growth across all regional offices while operating "
+    "costs remained stable compared with the previous fiscal year and the board approved "
+    "additional investment in research development infrastructure and customer support"
+).split()
+KOREAN_WORDS = (
+    "분기 보고서 매출 성장 지역 사무소 운영 비용 전년 대비 안정 이사회 연구 개발 "
+    "인프라 고객 지원 추가 투자 승인 사업 계획 예산 집행 현황 검토 결과 개선 방안"
+).split()
+
+CHILD_CODE = """
+import json, resource, sys, time
+from pdf_text_engines import extract_text
+
+engine, pdf_path, text_path = sys.argv[1:4]
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+pages_text = extract_text(engine, pdf_path)
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+with open(text_path, "w", encoding="utf-8") as f:
+    json.dump(pages_text, f, ensure_ascii=False)
+
+scale = 1 if sys.platform == "darwin" else 1024  # macOS는 bytes, Linux는 KB 단위
+result = {"seconds": elapsed, "peak_rss": peak * scale, "peak_delta": (peak - baseline) * scale}
+print(json.dumps(result))
+"""
+
+
+def _text_page(page, rng: random.Random, words, fontname: str = "helv") -> str:
+    """본문 줄로 채운 페이지를 만들고 넣은 텍스트 반환"""
+    lines = [" ".join(rng.choices(words, k=10)) for _ in range(45)]
+    text = "\n".join(lines)
+    page.insert_text((50, 60), text, fontsize=10, fontname=fontname)
+    return text
+
+
+def _table_page(page, rng: random.Random) -> str:
+    """20행 x 5열 괘선 표 페이지를 만들고 넣은 텍스트 반환"""
+    shape = page.new_shape()
+    cells = []
+    for row in range(20):
+        for col in range(5):
+            rect = pymupdf.Rect(50 + col * 100, 60 + row * 30, 150 + col * 100, 90 + row * 30)
+            value = f"{rng.choice(ENGLISH_WORDS)}-{rng.randint(0, 9999)}"
+            shape.draw_rect(rect)
+            shape.insert_text((rect.x0 + 5, rect.y1 - 10), value, fontsize=9)
+            cells.append(value)
+    shape.finish(color=(0, 0, 0), width=0.5)
+    shape.commit()
+    return " ".join(cells)
+
+
+def make_corpus_pdf(kind: str, page_count: int, corpus_dir: Path, seed: int = 0) -> Path:
+    """합성 PDF와 페이지별 정답 텍스트(.truth.json) 생성 (이미 있으면 재사용)"""
+    pdf_path = corpus_dir / f"{kind}_{page_count}p_seed{seed}_v{CORPUS_VERSION}.pdf"
+    truth_path = pdf_path.with_suffix(".truth.json")
+    if pdf_path.exists() and truth_path.exists():
+        return pdf_path
+
+    rng = random.Random(f"{kind}-{page_count}-{seed}")
+    doc = pymupdf.open()
+    truth = []
+    for _ in range(page_count):
+        page = doc.new_page()
+        if kind == "text":
+            truth.append(_text_page(page, rng, ENGLISH_WORDS))
+        elif kind == "korean":
+            truth.append(_text_page(page, rng, KOREAN_WORDS, fontname="korea"))
+        elif kind == "table":
+            truth.append(_table_page(page, rng))
+        else:
+            raise ValueError(f"알 수 없는 코퍼스 종류입니다: {kind}")
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    doc.save(str(pdf_path), garbage=3, deflate=True)
+    doc.close()
+    truth_path.write_text(json.dumps(truth, ensure_ascii=False), encoding="utf-8")
+    return pdf_path
+
+
+def char_agreement(truth_pages: list, pages_text: list) -> float:
+    """정답과 추출 텍스트의 문자 단위 일치율 (공백 제외 문자 빈도의 F1, 페이지별 비교)"""
+    overlap = truth_total = extracted_total = 0
+    for truth, text in zip_longest(truth_pages, pages_text, fillvalue=""):
+        expected = Counter(re.sub(r"\s+", "", truth))
+        extracted = Counter(re.sub(r"\s+", "", text or ""))
+        overlap += sum((expected & extracted).values())
+        truth_total += sum(expected.values())
+        extracted_total += sum(extracted.values())
+    if truth_total + extracted_total == 0:
+        return 1.0
+    return 2 * overlap / (truth_total + extracted_total)
+
+
+def run_child(engine: str, pdf_path: Path) -> dict:
+    """별도 프로세스에서 한 엔진의 추출을 측정"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        text_path = os.path.join(tmp_dir, "pages.json")
+        completed = subprocess.run(
+            [sys.executable, "-c", CHILD_CODE, engine, str(pdf_path), text_path],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"exit code {completed.returncode}"}
+
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        with open(text_path, encoding="utf-8") as f:
+            result["pages_text"] = json.load(f)
+        return result
+
+
+def library_versions() -> dict:
+    """설치된 라이브러리 버전"""
+    versions = {}
+    for engine, module in ENGINE_MODULES.items():
+        if module is not None:
+            # PyMuPDF는 VersionBind에 버전이 있음
+            versions[engine] = getattr(module, "__version__", None) or getattr(
+                module, "VersionBind", None
+            )
+    return versions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 텍스트 추출 엔진 벤치마크")
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[1, 10, 100, 2000], help="문서 페이지 수 목록"
+    )
+    parser.add_argument(
+        "--kinds", nargs="+", choices=CORPUS_KINDS, default=list(CORPUS_KINDS), help="코퍼스 종류"
+    )
+    parser.add_argument("--engines", nargs="+", default=available_engines(), help="측정할 엔진")
+    parser.add_argument("--corpus-dir", default="benchmark_corpus", help="합성 PDF 저장 폴더 (재사용)")
+    parser.add_argument("--seed", type=int, default=0, help="코퍼스 생성 seed")
+    parser.add_argument("-o", "--output", default="benchmark_pdf_engines.json", help="결과 JSON 파일")
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus_dir)
+    results = []
+
+    print(
+        f"{'종류':<7} {'페이지':>6} {'엔진':<11} {'시간(s)':>9} {'pages/s':>9} "
+        f"{'peak RSS(MB)':>13} {'일치율':>8}"
+    )
+    for kind in args.kinds:
+        for page_count in args.pages:
+            pdf_path = make_corpus_pdf(kind, page_count, corpus_dir, seed=args.seed)
+            truth = json.loads(pdf_path.with_suffix(".truth.json").read_text(encoding="utf-8"))
+
+            for engine in args.engines:
+                measured = run_child(engine, pdf_path)
+                result = {"kind": kind, "pages": page_count, "engine": engine}
+                if "error" in measured:
+                    result["error"] = measured["error"]
+                    print(f"{kind:<7} {page_count:>6} {engine:<11} ❌ {measured['error']}")
+                else:
+                    seconds = measured["seconds"]
+                    result.update(
+                        seconds=round(seconds, 4),
+                        pages_per_sec=round(page_count / seconds, 2) if seconds > 0 else None,
+                        peak_rss_mb=round(measured["peak_rss"] / 1024 / 1024, 1),
+                        peak_delta_mb=round(measured["peak_delta"] / 1024 / 1024, 1),
+                        chars=sum(len(text or "") for text in measured["pages_text"]),
+                        char_agreement=round(char_agreement(truth, measured["pages_text"]), 4),
+                    )
+                    print(
+                        f"{kind:<7} {page_count:>6} {engine:<11} {seconds:>9.2f} "
+                        f"{result['pages_per_sec'] or 0:>9.1f} {result['peak_rss_mb']:>13.1f} "
+                        f"{result['char_agreement']:>8.1%}"
+                    )
+                results.append(result)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": library_versions(),
+        "corpus": {"seed": args.seed, "version": CORPUS_VERSION},
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
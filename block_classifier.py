@@ -0,0 +1,172 @@
+"""
+텍스트 블록 분류 규칙 엔진
+
+단락 텍스트가 제목(heading)인지, 목록(list_item)인지, 일반 단락(paragraph)인지를
+규칙 표에 따라 판별합니다. 규칙들은 생성할 때 한 번만 하나의 정규식(이름 붙은 그룹의
+alternation)으로 컴파일하므로, 규칙을 추가해도 줄마다 정규식을 여러 번 실행하지 않습니다.
+
+규칙은 위에서부터 우선순위를 가지며, max_len이 있는 규칙은 텍스트 길이가 max_len 미만일
+때만 적용됩니다. 길이 조건이 같은 구간끼리 정규식을 미리 만들어 두고 길이로 골라 씁니다.
+
+사용 예:
+    >>> classifier = BlockClassifier()  # 기본 규칙
+    >>> classifier.classify("□ 추진 배경")
+    ('list_item', 1)
+    >>> classifier = BlockClassifier.from_json("rules.json")  # 설정 파일의 규칙
+    >>> classifier.classify_batch(["1. 개요", "본문입니다."])
+    [('heading', 2), ('paragraph', 0)]
+
+설정 파일 형식 (JSON):
+    {
+      "rules": [
+        {"name": "report_box", "pattern": "□\\\\s*", "block_type": "list_item", "level": 1},
+        {"name": "short_title", "pattern": "[A-Z]", "block_type": "heading", "level": 1, "max_len": 50}
+      ]
+    }
+"""
+
+import json
+import re
+import sys
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (block_type, level)
+Classification = Tuple[str, int]
+
+PARAGRAPH: Classification = ("paragraph", 0)
+
+
+@dataclass
+class ClassificationRule:
+    """블록 분류 규칙
+
+    Attributes:
+        name: 규칙 이름 (정규식 그룹 이름으로 사용하므로 영문/숫자/_만 사용)
+        pattern: 텍스트 시작 부분에 매치할 정규식
+        block_type: 매치되면 지정할 블록 타입 ('heading', 'list_item' 등)
+        level: heading level 또는 list depth
+        max_len: 텍스트 길이가 이 값 미만일 때만 적용 (None이면 길이 제한 없음)
+    """
+
+    name: str
+    pattern: str
+    block_type: str
+    level: int = 0
+    max_len: Optional[int] = None
+
+
+def _char_class(predicate) -> str:
+    """predicate를 만족하는 모든 유니코드 문자를 정규식 문자 클래스 내용(범위 목록)으로 변환"""
+    ranges = []
+    start = prev = None
+    for code in range(sys.maxunicode + 1):
+        if predicate(chr(code)):
+            if start is None:
+                start = code
+            prev = code
+        elif start is not None:
+            ranges.append((start, prev))
+            start = None
+    if start is not None:
+        ranges.append((start, prev))
+    return "".join(
+        re.escape(chr(a)) if a == b else f"{re.escape(chr(a))}-{re.escape(chr(b))}" for a, b in ranges
+    )
+
+
+# str.isupper()와 같은 기준의 문자 클래스 (라틴 악센트 문자, 그리스/키릴 문자, 로마 숫자 등 포함)
+UPPER_CHARS = _char_class(str.isupper)
+# 대소문자가 있지만 대문자가 아닌 문자 (소문자, ǅ 같은 타이틀 문자)
+NON_UPPER_CASED_CHARS = _char_class(lambda ch: ch.islower() or ch.istitle() and not ch.isupper())
+
+# 기본 규칙 (위에 있을수록 우선)
+DEFAULT_RULES = [
+    # 제목 패턴들 (짧은 텍스트)
+    ClassificationRule("numbered_heading", r"\d+[\.\)]\s+", "heading", 2, max_len=100),  # 숫자로 시작하는 섹션
+    ClassificationRule(  # 모두 대문자 (str.isupper()와 같은 기준)
+        "upper_heading",
+        rf"(?=[^{NON_UPPER_CASED_CHARS}]*[{UPPER_CHARS}])[^{NON_UPPER_CASED_CHARS}]*\Z",
+        "heading",
+        1,
+        max_len=100,
+    ),
+    ClassificationRule("capitalized_heading", rf"[{UPPER_CHARS}]", "heading", 1, max_len=50),  # 대문자로 시작하고 짧은 경우
+    ClassificationRule("keyword_heading", r"(?=.*(?:장|절|부|팀|담당))", "heading", 2, max_len=100),  # 특수 키워드
+    # 보고서 목록 기호 (□ → ○ → ―)
+    ClassificationRule("report_box", r"□\s*", "list_item", 1),
+    ClassificationRule("report_circle", r"○\s*", "list_item", 2),
+    ClassificationRule("report_bar", r"―\s*", "list_item", 3),
+    # 일반 목록
+    ClassificationRule("bullet", r"[●▪▫•·]\s+", "list_item", 1),  # 불릿 포인트
+    ClassificationRule("dash", r"[-*+]\s+", "list_item", 1),  # 대시, 별표
+    ClassificationRule("numbered_list", r"\d+[\.\)]\s+", "list_item", 1),  # 숫자 리스트
+    ClassificationRule("hangul_list", r"[가-하][\.\)]\s+", "list_item", 2),  # 한글 리스트
+    ClassificationRule("alpha_list", r"[a-z][\.\)]\s+", "list_item", 2),  # 영문 소문자 리스트
+]
+
+
+class BlockClassifier:
+    """규칙 표를 하나의 정규식으로 컴파일한 블록 분류기"""
+
+    def __init__(self, rules: Optional[Iterable[ClassificationRule]] = None):
+        """
+        Args:
+            rules: 분류 규칙 목록 (앞쪽이 우선). None이면 DEFAULT_RULES
+        """
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"규칙 이름이 중복되었습니다: {names}")
+
+        self._results: Dict[str, Classification] = {
+            rule.name: (rule.block_type, rule.level) for rule in self.rules
+        }
+
+        # 길이 구간별 정규식: 구간 i는 thresholds[i-1] <= 길이 < thresholds[i]
+        self._thresholds = sorted({r.max_len for r in self.rules if r.max_len is not None})
+        self._patterns = [
+            self._compile([r for r in self.rules if r.max_len is None or r.max_len >= threshold])
+            for threshold in self._thresholds
+        ] + [self._compile([r for r in self.rules if r.max_len is None])]
+
+    @staticmethod
+    def _compile(rules: List[ClassificationRule]) -> Optional[re.Pattern]:
+        """규칙들을 (?P<이름>패턴)|... 형태의 정규식 하나로 컴파일"""
+        if not rules:
+            return None
+        return re.compile("|".join(f"(?P<{rule.name}>{rule.pattern})" for rule in rules))
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "BlockClassifier":
+        """{"rules": [...]} 형태의 설정으로 생성"""
+        return cls(ClassificationRule(**rule) for rule in config["rules"])
+
+    @classmethod
+    def from_json(cls, path: str) -> "BlockClassifier":
+        """JSON 설정 파일로 생성"""
+        return cls.from_config(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def to_config(self) -> Dict:
+        """현재 규칙을 설정(dict)으로 반환 (JSON으로 저장해 수정할 때 사용)"""
+        return {"rules": [asdict(rule) for rule in self.rules]}
+
+    def classify(self, text: str) -> Classification:
+        """텍스트 하나를 분류하여 (block_type, level) 반환"""
+        pattern = self._patterns[bisect_right(self._thresholds, len(text))]
+        match = pattern.match(text) if pattern else None
+        # 바깥 그룹이 가장 마지막에 닫히므로 lastgroup이 매치된 규칙 이름
+        return self._results[match.lastgroup] if match else PARAGRAPH
+
+    def classify_batch(self, texts: Iterable[str]) -> List[Classification]:
+        """여러 텍스트(예: 한 페이지의 단락들)를 한 번에 분류"""
+        patterns, thresholds, results = self._patterns, self._thresholds, self._results
+        classified = []
+        for text in texts:
+            pattern = patterns[bisect_right(thresholds, len(text))]
+            match = pattern.match(text) if pattern else None
+            classified.append(results[match.lastgroup] if match else PARAGRAPH)
+        return classified
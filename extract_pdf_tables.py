@@ -1,6 +1,14 @@
 import sys
+import os
 import json
 import re
+import hashlib
+import argparse
+import itertools
+import textwrap
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
@@ -10,10 +18,25 @@ warnings.filterwarnings("ignore")
 
 # 필수 라이브러리
 import camelot
+import numpy as np
 import pdfplumber
 import pandas as pd
+from openpyxl import Workbook
 from tabulate import tabulate
 
+# PyMuPDF 임포트 (engine="pymupdf"에서 사용)
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+# PyArrow 임포트 (테이블 Parquet/Arrow 저장에 사용)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
 # tqdm 임포트 (진행 표시)
 try:
     from tqdm import tqdm
@@ -23,6 +46,8 @@ except ImportError:
     TQDM_AVAILABLE = False
     tqdm = lambda x, **kwargs: x  # 더미 함수
 
+from block_classifier import BlockClassifier
+
 
 @dataclass
 class TextBlock:
@@ -36,236 +61,799 @@ class TextBlock:
     metadata: Dict = None
 
 
+# 추출 결과 캐시 버전 (추출/판별 로직이 바뀌면 올려서 이전 캐시를 무효화)
+EXTRACTOR_VERSION = "2"
+
+# 본문에 남기는 테이블 위치 마커: [TABLE_<페이지>_<페이지 내 테이블 번호>]
+TABLE_MARKER_PATTERN = re.compile(r"\[TABLE_(\d+)_(\d+)\]")
+
+
 @dataclass
 class TableData:
     """테이블 데이터"""
 
     data: List[List[str]]
     page_num: int
-    source: str  # 'pdfplumber' or 'camelot'
+    source: str  # 'pdfplumber', 'pymupdf' or 'camelot_<flavor>'
     confidence: float = 0.0
     bbox: Optional[Tuple[float, float, float, float]] = None
+    table_idx: int = 1  # 페이지 안에서 위에서부터 센 테이블 번호 (1부터 시작)
+
+
+@dataclass
+class TableRef:
+    """스트리밍 모드에서 JSONL 파일에 기록된 테이블의 위치와 요약 정보
+
+    교차 검증에 필요한 값만 메모리에 두고, 셀 데이터는 필요할 때 offset에서 읽습니다.
+    """
+
+    page_num: int
+    source: str
+    confidence: float
+    offset: int  # JSONL 파일 안에서 해당 줄의 시작 위치 (bytes)
+    table_idx: int = 1
+    bbox: Optional[Tuple[float, float, float, float]] = None
+
+
+class TableRegistry:
+    """(페이지, 테이블 번호, 소스)로 테이블을 찾는 색인
+
+    교차 검증에서 (페이지, 테이블 번호)마다 선택한 테이블도 기록하므로,
+    본문의 테이블 마커를 O(1)로 해당 테이블에 연결할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._tables: Dict[Tuple[int, int, str], Any] = {}
+        self._selected: Dict[Tuple[int, int], Any] = {}
+
+    def add(self, table):
+        self._tables[(table.page_num, table.table_idx, table.source)] = table
+
+    def get(self, page_num: int, table_idx: int, source: str):
+        """특정 소스의 테이블 반환 (없으면 None)"""
+        return self._tables.get((page_num, table_idx, source))
+
+    def select(self, table):
+        """(페이지, 테이블 번호)에 사용할 테이블 지정"""
+        self._selected[(table.page_num, table.table_idx)] = table
+
+    def selected(self, page_num: int, table_idx: int):
+        """(페이지, 테이블 번호)에 선택된 테이블 반환 (없으면 None)"""
+        return self._selected.get((page_num, table_idx))
+
+    def selected_tables(self) -> List:
+        """선택된 테이블 목록 (페이지, 테이블 번호 순)"""
+        return [self._selected[key] for key in sorted(self._selected)]
+
+    def groups(self) -> Dict[Tuple[int, int], List]:
+        """(페이지, 테이블 번호)별 후보 테이블 목록"""
+        groups = defaultdict(list)
+        for (page_num, table_idx, _), table in self._tables.items():
+            groups[(page_num, table_idx)].append(table)
+        return groups
+
+    def __len__(self) -> int:
+        return len(self._tables)
 
 
 class PDFExtractor:
     """고급 PDF 추출기"""
 
-    def __init__(self, pdf_path: str, output_dir: str = "output"):
+    # 페이지 추출 엔진: pdfplumber(정밀한 레이아웃/테이블), pymupdf(대량 처리용 고속 엔진)
+    ENGINES = ("pdfplumber", "pymupdf")
+
+    # 테이블 저장 형식: csv(테이블별 파일), xlsx(통합 Excel),
+    # parquet/arrow(모든 테이블의 셀을 한 파일에 모은 long format 데이터셋)
+    TABLE_FORMATS = ("csv", "xlsx", "parquet", "arrow")
+
+    # Camelot 후보 페이지 판별 기준
+    MIN_RULING_EDGES = 2  # 가로/세로 괘선이 각각 이 개수 이상이면 lattice 후보
+    MIN_GRID_ROWS = 3  # 정렬된 열을 가진 줄이 이 개수 이상이면 stream 후보
+    MIN_GRID_COLUMNS = 3  # 한 줄에서 정렬된 열이 이 개수 이상이어야 표의 행으로 인정
+    GRID_X_TOLERANCE = 5  # 같은 열로 보는 단어 시작 위치(x0) 오차 (pt)
+    GRID_COLUMN_GAP = 10  # 앞 단어와 이 간격(pt) 이상 떨어져야 새 열로 인정 (일반 띄어쓰기 제외)
+
+    # 교차 검증: 작은 테이블 영역의 이 비율 이상이 겹치면 같은 테이블로 판단
+    MIN_TABLE_OVERLAP = 0.5
+
+    # 텍스트 레이아웃 분석 기준
+    LINE_Y_TOLERANCE = 3  # 단어 아래쪽 위치(bottom) 차이가 이 값(pt) 이하면 같은 줄
+    PARAGRAPH_GAP_RATIO = 0.8  # 줄 간격이 글자 크기의 이 비율보다 크면 단락 구분
+    FONT_SIZE_CHANGE_RATIO = 0.1  # 글자 크기가 이 비율 이상 달라지면 단락 구분
+    HEADING_SIZE_RATIO = 1.2  # 본문 글자 크기의 이 배수 이상이면 제목
+    TITLE_SIZE_RATIO = 1.5  # 본문 글자 크기의 이 배수 이상이면 1단계 제목
+    MAX_HEADING_LENGTH = 200  # 글자가 커도 이 길이 이상인 단락은 제목이 아닌 본문
+
+    def __init__(
+        self,
+        pdf_path: str,
+        output_dir: str = "output",
+        workers: int = 1,
+        streaming: bool = False,
+        classifier: Optional[BlockClassifier] = None,
+        engine: str = "pdfplumber",
+        use_camelot: Optional[bool] = None,
+        cache_dir: Optional[str] = None,
+        table_formats: Tuple[str, ...] = ("csv", "xlsx"),
+        excel_write_only: bool = False,
+    ):
+        """
+        Args:
+            pdf_path: PDF 파일 경로
+            output_dir: 결과 저장 폴더
+            workers: 페이지 추출에 사용할 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+            streaming: True이면 페이지마다 결과를 JSONL 파일(extracted_stream.jsonl)에
+                기록하고 메모리에서 비웁니다. 페이지 수와 관계없이 메모리 사용량이 일정합니다.
+            classifier: 텍스트 블록 분류기 (None이면 기본 규칙)
+            engine: 페이지 텍스트/테이블 추출 엔진 ('pdfplumber' 또는 'pymupdf')
+            use_camelot: Camelot으로 테이블을 보완할지 여부.
+                None이면 pdfplumber 엔진에서만 사용 (pymupdf는 속도를 위해 사용하지 않음)
+            cache_dir: 추출 결과 캐시 폴더. 같은 PDF(SHA-256)를 같은 엔진/옵션으로 다시
+                처리하면 추출 없이 캐시에서 바로 결과 파일을 만듭니다. (None이면 사용 안 함)
+            table_formats: 테이블 저장 형식 목록 (TABLE_FORMATS 중에서 선택)
+            excel_write_only: True이면 openpyxl write-only 모드로 Excel을 저장합니다.
+                행을 바로 기록하므로 테이블 수와 관계없이 메모리 사용량이 일정합니다.
+                (헤더 서식은 적용하지 않음)
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"지원하지 않는 엔진입니다: {engine} (사용 가능: {', '.join(self.ENGINES)})")
+        if engine == "pymupdf" and pymupdf is None:
+            raise ImportError("pymupdf 엔진을 사용하려면 PyMuPDF를 설치하세요: pip install pymupdf")
+        unknown_formats = set(table_formats) - set(self.TABLE_FORMATS)
+        if unknown_formats:
+            raise ValueError(f"지원하지 않는 테이블 저장 형식입니다: {', '.join(sorted(unknown_formats))}")
+        if {"parquet", "arrow"} & set(table_formats) and pa is None:
+            raise ImportError("Parquet/Arrow로 저장하려면 PyArrow를 설치하세요: pip install pyarrow")
+
         self.pdf_path = Path(pdf_path)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = max(1, workers)
+        self.streaming = streaming
+        self.classifier = classifier or BlockClassifier()
+        self.engine = engine
+        self.use_camelot = engine == "pdfplumber" if use_camelot is None else use_camelot
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.table_formats = tuple(table_formats)
+        self.excel_write_only = excel_write_only
+        self.stream_path = self.output_dir / "extracted_stream.jsonl"
+        self._stream_file = None
+        self._streamed_blocks = 0
+        self._streamed_pages = 0
 
         # 결과 저장
         self.text_blocks: List[TextBlock] = []
         self.tables: List[TableData] = []
         self.comparison_report: List[str] = []
 
+        # Camelot을 실행할 페이지 (flavor → 페이지 번호)
+        self.camelot_pages: Dict[str, set] = {"lattice": set(), "stream": set()}
+
+        # 교차 검증 후 (페이지, 테이블 번호, 소스) 색인
+        self.table_registry = TableRegistry()
+
     def extract_all(self):
         """전체 추출 프로세스"""
         print(f"\n📄 PDF 파일 분석: {self.pdf_path}")
         print(f"📏 파일 크기: {self.pdf_path.stat().st_size / 1024:.1f} KB")
 
-        # pdfplumber로 추출
-        self._extract_with_pdfplumber()
-
-        # Camelot으로 테이블 보완
-        self._extract_tables_with_camelot()
-        self._cross_validate_tables()
+        cache_path = self._cache_path() if self.cache_dir else None
+        if cache_path and cache_path.exists():
+            print(f"\n⚡ 캐시에서 불러오는 중: {cache_path}")
+            self._load_cache(cache_path)
+        else:
+            self._extract_and_validate()
+            if cache_path:
+                self._save_cache(cache_path)
 
         # 결과 저장
         self._save_results()
 
         print(f"\n✅ 추출 완료!")
-        print(f"📊 텍스트 블록: {len(self.text_blocks)}개")
+        print(f"📊 텍스트 블록: {self._count_text_blocks()}개")
         print(f"📊 테이블: {len(self.tables)}개")
 
-    def _extract_with_pdfplumber(self):
-        """pdfplumber로 텍스트와 테이블 추출"""
-        print("\n🔄 pdfplumber로 추출 중...")
+    def _extract_and_validate(self):
+        """페이지 추출, Camelot 보완, 테이블 교차 검증"""
+        if self.streaming:
+            self._stream_file = open(self.stream_path, "wb")
 
-        with pdfplumber.open(str(self.pdf_path)) as pdf:
-            pages = tqdm(pdf.pages, desc="페이지 처리") if TQDM_AVAILABLE else pdf.pages
+        try:
+            # 페이지별 텍스트/테이블 추출
+            self._extract_pages()
+
+            # Camelot으로 테이블 보완
+            if self.use_camelot:
+                self._extract_tables_with_camelot()
+                self._flush_to_stream()
+        finally:
+            if self._stream_file:
+                self._stream_file.close()
+                self._stream_file = None
 
-            for page_num, page in enumerate(pages, 1):
-                # 텍스트 추출 (레이아웃 보존)
-                self._extract_text_with_layout(page, page_num)
-
-                # 테이블 추출
-                tables = page.extract_tables()
-                for table_idx, table in enumerate(tables):
-                    if table and len(table) > 1:  # 유효한 테이블만
-                        table_data = TableData(
-                            data=table,
-                            page_num=page_num,
-                            source="pdfplumber",
-                            confidence=self._calculate_table_confidence(table),
-                        )
-                        self.tables.append(table_data)
-
-                        # 테이블 위치에 마커 추가
-                        self.text_blocks.append(
-                            TextBlock(
-                                text=f"[TABLE_{page_num}_{table_idx + 1}]",
-                                block_type="table",
-                                page_num=page_num,
-                            )
+        self._cross_validate_tables()
+
+    def _cache_path(self) -> Path:
+        """PDF 내용(SHA-256), 엔진, 추출기 버전, 옵션으로 만든 캐시 파일 경로
+
+        파일 이름: <PDF SHA-256>-<옵션 해시 앞 16자리>.jsonl
+        """
+        digest = hashlib.sha256()
+        with open(self.pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        # workers/streaming은 결과가 같으므로 키에 넣지 않음
+        options = {
+            "version": EXTRACTOR_VERSION,
+            "engine": self.engine,
+            "use_camelot": self.use_camelot,
+            "rules": self.classifier.to_config(),
+        }
+        raw = json.dumps(options, ensure_ascii=False, sort_keys=True)
+        options_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest.hexdigest()}-{options_hash[:16]}.jsonl"
+
+    def _save_cache(self, cache_path: Path):
+        """교차 검증까지 끝난 블록/테이블/비교 리포트를 JSONL 캐시 파일로 저장
+
+        스트리밍 모드와 같은 형식이며, 임시 파일에 쓴 뒤 교체하므로 중간에 실패해도
+        깨진 캐시가 남지 않습니다.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            for block in self._iter_text_blocks():
+                f.write(self._to_jsonl("block", block))
+            for table in self.tables:
+                f.write(self._to_jsonl("table", self._load_table(table)))
+            for line in self.comparison_report:
+                record = {"type": "report", "text": line}
+                f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        os.replace(tmp_path, cache_path)
+        print(f"  ✅ 캐시 저장: {cache_path}")
+
+    def _load_cache(self, cache_path: Path):
+        """캐시 파일에서 교차 검증된 결과를 불러옴
+
+        스트리밍 모드에서는 캐시 파일을 그대로 스트림 파일로 사용하므로
+        테이블 셀 데이터를 메모리에 올리지 않습니다.
+        """
+        self.text_blocks, self.tables, self.comparison_report = [], [], []
+        self.table_registry = TableRegistry()
+        if self.streaming:
+            self.stream_path = cache_path
+
+        offset = 0
+        with open(cache_path, "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                record_type = record.pop("type")
+                if record_type == "block":
+                    block = TextBlock(**record)
+                    if self.streaming:
+                        self._streamed_blocks += 1
+                        self._streamed_pages = max(self._streamed_pages, block.page_num)
+                    else:
+                        self.text_blocks.append(block)
+                elif record_type == "table":
+                    table = TableData(**record)
+                    if self.streaming:
+                        table = TableRef(
+                            page_num=table.page_num,
+                            source=table.source,
+                            confidence=table.confidence,
+                            offset=offset,
+                            table_idx=table.table_idx,
+                            bbox=table.bbox,
                         )
+                    self.tables.append(table)
+                    self.table_registry.add(table)
+                    self.table_registry.select(table)
+                elif record_type == "report":
+                    self.comparison_report.append(record["text"])
+                offset += len(line)
 
-    def _extract_text_with_layout(self, page, page_num: int):
-        """레이아웃을 보존하며 텍스트 추출"""
-        # 텍스트를 문자 단위로 추출하여 스타일 정보 분석
-        chars = page.chars if hasattr(page, "chars") else []
-
-        # 폰트 크기별로 그룹화 (heading 감지용)
-        font_sizes = {}
-        for char in chars:
-            size = round(char.get("height", 0))
-            if size not in font_sizes:
-                font_sizes[size] = []
-            font_sizes[size].append(char)
-
-        # 평균 폰트 크기 계산
-        if font_sizes:
-            sizes = list(font_sizes.keys())
-            avg_size = sum(sizes) / len(sizes) if sizes else 12
-        else:
-            avg_size = 12
+    def _flush_to_stream(self):
+        """(스트리밍 모드) 메모리에 쌓인 블록과 테이블을 JSONL 파일에 기록하고 비움
 
-        # 텍스트 라인별로 추출
-        text = page.extract_text()
-        if not text:
+        테이블은 교차 검증에 필요한 요약 정보(TableRef)만 메모리에 남깁니다.
+        """
+        if not self._stream_file:
             return
 
-        lines = text.split("\n")
-        current_paragraph = []
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                # 빈 줄 = 단락 구분
-                if current_paragraph:
-                    paragraph_text = " ".join(current_paragraph)
-                    self._add_text_block(paragraph_text, page_num, avg_size)
-                    current_paragraph = []
-                continue
+        f = self._stream_file
+        for block in self.text_blocks:
+            f.write(self._to_jsonl("block", block))
+            self._streamed_pages = max(self._streamed_pages, block.page_num)
+        self._streamed_blocks += len(self.text_blocks)
+        self.text_blocks = []
+
+        for idx, table in enumerate(self.tables):
+            if isinstance(table, TableData):
+                offset = f.tell()
+                f.write(self._to_jsonl("table", table))
+                self.tables[idx] = TableRef(
+                    page_num=table.page_num,
+                    source=table.source,
+                    confidence=table.confidence,
+                    offset=offset,
+                    table_idx=table.table_idx,
+                    bbox=table.bbox,
+                )
+        f.flush()
 
-            current_paragraph.append(line)
+    @staticmethod
+    def _to_jsonl(record_type: str, item) -> bytes:
+        record = {"type": record_type, **asdict(item)}
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
 
-        # 마지막 단락 처리
-        if current_paragraph:
-            paragraph_text = " ".join(current_paragraph)
-            self._add_text_block(paragraph_text, page_num, avg_size)
+    def _iter_text_blocks(self):
+        """텍스트 블록을 순서대로 반환 (스트리밍 모드에서는 JSONL 파일에서 한 줄씩 읽음)"""
+        if not self.streaming:
+            yield from self.text_blocks
+            return
 
-    def _add_text_block(self, text: str, page_num: int, avg_font_size: float):
-        """텍스트 블록 추가 (타입 자동 판별)"""
-        if not text:
+        with open(self.stream_path, "rb") as f:
+            for line in f:
+                # 테이블 줄은 JSON 파싱 없이 건너뜀
+                if line.startswith(b'{"type": "block"'):
+                    record = json.loads(line)
+                    del record["type"]
+                    yield TextBlock(**record)
+
+    def _count_text_blocks(self) -> int:
+        return self._streamed_blocks if self.streaming else len(self.text_blocks)
+
+    def _count_pages(self) -> int:
+        """텍스트 블록이 있는 마지막 페이지 번호"""
+        if self.streaming:
+            return self._streamed_pages
+        return max([b.page_num for b in self.text_blocks]) if self.text_blocks else 0
+
+    def _load_table(self, table) -> TableData:
+        """TableRef이면 JSONL 파일에서 테이블 데이터를 읽어서 반환"""
+        if isinstance(table, TableData):
+            return table
+
+        with open(self.stream_path, "rb") as f:
+            f.seek(table.offset)
+            record = json.loads(f.readline())
+        del record["type"]
+        record["table_idx"] = table.table_idx  # 교차 검증에서 다시 매긴 번호
+        return TableData(**record)
+
+    def _extract_pages(self):
+        """선택한 엔진으로 텍스트와 테이블 추출"""
+        print(f"\n🔄 {self.engine}로 추출 중...")
+
+        if self.workers > 1:
+            self._extract_pages_parallel()
             return
 
-        # Heading 판별 (짧고 대문자가 많거나 특별한 패턴)
-        is_heading = False
-        heading_level = 0
-
-        # 제목 패턴들
-        if len(text) < 100:  # 짧은 텍스트
-            # 숫자로 시작하는 섹션
-            if re.match(r"^\d+[\.\)]\s+", text):
-                is_heading = True
-                heading_level = 2
-            # 대문자로 시작하고 짧은 경우
-            elif text.isupper() or (text[0].isupper() and len(text) < 50):
-                is_heading = True
-                heading_level = 1
-            # 특수 키워드
-            elif any(
-                keyword in text.lower() for keyword in ["장", "절", "부", "팀", "담당"]
-            ):
-                is_heading = True
-                heading_level = 2
-
-        # List item 판별
-        is_list = False
-        list_depth = 0
-
-        list_patterns = [
-            (r"^[○●▪▫•·]\s+", 1),  # 불릿 포인트
-            (r"^[-*+]\s+", 1),  # 대시, 별표
-            (r"^\d+[\.\)]\s+", 1),  # 숫자 리스트
-            (r"^[가-하][\.\)]\s+", 2),  # 한글 리스트
-            (r"^[a-z][\.\)]\s+", 2),  # 영문 소문자 리스트
+        with self._open_document() as pdf:
+            pages = self._document_pages(pdf)
+            pages = tqdm(pages, desc="페이지 처리") if TQDM_AVAILABLE else pages
+
+            for page_num, page in enumerate(pages, 1):
+                self._extract_page(page, page_num)
+                self._release_page(pdf, page)
+                self._flush_to_stream()
+
+    def _open_document(self):
+        """엔진에 맞게 PDF 열기 (with 문으로 사용)"""
+        if self.engine == "pymupdf":
+            return pymupdf.open(str(self.pdf_path))
+        return pdfplumber.open(str(self.pdf_path))
+
+    def _document_pages(self, pdf):
+        """열린 문서의 페이지 목록 (len과 인덱스 접근 가능)"""
+        # pymupdf Document는 그 자체로 페이지 시퀀스
+        return pdf if self.engine == "pymupdf" else pdf.pages
+
+    def _release_page(self, pdf, page):
+        """처리가 끝난 페이지의 파싱 객체 캐시 해제"""
+        if self.engine != "pdfplumber":
+            return
+        page.close()
+        if self.streaming:
+            # pdfminer는 문서에서 읽은 객체를 모두 캐시하므로 페이지 수에 비례해 메모리가 늘어남
+            cached_objs = getattr(pdf.doc, "_cached_objs", None)
+            if cached_objs is not None:
+                cached_objs.clear()
+
+    def _extract_pages_parallel(self):
+        """페이지 범위를 나누어 여러 프로세스에서 추출한 뒤 페이지 순서대로 병합"""
+        with self._open_document() as pdf:
+            page_count = len(self._document_pages(pdf))
+
+        # 페이지마다 처리 시간이 달라서, 작업자 수보다 잘게 나누어 부하를 고르게 분산
+        chunk_size = max(1, -(-page_count // (self.workers * 4)))
+        page_ranges = [
+            (start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)
         ]
+        print(f"  {page_count}페이지를 {len(page_ranges)}개 범위로 나누어 {self.workers}개 프로세스에서 처리")
+
+        range_ends = dict(page_ranges)
+        results = {}
+        next_start = 0
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_open_pdf_in_worker,
+            initargs=(self._worker_options(),),
+        ) as executor:
+            futures = {
+                executor.submit(_extract_page_range_in_worker, start, end): start
+                for start, end in page_ranges
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="페이지 범위 처리"):
+                results[futures[future]] = future.result()
+
+                # 완료 순서와 관계없이, 앞 범위가 모두 끝난 결과부터 페이지 순서대로 병합
+                while next_start in results:
+                    text_blocks, tables, camelot_pages = results.pop(next_start)
+                    self.text_blocks.extend(text_blocks)
+                    self.tables.extend(tables)
+                    for flavor, pages in camelot_pages.items():
+                        self.camelot_pages[flavor].update(pages)
+                    self._flush_to_stream()
+                    next_start = range_ends[next_start]
+
+    def _worker_options(self) -> Dict[str, Any]:
+        """작업 프로세스에서 같은 설정의 추출기를 만들기 위한 인자"""
+        return {
+            "pdf_path": str(self.pdf_path),
+            "output_dir": str(self.output_dir),
+            "streaming": self.streaming,
+            "classifier": self.classifier,
+            "engine": self.engine,
+            "use_camelot": self.use_camelot,
+        }
 
-        for pattern, depth in list_patterns:
-            if re.match(pattern, text):
-                is_list = True
-                list_depth = depth
-                break
-
-        # 들여쓰기 감지 (추가 depth)
-        leading_spaces = len(text) - len(text.lstrip())
-        if leading_spaces > 4:
-            list_depth += 1
-
-        # 블록 타입 결정
-        if is_heading:
-            block_type = "heading"
-            level = heading_level
-        elif is_list:
-            block_type = "list_item"
-            level = list_depth
+    def _extract_page(self, page, page_num: int):
+        """한 페이지의 텍스트와 테이블 추출 (엔진별 처리)"""
+        if self.engine == "pymupdf":
+            self._extract_pymupdf_page(page, page_num)
         else:
-            block_type = "paragraph"
-            level = 0
+            self._extract_pdfplumber_page(page, page_num)
+
+    def _extract_pdfplumber_page(self, page, page_num: int):
+        """pdfplumber로 한 페이지의 텍스트와 테이블 추출"""
+        # 단어 추출 (글자 크기 포함) - 텍스트 레이아웃 분석과 Camelot 후보 판별에 함께 사용
+        words = page.extract_words(extra_attrs=["size"])
+
+        # 텍스트 추출 (레이아웃 보존)
+        self._extract_text_with_layout(page_num, words, self._body_font_size(words))
+
+        # 테이블 추출
+        found_tables = page.find_tables()
+
+        # Camelot 후보 페이지 판별
+        if self.use_camelot:
+            flavors = self._detect_camelot_flavors(
+                words,
+                has_tables=bool(found_tables),
+                horizontal_edges=len(page.horizontal_edges),
+                vertical_edges=len(page.vertical_edges),
+            )
+            for flavor in flavors:
+                self.camelot_pages[flavor].add(page_num)
+
+        for table_idx, found_table in enumerate(found_tables):
+            self._add_table(
+                found_table.extract(), page_num, table_idx + 1, found_table.bbox, page.height
+            )
+
+    def _extract_pymupdf_page(self, page, page_num: int):
+        """PyMuPDF로 한 페이지의 텍스트와 테이블 추출
+
+        get_text("dict")의 줄(span 글자 크기 포함)로 레이아웃을 분석하고
+        page.find_tables()로 테이블을 찾습니다.
+        """
+        lines, spans = self._pymupdf_lines(page)
+
+        # 텍스트 추출 (레이아웃 보존)
+        self._extract_text_with_layout(page_num, lines, self._body_font_size(spans))
+
+        # 테이블 추출 - find_tables는 페이지의 모든 문자를 다시 읽어 느리므로,
+        # 괘선 기반 검색(기본 전략)으로 테이블을 찾을 수 있는 페이지에서만 실행
+        horizontal_edges, vertical_edges = self._pymupdf_ruling_edges(page)
+        has_ruling = (
+            horizontal_edges >= self.MIN_RULING_EDGES and vertical_edges >= self.MIN_RULING_EDGES
+        )
+        found_tables = page.find_tables().tables if has_ruling else []
+
+        # Camelot 후보 페이지 판별 (Camelot을 사용할 때만 단어 정보를 추가로 읽음)
+        if self.use_camelot:
+            words = [
+                {"text": w[4], "x0": w[0], "top": w[1], "x1": w[2], "bottom": w[3]}
+                for w in page.get_text("words")
+            ]
+            flavors = self._detect_camelot_flavors(
+                words,
+                has_tables=bool(found_tables),
+                horizontal_edges=horizontal_edges,
+                vertical_edges=vertical_edges,
+            )
+            for flavor in flavors:
+                self.camelot_pages[flavor].add(page_num)
+
+        for table_idx, found_table in enumerate(found_tables):
+            self._add_table(
+                found_table.extract(), page_num, table_idx + 1, found_table.bbox, page.rect.height
+            )
 
-        # 텍스트 블록 추가
+    def _add_table(
+        self,
+        table: List[List],
+        page_num: int,
+        table_idx: int,
+        bbox: Tuple[float, float, float, float],
+        page_height: float,
+    ):
+        """엔진이 찾은 테이블과 본문의 테이블 위치 마커 추가
+
+        Args:
+            table: 셀 데이터 (행 목록)
+            page_num: 페이지 번호
+            table_idx: 페이지 안의 테이블 번호 (1부터 시작)
+            bbox: 테이블 영역 (x0, top, x1, bottom) - 페이지 왼쪽 위 원점
+            page_height: 페이지 높이
+        """
+        if not table or len(table) <= 1:  # 유효한 테이블만
+            return
+
+        x0, top, x1, bottom = bbox
+        self.tables.append(
+            TableData(
+                data=table,
+                page_num=page_num,
+                source=self.engine,
+                confidence=self._calculate_table_confidence(table),
+                # Camelot과 비교할 수 있도록 PDF 좌표계(왼쪽 아래 원점)로 저장
+                bbox=(x0, page_height - bottom, x1, page_height - top),
+                table_idx=table_idx,
+            )
+        )
+
+        # 테이블 위치에 마커 추가
         self.text_blocks.append(
-            TextBlock(text=text, block_type=block_type, level=level, page_num=page_num)
+            TextBlock(
+                text=f"[TABLE_{page_num}_{table_idx}]",
+                block_type="table",
+                page_num=page_num,
+            )
         )
 
-    def _extract_tables_with_camelot(self):
-        """Camelot으로 테이블 추출"""
+    @staticmethod
+    def _pymupdf_lines(page) -> Tuple[List[Dict], List[Dict]]:
+        """get_text("dict")의 줄을 _group_lines에서 쓰는 단어 형식으로 변환
 
-        print("\n🔄 Camelot으로 테이블 보완 중...")
+        Returns:
+            (줄 목록, 공백이 아닌 span 목록)
+        """
+        lines, spans = [], []
+        for block in page.get_text("dict", flags=pymupdf.TEXTFLAGS_TEXT)["blocks"]:
+            for line in block.get("lines", []):
+                line_spans = [span for span in line["spans"] if span["text"].strip()]
+                if not line_spans:
+                    continue
+                spans.extend(line_spans)
+                x0, top, x1, bottom = line["bbox"]
+                lines.append(
+                    {
+                        "text": "".join(span["text"] for span in line["spans"]).strip(),
+                        "size": max(span["size"] for span in line_spans),
+                        "x0": x0,
+                        "x1": x1,
+                        "top": top,
+                        "bottom": bottom,
+                    }
+                )
+        return lines, spans
+
+    @staticmethod
+    def _pymupdf_ruling_edges(page) -> Tuple[int, int]:
+        """벡터 그림에서 가로/세로 괘선 수 계산 (사각형은 가로 2개, 세로 2개)"""
+        horizontal = vertical = 0
+        for drawing in page.get_drawings():
+            for item in drawing["items"]:
+                if item[0] == "l":
+                    start, end = item[1], item[2]
+                    horizontal += abs(start.y - end.y) < 1
+                    vertical += abs(start.x - end.x) < 1
+                elif item[0] == "re":
+                    horizontal += 2
+                    vertical += 2
+        return horizontal, vertical
+
+    def _detect_camelot_flavors(
+        self, words: List[Dict], has_tables: bool, horizontal_edges: int, vertical_edges: int
+    ) -> List[str]:
+        """Camelot을 실행할 가치가 있는 flavor 목록 반환 (가벼운 사전 검사)
+
+        - lattice: 엔진이 테이블을 찾았거나, 가로/세로 괘선이 있는 페이지
+        - stream: 괘선 없이 단어들이 여러 열로 정렬된 격자 형태의 페이지
+        """
+        flavors = []
+        if (
+            has_tables
+            or horizontal_edges >= self.MIN_RULING_EDGES
+            and vertical_edges >= self.MIN_RULING_EDGES
+        ):
+            flavors.append("lattice")
+        if self._has_word_grid(words):
+            flavors.append("stream")
+        return flavors
+
+    def _has_word_grid(self, words: List[Dict]) -> bool:
+        """넓은 간격으로 떨어진 단어들이 여러 줄에 걸쳐 같은 열로 정렬되어 있는지 확인"""
+        words_by_line = defaultdict(list)
+        for word in words:
+            words_by_line[round(word["top"])].append(word)
+
+        # 줄별로 열의 시작 위치(x0)를 GRID_X_TOLERANCE 단위로 묶음
+        lines = []
+        for line_words in words_by_line.values():
+            line_words.sort(key=lambda w: w["x0"])
+            columns = {round(line_words[0]["x0"] / self.GRID_X_TOLERANCE)}
+            for prev, word in zip(line_words, line_words[1:]):
+                if word["x0"] - prev["x1"] >= self.GRID_COLUMN_GAP:
+                    columns.add(round(word["x0"] / self.GRID_X_TOLERANCE))
+            if len(columns) >= self.MIN_GRID_COLUMNS:
+                lines.append(columns)
+        if len(lines) < self.MIN_GRID_ROWS:
+            return False
+
+        # 여러 줄에서 반복되는 열 위치
+        column_counts = Counter(column for columns in lines for column in columns)
+        shared = {column for column, count in column_counts.items() if count >= self.MIN_GRID_ROWS}
+
+        grid_rows = sum(1 for columns in lines if len(columns & shared) >= self.MIN_GRID_COLUMNS)
+        return grid_rows >= self.MIN_GRID_ROWS
+
+    def _extract_text_with_layout(self, page_num: int, words: List[Dict], body_size: float):
+        """레이아웃을 보존하며 텍스트 추출
+
+        줄마다 글자 크기를 구해서, 줄 간격이 넓거나 글자 크기가 바뀌는 곳에서 단락을 나누고
+        본문보다 큰 글자는 제목으로 판별합니다.
+
+        Args:
+            page_num: 페이지 번호
+            words: text, size, x0, top, bottom을 가진 단어(또는 줄) 목록
+            body_size: 페이지 본문 글자 크기 (heading 감지용)
+        """
+        paragraphs = []
+        current_paragraph = []
+        paragraph_size = 0.0
+        prev_bottom = None
 
-        try:
-            # 모든 페이지에서 테이블 추출 시도
-            # stream 모드: 테이블 경계가 명확하지 않은 경우
-            tables_stream = camelot.read_pdf(
-                str(self.pdf_path), pages="all", flavor="stream", suppress_stdout=True
+        for text, size, top, bottom in self._group_lines(words):
+            if current_paragraph and (
+                top - prev_bottom > paragraph_size * self.PARAGRAPH_GAP_RATIO
+                or abs(size - paragraph_size) > paragraph_size * self.FONT_SIZE_CHANGE_RATIO
+            ):
+                # 줄 간격이 넓거나 글자 크기가 바뀜 = 단락 구분
+                paragraphs.append((" ".join(current_paragraph), paragraph_size))
+                current_paragraph = []
+
+            if not current_paragraph:
+                paragraph_size = size
+            current_paragraph.append(text)
+            prev_bottom = bottom
+
+        # 마지막 단락 처리
+        if current_paragraph:
+            paragraphs.append((" ".join(current_paragraph), paragraph_size))
+
+        self._add_text_blocks(paragraphs, page_num, body_size)
+
+    @staticmethod
+    def _body_font_size(words: List[Dict]) -> float:
+        """본문 글자 크기 (가장 많은 글자가 사용한 크기)
+
+        문자(page.chars)를 하나씩 보지 않고, 이미 추출한 단어(또는 span)의 크기를
+        글자 수로 가중한 0.5pt 단위 히스토그램의 최빈값으로 계산합니다.
+
+        Args:
+            words: text, size를 가진 단어(또는 PyMuPDF span) 목록
+        """
+        if not words:
+            return 12.0
+
+        sizes = np.fromiter((w["size"] for w in words), dtype=float, count=len(words))
+        lengths = np.fromiter((len(w["text"]) for w in words), dtype=float, count=len(words))
+        bins, inverse = np.unique(np.round(sizes * 2) / 2, return_inverse=True)
+        return float(bins[np.bincount(inverse, weights=lengths).argmax()])
+
+    def _group_lines(self, words: List[Dict]) -> List[Tuple[str, float, float, float]]:
+        """단어를 줄 단위로 묶어서 (텍스트, 글자 크기, top, bottom) 목록 반환"""
+        if not words:
+            return []
+
+        # 아래쪽 위치(bottom)로 정렬한 뒤, 간격이 LINE_Y_TOLERANCE보다 큰 곳에서 줄을 나눔
+        bottoms = np.fromiter((w["bottom"] for w in words), dtype=float, count=len(words))
+        order = np.argsort(bottoms, kind="stable")
+        breaks = np.flatnonzero(np.diff(bottoms[order]) > self.LINE_Y_TOLERANCE) + 1
+
+        lines = []
+        for indices in np.split(order, breaks):
+            line_words = sorted((words[i] for i in indices), key=lambda w: w["x0"])
+            lines.append(
+                (
+                    " ".join(w["text"] for w in line_words),
+                    max(w["size"] for w in line_words),
+                    min(w["top"] for w in line_words),
+                    max(w["bottom"] for w in line_words),
+                )
             )
+        return lines
+
+    def _add_text_blocks(
+        self,
+        paragraphs: List[Tuple[str, float]],
+        page_num: int,
+        avg_font_size: float,
+    ):
+        """한 페이지의 단락들을 블록 타입을 판별하여 추가
+
+        본문보다 큰 글자는 제목으로, 나머지는 분류기(BlockClassifier)의 규칙으로 한 번에 판별합니다.
+
+        Args:
+            paragraphs: (단락 텍스트, 단락의 글자 크기) 목록
+            page_num: 페이지 번호
+            avg_font_size: 페이지 본문 글자 크기
+        """
+        paragraphs = [(text, size) for text, size in paragraphs if text]
+        classified = self.classifier.classify_batch(text for text, _ in paragraphs)
 
-            for table in tables_stream:
-                if len(table.df) > 1:  # 유효한 테이블만
-                    table_data = TableData(
-                        data=table.df.values.tolist(),
-                        page_num=table.page,
-                        source="camelot_stream",
-                        confidence=table.accuracy,
-                    )
-                    self.tables.append(table_data)
+        for (text, font_size), (block_type, level) in zip(paragraphs, classified):
+            # 본문보다 큰 글자
+            if font_size >= avg_font_size * self.HEADING_SIZE_RATIO and len(text) < self.MAX_HEADING_LENGTH:
+                block_type = "heading"
+                level = 1 if font_size >= avg_font_size * self.TITLE_SIZE_RATIO else 2
+
+            self.text_blocks.append(
+                TextBlock(text=text, block_type=block_type, level=level, page_num=page_num)
+            )
+
+    def _extract_tables_with_camelot(self):
+        """Camelot으로 테이블 추출 (후보 페이지에서만)"""
+
+        print("\n🔄 Camelot으로 테이블 보완 중...")
+
+        # stream 모드: 테이블 경계가 명확하지 않은 경우
+        # lattice 모드: 테이블 경계가 명확한 경우
+        for flavor in ["stream", "lattice"]:
+            pages = sorted(self.camelot_pages[flavor])
+            if not pages:
+                continue
+            print(f"  {flavor}: {len(pages)}개 후보 페이지")
 
-            # lattice 모드: 테이블 경계가 명확한 경우
             try:
-                tables_lattice = camelot.read_pdf(
+                camelot_tables = camelot.read_pdf(
                     str(self.pdf_path),
-                    pages="all",
-                    flavor="lattice",
+                    pages=",".join(map(str, pages)),
+                    flavor=flavor,
                     suppress_stdout=True,
                 )
+            except Exception as e:
+                self.comparison_report.append(f"Camelot({flavor}) 오류: {str(e)}")
+                continue
 
-                for table in tables_lattice:
-                    if len(table.df) > 1:
-                        table_data = TableData(
-                            data=table.df.values.tolist(),
-                            page_num=table.page,
-                            source="camelot_lattice",
-                            confidence=table.accuracy,
-                        )
-                        self.tables.append(table_data)
-            except:
-                pass  # lattice 모드 실패 시 무시
-
-        except Exception as e:
-            self.comparison_report.append(f"Camelot 오류: {str(e)}")
+            for table in camelot_tables:
+                # 유효한 테이블만 (stream 모드는 본문 단락을 1열짜리 테이블로 인식하기도 함)
+                if len(table.df) > 1 and len(table.df.columns) > 1:
+                    table_data = TableData(
+                        data=table.df.values.tolist(),
+                        page_num=int(table.page),
+                        source=f"camelot_{flavor}",
+                        confidence=table.accuracy,
+                        bbox=tuple(table._bbox),
+                        table_idx=table.order,
+                    )
+                    self.tables.append(table_data)
 
     def _calculate_table_confidence(self, table: List[List]) -> float:
         """테이블 신뢰도 계산"""
@@ -297,50 +885,76 @@ class PDFExtractor:
         return round(confidence, 2)
 
     def _cross_validate_tables(self):
-        """여러 소스의 테이블 교차 검증 및 병합"""
+        """여러 소스의 테이블 교차 검증 및 병합
+
+        같은 페이지에서 영역(bbox)이 겹치는 테이블을 같은 테이블로 보고
+        본문 마커와 같은 번호(table_idx)를 매긴 뒤, 소스 중 신뢰도가 가장 높은 것을 선택합니다.
+        """
 
         print("\n🔄 테이블 교차 검증 중...")
 
-        # 페이지별로 테이블 그룹화
-        tables_by_page = {}
+        tables_by_page = defaultdict(list)
         for table in self.tables:
-            if table.page_num not in tables_by_page:
-                tables_by_page[table.page_num] = []
             tables_by_page[table.page_num].append(table)
+        for page_tables in tables_by_page.values():
+            self._match_tables_on_page(page_tables)
 
-        # 각 페이지에서 최적 테이블 선택
-        validated_tables = []
-
-        for page_num, page_tables in tables_by_page.items():
-            if len(page_tables) == 1:
-                validated_tables.append(page_tables[0])
-            else:
-                # 여러 소스가 있는 경우 비교
-                sources = {}
-                for table in page_tables:
-                    if table.source not in sources:
-                        sources[table.source] = []
-                    sources[table.source].append(table)
-
-                # 소스별 최고 신뢰도 테이블 선택
-                best_tables = []
-                for source, tables in sources.items():
-                    best = max(tables, key=lambda t: t.confidence)
-                    best_tables.append(best)
-
-                # 전체에서 최고 신뢰도 선택
-                if best_tables:
-                    best_table = max(best_tables, key=lambda t: t.confidence)
-                    validated_tables.append(best_table)
-
-                    # 비교 리포트 추가
-                    self.comparison_report.append(
-                        f"Page {page_num}: 선택된 소스 = {best_table.source} "
-                        f"(신뢰도: {best_table.confidence:.1f}%)"
-                    )
+        registry = TableRegistry()
+        for table in self.tables:
+            # 같은 소스에서 중복되면 신뢰도가 높은 것을 유지
+            existing = registry.get(table.page_num, table.table_idx, table.source)
+            if existing is None or table.confidence > existing.confidence:
+                registry.add(table)
+
+        # (페이지, 테이블 번호)마다 최고 신뢰도 테이블 선택
+        for (page_num, table_idx), candidates in sorted(registry.groups().items()):
+            best_table = max(candidates, key=lambda t: t.confidence)
+            registry.select(best_table)
+
+            if len(candidates) > 1:
+                # 비교 리포트 추가
+                self.comparison_report.append(
+                    f"Page {page_num} Table {table_idx}: 선택된 소스 = {best_table.source} "
+                    f"(신뢰도: {best_table.confidence:.1f}%)"
+                )
 
         # 검증된 테이블로 교체
-        self.tables = validated_tables
+        self.table_registry = registry
+        self.tables = registry.selected_tables()
+
+    def _match_tables_on_page(self, page_tables: List):
+        """한 페이지의 Camelot 테이블에 겹치는 엔진 테이블(마커)과 같은 번호 부여
+
+        겹치는 엔진 테이블이 없으면 마커 뒤에 이어지는 새 번호를 부여합니다.
+        """
+        matched = [t for t in page_tables if t.source == self.engine]
+        next_idx = max([t.table_idx for t in matched], default=0) + 1
+
+        for table in page_tables:
+            if table.source == self.engine:
+                continue
+            overlaps = [
+                (self._bbox_overlap(table.bbox, other.bbox), other) for other in matched
+            ]
+            overlap, best = max(overlaps, key=lambda o: o[0], default=(0, None))
+            if overlap >= self.MIN_TABLE_OVERLAP:
+                table.table_idx = best.table_idx
+            else:
+                table.table_idx = next_idx
+                next_idx += 1
+            matched.append(table)
+
+    @staticmethod
+    def _bbox_overlap(a, b) -> float:
+        """두 영역이 겹치는 넓이 / 작은 영역의 넓이 (영역 정보가 없으면 0)"""
+        if not a or not b:
+            return 0.0
+        width = min(a[2], b[2]) - max(a[0], b[0])
+        height = min(a[3], b[3]) - max(a[1], b[1])
+        if width <= 0 or height <= 0:
+            return 0.0
+        smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+        return width * height / smaller if smaller > 0 else 0.0
 
     def _save_results(self):
         """결과 저장"""
@@ -364,63 +978,71 @@ class PDFExtractor:
             report_path.write_text("\n".join(self.comparison_report), encoding="utf-8")
             print(f"  ✅ 비교 리포트: {report_path}")
 
+    def _resolve_table_marker(self, marker: str) -> Optional[TableData]:
+        """[TABLE_p_i] 마커에 해당하는 (교차 검증에서 선택된) 테이블 반환"""
+        table_match = TABLE_MARKER_PATTERN.fullmatch(marker)
+        if not table_match:
+            return None
+        page_num, table_idx = map(int, table_match.groups())
+        table = self.table_registry.selected(page_num, table_idx)
+        return self._load_table(table) if table else None
+
+    @staticmethod
+    def _write_lines(path: Path, lines):
+        """줄 단위로 생성되는 내용을 바로 파일에 기록 (전체 내용을 메모리에 모으지 않음)"""
+        with open(path, "w", encoding="utf-8") as f:
+            for idx, line in enumerate(lines):
+                f.write(f"\n{line}" if idx else line)
+
     def _save_markdown(self):
         """Markdown 형식으로 저장"""
-        md_lines = []
+        md_path = self.output_dir / "extracted_text.md"
+        self._write_lines(md_path, self._iter_markdown_lines())
+        print(f"  ✅ Markdown: {md_path}")
+
+    def _iter_markdown_lines(self):
+        """Markdown 내용을 줄 단위로 생성"""
         current_page = 0
 
-        for block in self.text_blocks:
+        for block in self._iter_text_blocks():
             # 페이지 구분
             if block.page_num != current_page:
                 current_page = block.page_num
-                md_lines.append(f"\n---\n\n# 📄 Page {current_page}\n")
+                yield f"\n---\n\n# 📄 Page {current_page}\n"
 
             # 블록 타입별 포맷팅
             if block.block_type == "heading":
                 prefix = "#" * (block.level + 1)
-                md_lines.append(f"\n{prefix} {block.text}\n")
+                yield f"\n{prefix} {block.text}\n"
             elif block.block_type == "list_item":
                 indent = "  " * (block.level - 1)
-                md_lines.append(f"{indent}- {block.text}")
+                yield f"{indent}- {block.text}"
             elif block.block_type == "table":
-                # 테이블 마커 찾기
-                table_match = re.match(r"\[TABLE_(\d+)_(\d+)\]", block.text)
-                if table_match:
-                    page_num = int(table_match.group(1))
-                    table_idx = int(table_match.group(2))
-
-                    # 해당 테이블 찾기
-                    for table in self.tables:
-                        if table.page_num == page_num:
-                            md_lines.append(f"\n### 📊 Table {table_idx}\n")
-                            if table.data:
-                                # 테이블을 Markdown 형식으로 변환
-                                md_table = tabulate(
-                                    (
-                                        table.data[1:]
-                                        if len(table.data) > 1
-                                        else table.data
-                                    ),
-                                    headers=table.data[0] if table.data else [],
-                                    tablefmt="pipe",
-                                )
-                                md_lines.append(md_table)
-                                md_lines.append(
-                                    f"\n*Source: {table.source}, Confidence: {table.confidence:.1f}%*\n"
-                                )
-                            break
+                # 테이블 마커로 해당 테이블 찾기
+                table = self._resolve_table_marker(block.text)
+                if table:
+                    yield f"\n### 📊 Table {table.table_idx}\n"
+                    if table.data:
+                        # 테이블을 Markdown 형식으로 변환
+                        md_table = tabulate(
+                            table.data[1:] if len(table.data) > 1 else table.data,
+                            headers=table.data[0] if table.data else [],
+                            tablefmt="pipe",
+                        )
+                        yield md_table
+                        yield f"\n*Source: {table.source}, Confidence: {table.confidence:.1f}%*\n"
             else:  # paragraph
-                md_lines.append(f"\n{block.text}\n")
-
-        # 파일 저장
-        md_path = self.output_dir / "extracted_text.md"
-        md_path.write_text("\n".join(md_lines), encoding="utf-8")
-        print(f"  ✅ Markdown: {md_path}")
+                yield f"\n{block.text}\n"
 
     def _save_html(self):
         """HTML 형식으로 저장"""
-        html_lines = [
-            """
+        html_path = self.output_dir / "extracted_text.html"
+        self._write_lines(html_path, self._iter_html_lines())
+        print(f"  ✅ HTML: {html_path}")
+
+    def _iter_html_lines(self):
+        """HTML 내용을 줄 단위로 생성"""
+        yield """
 <!DOCTYPE html>
 <html lang="ko">
 <head>
@@ -445,172 +1067,317 @@ class PDFExtractor:
 <body>
     <h1>📄 PDF 추출 결과</h1>
         """
-        ]
 
         current_page = 0
 
-        for block in self.text_blocks:
+        for block in self._iter_text_blocks():
             # 페이지 구분
             if block.page_num != current_page:
                 if current_page > 0:
-                    html_lines.append("</div>")
+                    yield "</div>"
                 current_page = block.page_num
-                html_lines.append(
-                    f'<div class="page-break"><h2>Page {current_page}</h2>'
-                )
+                yield f'<div class="page-break"><h2>Page {current_page}</h2>'
 
             # 블록 타입별 HTML
             if block.block_type == "heading":
                 tag = f"h{min(block.level + 2, 6)}"
-                html_lines.append(f"<{tag}>{block.text}</{tag}>")
+                yield f"<{tag}>{block.text}</{tag}>"
             elif block.block_type == "list_item":
                 class_name = (
                     f"list-item-{block.level}" if block.level > 1 else "list-item"
                 )
-                html_lines.append(f'<div class="{class_name}">• {block.text}</div>')
+                yield f'<div class="{class_name}">• {block.text}</div>'
             elif block.block_type == "table":
                 # 테이블 HTML
-                table_match = re.match(r"\[TABLE_(\d+)_(\d+)\]", block.text)
-                if table_match:
-                    page_num = int(table_match.group(1))
-                    table_idx = int(table_match.group(2))
-
-                    for table in self.tables:
-                        if table.page_num == page_num:
-                            html_lines.append(f"<h3>Table {table_idx}</h3>")
-                            if table.data:
-                                html_lines.append("<table>")
-                                # 헤더
-                                if len(table.data) > 0:
-                                    html_lines.append("<thead><tr>")
-                                    for cell in table.data[0]:
-                                        html_lines.append(
-                                            f'<th>{cell if cell else ""}</th>'
-                                        )
-                                    html_lines.append("</tr></thead>")
-                                # 본문
-                                if len(table.data) > 1:
-                                    html_lines.append("<tbody>")
-                                    for row in table.data[1:]:
-                                        html_lines.append("<tr>")
-                                        for cell in row:
-                                            html_lines.append(
-                                                f'<td>{cell if cell else ""}</td>'
-                                            )
-                                        html_lines.append("</tr>")
-                                    html_lines.append("</tbody>")
-                                html_lines.append("</table>")
-                                html_lines.append(
-                                    f'<div class="table-info">Source: {table.source}, Confidence: {table.confidence:.1f}%</div>'
-                                )
-                            break
+                table = self._resolve_table_marker(block.text)
+                if table:
+                    yield f"<h3>Table {table.table_idx}</h3>"
+                    if table.data:
+                        yield "<table>"
+                        # 헤더
+                        if len(table.data) > 0:
+                            yield "<thead><tr>"
+                            for cell in table.data[0]:
+                                yield f'<th>{cell if cell else ""}</th>'
+                            yield "</tr></thead>"
+                        # 본문
+                        if len(table.data) > 1:
+                            yield "<tbody>"
+                            for row in table.data[1:]:
+                                yield "<tr>"
+                                for cell in row:
+                                    yield f'<td>{cell if cell else ""}</td>'
+                                yield "</tr>"
+                            yield "</tbody>"
+                        yield "</table>"
+                        yield f'<div class="table-info">Source: {table.source}, Confidence: {table.confidence:.1f}%</div>'
             else:  # paragraph
-                html_lines.append(f'<p class="paragraph">{block.text}</p>')
+                yield f'<p class="paragraph">{block.text}</p>'
 
         if current_page > 0:
-            html_lines.append("</div>")
+            yield "</div>"
 
-        html_lines.append("</body></html>")
-
-        # 파일 저장
-        html_path = self.output_dir / "extracted_text.html"
-        html_path.write_text("\n".join(html_lines), encoding="utf-8")
-        print(f"  ✅ HTML: {html_path}")
+        yield "</body></html>"
 
     def _save_json(self):
-        """JSON 형식으로 저장"""
-        data = {
+        """JSON 형식으로 저장 (페이지 단위로 기록하여 전체 내용을 메모리에 모으지 않음)"""
+        header = {
             "pdf_file": str(self.pdf_path),
-            "total_pages": (
-                max([b.page_num for b in self.text_blocks]) if self.text_blocks else 0
-            ),
-            "total_blocks": len(self.text_blocks),
+            "total_pages": self._count_pages(),
+            "total_blocks": self._count_text_blocks(),
             "total_tables": len(self.tables),
-            "content": [],
         }
 
-        # 페이지별로 구성
-        pages = {}
-        for block in self.text_blocks:
-            if block.page_num not in pages:
-                pages[block.page_num] = {
-                    "page_number": block.page_num,
-                    "blocks": [],
+        tables_by_page = defaultdict(list)
+        for table in self.tables:
+            tables_by_page[table.page_num].append(table)
+
+        # 파일 저장 (json.dump(data, indent=2)와 같은 형식)
+        json_path = self.output_dir / "extracted_data.json"
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False, indent=2)[:-2])
+            f.write(',\n  "content": [')
+
+            # 블록은 페이지 순서로 저장되어 있으므로 페이지별로 묶어서 기록
+            pages = itertools.groupby(self._iter_text_blocks(), key=lambda b: b.page_num)
+            for idx, (page_num, page_blocks) in enumerate(pages):
+                page = {
+                    "page_number": page_num,
+                    "blocks": [
+                        {"type": block.block_type, "level": block.level, "text": block.text}
+                        for block in page_blocks
+                        if block.block_type != "table"
+                    ],
                     "tables": [],
                 }
 
-            if block.block_type != "table":
-                pages[block.page_num]["blocks"].append(
-                    {"type": block.block_type, "level": block.level, "text": block.text}
-                )
-
-        # 테이블 추가
-        for table in self.tables:
-            if table.page_num in pages:
-                pages[table.page_num]["tables"].append(
-                    {
-                        "source": table.source,
-                        "confidence": table.confidence,
-                        "data": table.data,
-                    }
-                )
+                # 테이블 추가
+                for table in tables_by_page.get(page_num, []):
+                    table = self._load_table(table)
+                    page["tables"].append(
+                        {
+                            "source": table.source,
+                            "confidence": table.confidence,
+                            "data": table.data,
+                        }
+                    )
 
-        data["content"] = list(pages.values())
+                page_json = json.dumps(page, ensure_ascii=False, indent=2)
+                f.write((",\n" if idx else "\n") + textwrap.indent(page_json, "    "))
 
-        # 파일 저장
-        json_path = self.output_dir / "extracted_data.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n  ]\n}" if self._count_pages() else "]\n}")
         print(f"  ✅ JSON: {json_path}")
 
     def _save_tables(self):
-        """테이블을 CSV와 Excel로 저장"""
+        """테이블을 CSV/Excel/Parquet/Arrow로 저장
+
+        테이블을 한 번씩만 읽어서 DataFrame을 한 번 만들고, 열어 둔 모든 형식에 함께 기록합니다.
+        """
         if not self.tables:
             return
 
         tables_dir = self.output_dir / "tables"
         tables_dir.mkdir(exist_ok=True)
-
-        # 개별 CSV 저장
-        for idx, table in enumerate(self.tables, 1):
-            if table.data:
-                df = pd.DataFrame(
-                    table.data[1:], columns=table.data[0] if table.data else None
+        formats = self.table_formats
+
+        with ExitStack() as stack:
+            # 통합 Excel
+            write_sheet = None
+            if "xlsx" in formats:
+                excel_path = tables_dir / "all_tables.xlsx"
+                write_sheet = stack.enter_context(self._excel_sheet_writer(excel_path))
+
+            # 통합 Parquet/Arrow 데이터셋 (테이블마다 RecordBatch 하나씩 추가)
+            columnar_writers = []
+            if "parquet" in formats:
+                parquet_path = str(tables_dir / "all_tables.parquet")
+                columnar_writers.append(
+                    stack.enter_context(pq.ParquetWriter(parquet_path, self._cell_schema()))
+                )
+            if "arrow" in formats:
+                arrow_path = str(tables_dir / "all_tables.arrow")
+                columnar_writers.append(
+                    stack.enter_context(pa.ipc.new_file(arrow_path, self._cell_schema()))
                 )
-                csv_path = tables_dir / f"page{table.page_num}_table{idx}.csv"
-                df.to_csv(csv_path, index=False, encoding="utf-8-sig")
 
-        # 통합 Excel 저장
-        excel_path = tables_dir / "all_tables.xlsx"
-        with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
             for idx, table in enumerate(self.tables, 1):
-                if table.data:
-                    df = pd.DataFrame(
-                        table.data[1:], columns=table.data[0] if table.data else None
-                    )
-                    sheet_name = f"Page{table.page_num}_T{idx}"[
-                        :31
-                    ]  # Excel 시트명 제한
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                table = self._load_table(table)
+                if not table.data:
+                    continue
+
+                df = pd.DataFrame(table.data[1:], columns=table.data[0])
+
+                # 개별 CSV
+                if "csv" in formats:
+                    csv_path = tables_dir / f"page{table.page_num}_table{idx}.csv"
+                    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+
+                if write_sheet:
+                    write_sheet(df, f"Page{table.page_num}_T{idx}"[:31])  # Excel 시트명 제한
+
+                if columnar_writers:
+                    batch = self._table_cell_batch(table, idx)
+                    for writer in columnar_writers:
+                        writer.write_batch(batch)
 
         print(f"  ✅ Tables: {tables_dir}/")
 
+    @contextmanager
+    def _excel_sheet_writer(self, excel_path: Path):
+        """DataFrame을 시트로 추가하는 함수를 제공하고, 끝나면 Excel 파일 저장
+
+        excel_write_only이면 openpyxl write-only 통합 문서에 행을 바로 기록하여,
+        전체 통합 문서를 메모리에 두지 않습니다.
+        """
+        if not self.excel_write_only:
+            with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
+                yield lambda df, sheet_name: df.to_excel(writer, sheet_name=sheet_name, index=False)
+            return
+
+        workbook = Workbook(write_only=True)
+
+        def write_sheet(df: pd.DataFrame, sheet_name: str):
+            sheet = workbook.create_sheet(sheet_name)
+            sheet.append(list(df.columns))
+            for row in df.itertuples(index=False, name=None):
+                sheet.append(row)
+
+        yield write_sheet
+        workbook.save(excel_path)
+
+    @staticmethod
+    def _cell_schema() -> "pa.Schema":
+        """Parquet/Arrow 테이블 데이터셋 스키마 (셀 하나가 한 행인 long format)"""
+        return pa.schema(
+            [
+                ("table", pa.int32()),  # 저장 순서 번호 (CSV/시트 이름의 번호와 같음)
+                ("page", pa.int32()),
+                ("table_idx", pa.int32()),  # 페이지 안의 테이블 번호 (본문 마커와 같음)
+                ("source", pa.string()),
+                ("confidence", pa.float64()),
+                ("row", pa.int32()),  # 헤더를 제외한 데이터 행 번호 (0부터 시작)
+                ("column", pa.int32()),
+                ("header", pa.string()),
+                ("value", pa.string()),
+            ]
+        )
+
+    def _table_cell_batch(self, table: TableData, idx: int) -> "pa.RecordBatch":
+        """테이블 하나를 long format RecordBatch로 변환"""
+        header = table.data[0]
+        rows, columns, headers, values = [], [], [], []
+        for row_idx, row in enumerate(table.data[1:]):
+            for col_idx, value in enumerate(row):
+                rows.append(row_idx)
+                columns.append(col_idx)
+                headers.append(header[col_idx] if col_idx < len(header) else None)
+                values.append(None if value is None else str(value))
+
+        count = len(values)
+        return pa.record_batch(
+            [
+                pa.array([idx] * count, pa.int32()),
+                pa.array([table.page_num] * count, pa.int32()),
+                pa.array([table.table_idx] * count, pa.int32()),
+                pa.array([table.source] * count, pa.string()),
+                pa.array([table.confidence] * count, pa.float64()),
+                pa.array(rows, pa.int32()),
+                pa.array(columns, pa.int32()),
+                pa.array([None if h is None else str(h) for h in headers], pa.string()),
+                pa.array(values, pa.string()),
+            ],
+            schema=self._cell_schema(),
+        )
+
+
+# 작업 프로세스마다 한 번만 여는 PDF와 추출기 (ProcessPoolExecutor initializer에서 설정)
+_worker_pdf = None
+_worker_extractor: Optional[PDFExtractor] = None
+
+
+def _open_pdf_in_worker(options: Dict[str, Any]):
+    """(작업 프로세스 초기화) PDF를 직접 열어 두고 재사용"""
+    global _worker_pdf, _worker_extractor
+    _worker_extractor = PDFExtractor(**options)
+    _worker_pdf = _worker_extractor._open_document()
+
+
+def _extract_page_range_in_worker(
+    start: int, end: int
+) -> Tuple[List[TextBlock], List[TableData], Dict[str, set]]:
+    """(작업 프로세스) start ~ end-1번째(0부터 시작) 페이지를 추출하여 반환"""
+    extractor = _worker_extractor
+    extractor.text_blocks, extractor.tables = [], []
+    extractor.camelot_pages = {"lattice": set(), "stream": set()}
+    pages = extractor._document_pages(_worker_pdf)
+    for page_idx in range(start, end):
+        page = pages[page_idx]
+        extractor._extract_page(page, page_idx + 1)
+        extractor._release_page(_worker_pdf, page)
+    return extractor.text_blocks, extractor.tables, extractor.camelot_pages
+
 
 def main():
     """메인 함수"""
-    if len(sys.argv) < 2:
-        print("사용법: python extract_pdf_advanced.py <PDF파일>")
-        sys.exit(1)
-
-    pdf_file = sys.argv[1]
+    parser = argparse.ArgumentParser(description="PDF 텍스트/테이블 추출기")
+    parser.add_argument("pdf_file", help="PDF 파일 경로")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="페이지 추출 프로세스 수 (기본값: 1)"
+    )
+    parser.add_argument("-o", "--output", default="output", help="결과 저장 폴더 (기본값: output)")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="페이지마다 결과를 JSONL로 기록하여 메모리 사용량을 일정하게 유지",
+    )
+    parser.add_argument("--cache-dir", help="추출 결과 캐시 폴더 (같은 PDF/옵션이면 추출을 건너뜀)")
+    parser.add_argument(
+        "--table-formats",
+        nargs="+",
+        choices=PDFExtractor.TABLE_FORMATS,
+        default=["csv", "xlsx"],
+        help="테이블 저장 형식 (기본값: csv xlsx)",
+    )
+    parser.add_argument(
+        "--excel-write-only",
+        action="store_true",
+        help="Excel을 write-only 모드로 저장하여 메모리 사용량을 일정하게 유지",
+    )
+    parser.add_argument("--rules", help="텍스트 블록 분류 규칙 JSON 파일 (기본값: 내장 규칙)")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        choices=PDFExtractor.ENGINES,
+        default="pdfplumber",
+        help="페이지 추출 엔진 (기본값: pdfplumber, 대량 처리에는 pymupdf)",
+    )
+    parser.add_argument(
+        "--camelot",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Camelot으로 테이블 보완 (기본값: pdfplumber 엔진에서만 사용)",
+    )
+    args = parser.parse_args()
 
     # 파일 존재 확인
-    if not Path(pdf_file).exists():
-        print(f"❌ PDF 파일을 찾을 수 없습니다: {pdf_file}")
+    if not Path(args.pdf_file).exists():
+        print(f"❌ PDF 파일을 찾을 수 없습니다: {args.pdf_file}")
         sys.exit(1)
 
     # 추출기 실행
-    extractor = PDFExtractor(pdf_file)
+    classifier = BlockClassifier.from_json(args.rules) if args.rules else None
+    extractor = PDFExtractor(
+        args.pdf_file,
+        output_dir=args.output,
+        workers=args.workers,
+        streaming=args.streaming,
+        classifier=classifier,
+        engine=args.engine,
+        use_camelot=args.camelot,
+        cache_dir=args.cache_dir,
+        table_formats=args.table_formats,
+        excel_write_only=args.excel_write_only,
+    )
     extractor.extract_all()
 
 
@@ -1,6 +1,10 @@
 import os
+import time
 from dotenv import load_dotenv
 from openai import OpenAI
+from llm_metrics import MemoryMetricsSink, add_metrics_sink, make_call_metrics, record_call
+from llm_tokens import estimate_cost
+from utils import _make_usage
 
 # .env 파일에서 환경변수 불러오기
 load_dotenv()
@@ -12,6 +16,9 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", default=None) or None
 # OpenAI 내부에서 알아서 OPENAI_API_KEY 환경변수 값을 찾습니다.
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+# 호출 기록을 메모리에 보관 (최근 100개)
+metrics_sink = add_metrics_sink(MemoryMetricsSink(maxlen=100))
+
 def create_chat_completion(client: OpenAI, model: str, messages: list[dict]) -> str:
     """
     OpenAI 챗 모델에 메시지를 보내고 응답을 받아옵니다.
@@ -24,11 +31,22 @@ def create_chat_completion(client: OpenAI, model: str, messages: list[dict]) ->
     Returns:
         str: 모델의 응답 메시지
     """
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-    )
-    print("response.usage :", response.usage)  # 토큰 사용량 출력
+    started_at = time.perf_counter()
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+        )
+    except Exception as e:
+        # 실패한 호출도 오류 종류와 지연 시간을 기록
+        record_call(make_call_metrics(model, started_at, error=e))
+        raise
+
+    # 토큰 사용량, 지연 시간, 예상 비용 기록
+    usage = _make_usage(response.usage)
+    cost = estimate_cost(model, usage.input_tokens, usage.output_tokens) if usage else None
+    record_call(make_call_metrics(model, started_at, usage=usage, cost=cost))
+
     return response.choices[0].message.content  # 응답 메시지 반환
 
 # 대화 메시지 정의
@@ -40,3 +58,4 @@ messages = [
 # 챗봇 응답 생성 및 출력
 result = create_chat_completion(client, "gpt-4o-mini", messages)
 print(result)
+print("metrics :", metrics_sink.summary())  # 호출 수, 지연 시간, 토큰 수, 비용 요약
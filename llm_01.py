@@ -1,14 +1,31 @@
+import sys
+
 from dotenv import load_dotenv
-from utils import make_response
+from utils import make_pdf_page_responses, make_response
 
 load_dotenv()
 
 image_path = "./images/gr_salad.jpg"
+# 실행 인자로 PDF 경로를 받습니다. (예: python llm_01.py 보고서.pdf)
+pdf_path = sys.argv[1] if len(sys.argv) > 1 else None
+
+# 프로세스 풀을 사용하므로 __main__ 체크가 필요합니다. (Windows에서는 워커가 이 파일을 다시 import)
+if __name__ == "__main__":
+    # TODO: doc 업로드 추가
+    ai_content = make_response(
+        user_content="이 이미지에 대해서 설명해줘",
+        image_path=image_path,
+    )
+    print(ai_content)
 
-# TODO: pdf, doc 업로드 추가
-# TODO: pdf -> image 변환 후에 업로드 (300dpi)
-ai_content = make_response(
-    user_content="이 이미지에 대해서 설명해줘",
-    image_path=image_path,
-)
-print(ai_content)
+    # pdf -> image 변환 후에 업로드 (300dpi)
+    # 페이지 렌더링은 여러 프로세스에서 병렬로 진행되고, 2페이지씩 묶어서 요청합니다.
+    if pdf_path:
+        for page_numbers, ai_content in make_pdf_page_responses(
+            user_content="이 페이지들의 내용을 설명해줘",
+            pdf_path=pdf_path,
+            dpi=300,
+            pages_per_request=2,
+        ):
+            print(f"## 페이지 {page_numbers} ##")
+            print(ai_content)
@@ -0,0 +1,134 @@
+"""
+LLM 응답 디스크 캐시 (SQLite)
+
+같은 메시지/모델/temperature/응답 포맷으로 다시 요청하면 API를 호출하지 않고
+저장된 응답을 돌려주기 위한 캐시입니다. 최대 항목 수를 넘으면 가장 오래 사용하지 않은
+항목부터 지우고(LRU), 유효 기간(TTL)이 지난 항목은 사용하지 않습니다.
+
+사용 예:
+    >>> cache = ResponseCache("llm_cache.sqlite3", max_entries=5000, ttl=7 * 24 * 3600)
+    >>> response = make_response("요약해주세요 ...", cache=cache)
+    >>> response.cache_hit  # 두 번째 호출부터 True
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pydantic import BaseModel
+
+
+class ResponseCache:
+    """SQLite 기반 LRU + TTL 응답 캐시.
+
+    여러 스레드에서 동시에 사용할 수 있습니다. 값은 응답 문자열과 usage(dict)만
+    저장하며, ResponseWithUsage 등의 객체로 되돌리는 일은 make_response가 담당합니다.
+    """
+
+    def __init__(
+        self,
+        path: str = "llm_cache.sqlite3",
+        max_entries: int = 1000,
+        ttl: float | None = 7 * 24 * 3600,
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"이면 메모리에만 저장)
+            max_entries: 최대 저장 항목 수. 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+            ttl: 항목의 유효 기간(초). None이면 만료되지 않습니다.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    usage TEXT,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+
+    @staticmethod
+    def make_key(
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        response_format: type[BaseModel] | None = None,
+    ) -> str:
+        """요청 내용으로 캐시 키(SHA-256 해시)를 만듭니다.
+
+        response_format은 클래스 이름이 아니라 JSON 스키마로 비교하므로,
+        모델 필드가 바뀌면 다른 키가 됩니다.
+        """
+        payload = {
+            "messages": messages,
+            "model": model,
+            "temperature": temperature,
+            "schema": response_format.model_json_schema() if response_format else None,
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[str, dict | None] | None:
+        """캐시된 (content, usage)를 반환합니다. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content, usage, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            content, usage, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+
+            # LRU: 사용 시각 갱신
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return content, json.loads(usage) if usage else None
+
+    def set(self, key: str, content: str, usage: dict | None = None) -> None:
+        """응답을 저장하고, 최대 항목 수를 넘으면 오래 사용하지 않은 항목을 삭제합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                (key, content, json.dumps(usage) if usage else None, now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    """
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        """모든 항목을 삭제합니다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return count
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,326 @@
+"""
+LLM 호출 계측(instrumentation)
+
+make_response 호출마다 모델, 지연 시간, 첫 토큰까지 걸린 시간, 토큰 사용량,
+초당 출력 토큰 수, 캐시 적중 여부, 오류 종류를 CallMetrics로 만들어
+등록된 싱크(sink)들에 전달합니다.
+
+제공하는 싱크:
+    - MemoryMetricsSink   : 최근 N개를 메모리에 보관 (링 버퍼)
+    - SQLiteMetricsSink   : SQLite 테이블에 누적 저장
+    - PrometheusFileSink  : Prometheus 텍스트 포맷 파일로 집계 결과 저장
+                            (node_exporter textfile collector로 수집)
+
+사용 예:
+    >>> add_metrics_sink(SQLiteMetricsSink("llm_metrics.sqlite3"))
+    >>> make_response("안녕하세요")  # 호출 정보가 자동으로 기록됩니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, fields
+from typing import Protocol
+
+
+@dataclass
+class CallMetrics:
+    """LLM 호출 1회의 계측 정보.
+
+    Attributes:
+        timestamp: 호출 시작 시각 (Unix time)
+        model: 모델 이름
+        latency: 전체 소요 시간(초)
+        ttfb: 첫 응답(스트리밍이면 첫 토큰)까지 걸린 시간(초).
+            스트리밍이 아니면 서버가 응답을 다 만든 뒤 보내므로 latency와 같습니다.
+        input_tokens: 입력 토큰 수
+        output_tokens: 출력 토큰 수
+        total_tokens: 전체 토큰 수
+        output_tokens_per_sec: 초당 출력 토큰 수
+        cost: 예상 비용 (USD). 단가를 모르는 모델이거나 캐시 적중이면 None
+        cache_hit: 캐시에서 가져온 응답인지 여부
+        stream: 스트리밍 호출인지 여부
+        error: 실패한 경우 예외 클래스 이름
+    """
+
+    timestamp: float
+    model: str
+    latency: float
+    ttfb: float | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    total_tokens: int | None = None
+    output_tokens_per_sec: float | None = None
+    cost: float | None = None
+    cache_hit: bool = False
+    stream: bool = False
+    error: str | None = None
+
+
+class MetricsSink(Protocol):
+    """계측 정보를 받는 싱크의 프로토콜."""
+
+    def record(self, metrics: CallMetrics) -> None: ...
+
+
+_sinks: list[MetricsSink] = []
+_sinks_lock = threading.Lock()
+
+
+def add_metrics_sink(sink: MetricsSink) -> MetricsSink:
+    """싱크를 등록합니다. 이후 모든 make_response 호출이 기록됩니다."""
+    with _sinks_lock:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_metrics_sink(sink: MetricsSink) -> None:
+    """등록한 싱크를 제거합니다."""
+    with _sinks_lock:
+        _sinks.remove(sink)
+
+
+def has_metrics_sinks() -> bool:
+    """등록된 싱크가 있는지 확인합니다. (없으면 계측을 생략)"""
+    return bool(_sinks)
+
+
+def record_call(metrics: CallMetrics) -> None:
+    """등록된 모든 싱크에 계측 정보를 전달합니다.
+
+    싱크에서 오류가 나도 LLM 호출 자체는 실패하지 않도록 경고만 출력합니다.
+    """
+    with _sinks_lock:
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink.record(metrics)
+        except Exception as e:
+            warnings.warn(f"{type(sink).__name__} 기록 실패: {e}")
+
+
+class MemoryMetricsSink:
+    """최근 maxlen개의 계측 정보를 메모리에 보관하는 링 버퍼 싱크."""
+
+    def __init__(self, maxlen: int = 1000):
+        self._records: deque[CallMetrics] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, metrics: CallMetrics) -> None:
+        with self._lock:
+            self._records.append(metrics)
+
+    def records(self) -> list[CallMetrics]:
+        """보관 중인 계측 정보를 오래된 순서로 반환합니다."""
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> dict:
+        """보관 중인 호출의 요약 통계를 반환합니다."""
+        records = self.records()
+        latencies = sorted(r.latency for r in records if r.error is None)
+
+        def percentile(q: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
+
+        return {
+            "calls": len(records),
+            "errors": sum(1 for r in records if r.error),
+            "cache_hits": sum(1 for r in records if r.cache_hit),
+            "latency_p50": percentile(50),
+            "latency_p95": percentile(95),
+            "total_tokens": sum(r.total_tokens or 0 for r in records if not r.cache_hit),
+            "cost": sum(r.cost or 0 for r in records),
+        }
+
+
+class SQLiteMetricsSink:
+    """계측 정보를 SQLite 테이블(llm_calls)에 누적 저장하는 싱크."""
+
+    def __init__(self, path: str = "llm_metrics.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL NOT NULL,
+                    model TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    ttfb REAL,
+                    input_tokens INTEGER,
+                    output_tokens INTEGER,
+                    total_tokens INTEGER,
+                    output_tokens_per_sec REAL,
+                    cost REAL,
+                    cache_hit INTEGER NOT NULL,
+                    stream INTEGER NOT NULL,
+                    error TEXT
+                )
+                """
+            )
+        self._columns = [f.name for f in fields(CallMetrics)]
+
+    def record(self, metrics: CallMetrics) -> None:
+        values = asdict(metrics)
+        placeholders = ", ".join("?" for _ in self._columns)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO llm_calls ({', '.join(self._columns)}) VALUES ({placeholders})",
+                [values[name] for name in self._columns],
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class PrometheusFileSink:
+    """호출 통계를 집계하여 Prometheus 텍스트 포맷 파일로 저장하는 싱크.
+
+    기록할 때마다 임시 파일에 쓴 뒤 교체하므로, 수집기가 쓰는 도중의 파일을 읽지 않습니다.
+    """
+
+    LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, path: str = "llm_metrics.prom"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)  # (model, outcome)
+        self._errors = defaultdict(int)  # (model, error)
+        self._tokens = defaultdict(int)  # (model, type)
+        self._cost = defaultdict(float)  # model
+        self._tokens_per_sec = {}  # model → 마지막 값
+        self._histograms = {
+            "llm_request_duration_seconds": defaultdict(self._new_histogram),
+            "llm_time_to_first_byte_seconds": defaultdict(self._new_histogram),
+        }
+
+    def _new_histogram(self) -> dict:
+        return {"buckets": [0] * len(self.LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+
+    def _observe(self, name: str, model: str, value: float) -> None:
+        histogram = self._histograms[name][model]
+        for i, bound in enumerate(self.LATENCY_BUCKETS):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+    def record(self, metrics: CallMetrics) -> None:
+        model = metrics.model
+        outcome = "error" if metrics.error else "cache_hit" if metrics.cache_hit else "success"
+        with self._lock:
+            self._requests[(model, outcome)] += 1
+            if metrics.error:
+                self._errors[(model, metrics.error)] += 1
+            elif not metrics.cache_hit:
+                # 캐시 적중은 실제로 사용한 토큰/비용이 없으므로 집계하지 않음
+                self._tokens[(model, "input")] += metrics.input_tokens or 0
+                self._tokens[(model, "output")] += metrics.output_tokens or 0
+                self._cost[model] += metrics.cost or 0
+                self._observe("llm_request_duration_seconds", model, metrics.latency)
+                if metrics.ttfb is not None:
+                    self._observe("llm_time_to_first_byte_seconds", model, metrics.ttfb)
+                if metrics.output_tokens_per_sec is not None:
+                    self._tokens_per_sec[model] = metrics.output_tokens_per_sec
+            # 여러 스레드가 같은 임시 파일에 동시에 쓰지 않도록 교체까지 잠금 안에서 처리
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self._render())
+            os.replace(tmp_path, self.path)
+
+    def _render(self) -> str:
+        lines = [
+            "# HELP llm_requests_total LLM 호출 수",
+            "# TYPE llm_requests_total counter",
+        ]
+        for (model, outcome), value in sorted(self._requests.items()):
+            lines.append(f"llm_requests_total{_labels(model=model, outcome=outcome)} {value}")
+
+        lines += ["# HELP llm_errors_total 오류 종류별 실패 수", "# TYPE llm_errors_total counter"]
+        for (model, error), value in sorted(self._errors.items()):
+            lines.append(f"llm_errors_total{_labels(model=model, error=error)} {value}")
+
+        lines += ["# HELP llm_tokens_total 사용한 토큰 수", "# TYPE llm_tokens_total counter"]
+        for (model, token_type), value in sorted(self._tokens.items()):
+            lines.append(f"llm_tokens_total{_labels(model=model, type=token_type)} {value}")
+
+        lines += ["# HELP llm_cost_usd_total 예상 비용 (USD)", "# TYPE llm_cost_usd_total counter"]
+        for model, value in sorted(self._cost.items()):
+            lines.append(f"llm_cost_usd_total{_labels(model=model)} {value:.6f}")
+
+        lines += [
+            "# HELP llm_output_tokens_per_second 마지막 호출의 초당 출력 토큰 수",
+            "# TYPE llm_output_tokens_per_second gauge",
+        ]
+        for model, value in sorted(self._tokens_per_sec.items()):
+            lines.append(f"llm_output_tokens_per_second{_labels(model=model)} {value:.3f}")
+
+        for name, histograms in self._histograms.items():
+            lines += [f"# TYPE {name} histogram"]
+            for model, histogram in sorted(histograms.items()):
+                for bound, count in zip(self.LATENCY_BUCKETS, histogram["buckets"]):
+                    lines.append(f"{name}_bucket{_labels(model=model, le=bound)} {count}")
+                lines.append(f'{name}_bucket{_labels(model=model, le="+Inf")} {histogram["count"]}')
+                lines.append(f'{name}_sum{_labels(model=model)} {histogram["sum"]:.6f}')
+                lines.append(f'{name}_count{_labels(model=model)} {histogram["count"]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels) -> str:
+    """Prometheus 레이블 문자열을 만듭니다.
+
+    텍스트 형식 규칙에 따라 값의 역슬래시, 큰따옴표, 줄바꿈을 이스케이프합니다.
+    """
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels.values()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def make_call_metrics(
+    model: str,
+    started_at: float,
+    usage=None,
+    cost: float | None = None,
+    first_token_at: float | None = None,
+    cache_hit: bool = False,
+    stream: bool = False,
+    error: Exception | None = None,
+) -> CallMetrics:
+    """호출 시작 시각(time.perf_counter 기준)과 결과로 CallMetrics를 만듭니다."""
+    latency = time.perf_counter() - started_at
+    ttfb = first_token_at - started_at if first_token_at is not None else latency
+
+    output_tokens = usage.output_tokens if usage else None
+    # 출력 생성 구간: 스트리밍이면 첫 토큰 이후, 아니면 전체 소요 시간
+    generation_time = latency - ttfb if stream and first_token_at is not None else latency
+    tokens_per_sec = (
+        output_tokens / generation_time
+        if output_tokens and generation_time > 0 and not cache_hit
+        else None
+    )
+
+    return CallMetrics(
+        timestamp=time.time() - latency,
+        model=model,
+        latency=latency,
+        ttfb=ttfb if error is None else None,
+        input_tokens=usage.input_tokens if usage else None,
+        output_tokens=output_tokens,
+        total_tokens=usage.total_tokens if usage else None,
+        output_tokens_per_sec=tokens_per_sec,
+        cost=None if cache_hit else cost,
+        cache_hit=cache_hit,
+        stream=stream,
+        error=type(error).__name__ if error else None,
+    )
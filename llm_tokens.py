@@ -0,0 +1,231 @@
+"""
+LLM 요청 토큰 계산 / 예산 관리
+
+API를 호출하기 전에 로컬에서 입력 토큰 수와 예상 비용을 계산합니다.
+tiktoken을 사용할 수 없는 환경(미설치, 폐쇄망에서 인코딩 파일 다운로드 불가 등)에서는
+문자 수 기반의 보수적인 추정치를 사용합니다.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# 모델별 입력 토큰 단가 (USD / 1M tokens)
+INPUT_PRICE_PER_1M_TOKENS = {
+    "gpt-4o-mini": 0.15,
+    "gpt-4o": 2.50,
+    "gpt-4.1-nano": 0.10,
+    "gpt-4.1-mini": 0.40,
+    "gpt-4.1": 2.00,
+    "o4-mini": 1.10,
+    "o3": 2.00,
+}
+
+# 모델별 출력 토큰 단가 (USD / 1M tokens)
+OUTPUT_PRICE_PER_1M_TOKENS = {
+    "gpt-4o-mini": 0.60,
+    "gpt-4o": 10.00,
+    "gpt-4.1-nano": 0.40,
+    "gpt-4.1-mini": 1.60,
+    "gpt-4.1": 8.00,
+    "o4-mini": 4.40,
+    "o3": 8.00,
+}
+
+# 메시지마다 붙는 형식 토큰 수 (OpenAI cookbook 기준)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+class TokenBudgetExceededError(ValueError):
+    """입력 토큰 수가 지정한 예산을 넘었을 때 발생하는 예외."""
+
+    def __init__(self, input_tokens: int, max_input_tokens: int):
+        self.input_tokens = input_tokens
+        self.max_input_tokens = max_input_tokens
+        super().__init__(
+            f"입력 토큰 수({input_tokens:,})가 예산({max_input_tokens:,})을 초과했습니다."
+        )
+
+
+@dataclass
+class TokenEstimate:
+    """요청 전 입력 토큰/비용 추정 결과.
+
+    Attributes:
+        input_tokens: 예상 입력 토큰 수
+        input_cost: 예상 입력 비용 (USD). 단가를 모르는 모델이면 None
+        exact: tiktoken으로 계산했으면 True, 문자 수로 추정했으면 False
+    """
+
+    input_tokens: int
+    input_cost: float | None
+    exact: bool
+
+
+@lru_cache(maxsize=32)
+def get_encoding(model: str):
+    """모델별 tiktoken 인코딩을 한 번만 로드하여 재사용합니다.
+
+    사용할 수 없으면 None을 반환합니다.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # 모르는 모델명이면 최신 모델의 인코딩 사용
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # 폐쇄망 등에서 인코딩 파일을 내려받지 못한 경우
+        return None
+
+
+def _estimate_without_tokenizer(text: str) -> int:
+    """tokenizer 없이 토큰 수를 보수적으로 추정합니다.
+
+    영문/숫자(ASCII)는 약 4글자당 1토큰, 한글 등은 글자당 1토큰으로 계산합니다.
+    """
+    ascii_chars = len(text.encode("ascii", errors="ignore"))
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """텍스트의 토큰 수를 계산합니다."""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return _estimate_without_tokenizer(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _longest_prefix(text: str, max_tokens: int, model: str) -> str:
+    """count_tokens 기준으로 max_tokens 이하인 가장 긴 앞부분을 이진 탐색으로 찾습니다.
+
+    한글과 영문이 섞인 텍스트는 글자마다 토큰 수가 달라 비율로 자르면 예산을 넘을 수 있습니다.
+    """
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def truncate_text(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """텍스트를 앞에서부터 max_tokens 토큰까지만 남기고 자릅니다.
+
+    반환한 텍스트의 count_tokens 결과는 항상 max_tokens 이하입니다.
+    """
+    if max_tokens <= 0:
+        return ""
+
+    encoding = get_encoding(model)
+    if encoding is None:
+        if _estimate_without_tokenizer(text) <= max_tokens:
+            return text
+        return _longest_prefix(text, max_tokens, model)
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    truncated = encoding.decode(tokens[:max_tokens])
+    if count_tokens(truncated, model) <= max_tokens:
+        return truncated
+    # 잘린 위치에서 다시 인코딩하면 토큰이 늘어나는 드문 경우
+    return _longest_prefix(truncated, max_tokens, model)
+
+
+def _text_parts(content: str | list[dict]) -> list[str]:
+    """메시지 content에서 텍스트 부분만 꺼냅니다. (이미지/파일은 제외)"""
+    if isinstance(content, str):
+        return [content]
+    return [part["text"] for part in content if part.get("type") == "text"]
+
+
+def count_message_tokens(messages: list[dict], model: str = "gpt-4o-mini") -> int:
+    """Chat Completion 메시지 목록의 입력 토큰 수를 계산합니다.
+
+    이미지와 파일(PDF) 파트는 계산에 포함하지 않습니다.
+    """
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        total += TOKENS_PER_MESSAGE
+        total += sum(count_tokens(text, model) for text in _text_parts(message["content"]))
+    return total
+
+
+def _lookup_price(prices: dict[str, float], model: str) -> float | None:
+    """단가표에서 모델의 단가를 찾습니다.
+
+    "gpt-4o-mini-2024-07-18"처럼 날짜가 붙은 모델명은 가장 길게 일치하는 이름으로 찾습니다.
+    """
+    for name in sorted(prices, key=len, reverse=True):
+        if model == name or model.startswith(name + "-"):
+            return prices[name]
+    return None
+
+
+def get_input_price(model: str) -> float | None:
+    """모델의 입력 단가(USD / 1M tokens)를 반환합니다."""
+    return _lookup_price(INPUT_PRICE_PER_1M_TOKENS, model)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float | None:
+    """입력/출력 토큰 수로 예상 비용(USD)을 계산합니다. 단가를 모르면 None."""
+    input_price = _lookup_price(INPUT_PRICE_PER_1M_TOKENS, model)
+    output_price = _lookup_price(OUTPUT_PRICE_PER_1M_TOKENS, model)
+    if input_price is None or output_price is None:
+        return None
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def estimate_messages(messages: list[dict], model: str = "gpt-4o-mini") -> TokenEstimate:
+    """메시지 목록의 입력 토큰 수와 예상 비용을 계산합니다."""
+    input_tokens = count_message_tokens(messages, model)
+    price = get_input_price(model)
+    return TokenEstimate(
+        input_tokens=input_tokens,
+        input_cost=input_tokens * price / 1_000_000 if price is not None else None,
+        exact=get_encoding(model) is not None,
+    )
+
+
+def fit_messages_to_budget(
+    messages: list[dict], max_input_tokens: int, model: str = "gpt-4o-mini"
+) -> list[dict]:
+    """마지막 사용자 메시지의 텍스트를 잘라 입력 토큰 수를 예산 안으로 맞춥니다.
+
+    시스템 메시지 등 나머지 메시지만으로도 예산을 넘으면 TokenBudgetExceededError가 발생합니다.
+    """
+    input_tokens = count_message_tokens(messages, model)
+    if input_tokens <= max_input_tokens:
+        return messages
+
+    last = messages[-1]
+    texts = _text_parts(last["content"])
+    user_tokens = sum(count_tokens(text, model) for text in texts)
+    allowed = max_input_tokens - (input_tokens - user_tokens)
+    if allowed <= 0:
+        raise TokenBudgetExceededError(input_tokens, max_input_tokens)
+
+    if isinstance(last["content"], str):
+        content = truncate_text(last["content"], allowed, model)
+    else:
+        # 텍스트 파트가 여러 개면 앞쪽 파트부터 남은 예산을 배분
+        content = []
+        for part in last["content"]:
+            if part.get("type") == "text":
+                text = truncate_text(part["text"], allowed, model)
+                allowed -= count_tokens(text, model)
+                part = {**part, "text": text}
+            content.append(part)
+
+    return messages[:-1] + [{**last, "content": content}]
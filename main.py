@@ -1,10 +1,17 @@
 import os
 from dotenv import load_dotenv
+from llm_metrics import PrometheusFileSink, SQLiteMetricsSink, add_metrics_sink
 from tasks import create_email_body, summarize_meeting
 
 load_dotenv()
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", default=None) or None
 
+# LLM 호출 기록 (지연 시간, 토큰 수, 비용)
+# - llm_metrics.sqlite3 : 호출별 기록 (llm_calls 테이블)
+# - llm_metrics.prom    : Prometheus 수집용 집계 파일
+add_metrics_sink(SQLiteMetricsSink("llm_metrics.sqlite3"))
+add_metrics_sink(PrometheusFileSink("llm_metrics.prom"))
+
 # email_body = create_email_body(
 #     받는사람="이진석 대리",  # keyword parameters
 #     용건="8월 업무보고",
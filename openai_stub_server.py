@@ -0,0 +1,286 @@
+"""
+OpenAI 호환 로컬 스텁(stub) 서버
+
+실제 OpenAI API 대신 로컬에서 `/v1/chat/completions` 요청에 응답하는
+테스트/벤치마크용 HTTP 서버입니다. 표준 라이브러리만 사용합니다.
+
+사용 예:
+    >>> with OpenAIStubServer() as stub:
+    ...     response = make_response("안녕", api_key="stub-key", base_url=stub.base_url)
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class StubBehavior:
+    """스텁 서버의 응답 방식을 지정합니다.
+
+    Attributes:
+        content: 응답 메시지 내용
+        delay: 응답 전 대기 시간(초)
+        tpm_limit: rate_window 동안 허용할 토큰 수 (None이면 제한 없음)
+        rate_window: 토큰 제한을 계산하는 구간(초). 실제 API는 60초입니다.
+        stream_chunk_size: 스트리밍 응답에서 한 번에 보낼 글자 수
+        stream_delay: 스트리밍 응답의 조각 사이 대기 시간(초)
+        fail_first: 처음 N개의 요청에 fail_status 오류로 응답
+        fail_status: 장애 주입 시 응답할 HTTP 상태 코드
+        stall_first: 처음 N개의 요청은 stall_delay초 동안 응답하지 않음 (지연 주입)
+        stall_delay: 지연 주입 시 대기 시간(초)
+    """
+
+    content: str = "안녕하세요! 스텁 서버의 응답입니다."
+    delay: float = 0.0
+    tpm_limit: int | None = None
+    rate_window: float = 60.0
+    stream_chunk_size: int = 4
+    stream_delay: float = 0.0
+    fail_first: int = 0
+    fail_status: int = 500
+    stall_first: int = 0
+    stall_delay: float = 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반으로 대략적인 토큰 수를 계산합니다."""
+    return max(1, len(text) // 4)
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    # keep-alive 연결을 지원하려면 HTTP/1.1 + Content-Length가 필요합니다.
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘을 끄지 않으면 응답마다 ~40ms 지연이 생깁니다.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        # 핸들러 인스턴스는 TCP 연결마다 하나씩 생성됩니다.
+        self.server.stub.record_connection()
+
+    def log_message(self, format, *args):
+        pass  # 요청 로그 출력 생략
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        stub: OpenAIStubServer = self.server.stub
+        request_no = stub.record_request()
+        behavior = stub.behavior
+
+        # 장애/지연 주입 (요청 도착 순서 기준)
+        if request_no <= behavior.fail_first:
+            self._send_json(
+                behavior.fail_status,
+                {"error": {"message": "Injected server error", "type": "server_error"}},
+            )
+            return
+        if request_no <= behavior.stall_first:
+            time.sleep(behavior.stall_delay)
+
+        completion = stub.make_completion(body)
+        retry_after = stub.consume_tokens(completion["usage"]["total_tokens"])
+        if retry_after is not None:
+            self._send_json(
+                429,
+                {
+                    "error": {
+                        "message": "Rate limit reached for tokens per min (TPM).",
+                        "type": "tokens",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+                headers={"retry-after": f"{retry_after:.3f}"},
+            )
+            return
+
+        if behavior.delay:
+            time.sleep(behavior.delay)
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            self._send_event_stream(stub.make_chunks(completion, include_usage))
+        else:
+            self._send_json(200, completion)
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+    def _send_event_stream(self, chunks):
+        """chat.completion.chunk 목록을 SSE(Server-Sent Events)로 전송합니다."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        delay = self.server.stub.behavior.stream_delay
+        events = [json.dumps(chunk, ensure_ascii=False) for chunk in chunks] + ["[DONE]"]
+        for event in events:
+            data = f"data: {event}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+            if delay:
+                time.sleep(delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 기본값(5)이면 동시 연결이 몰릴 때 SYN 재전송으로 ~1초씩 지연됩니다.
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 타임아웃으로 먼저 끊은 연결에 쓰다가 나는 오류는 출력하지 않음
+        pass
+
+
+class OpenAIStubServer:
+    """OpenAI Chat Completions API를 흉내내는 로컬 HTTP 서버.
+
+    별도 스레드에서 실행되며, 요청 수와 TCP 연결 수를 기록하므로
+    커넥션 재사용 여부를 확인하는 데 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,  # 0이면 사용 가능한 포트를 자동 할당
+        behavior: StubBehavior | None = None,
+    ):
+        self.behavior = behavior or StubBehavior()
+        self._httpd = _StubHTTPServer((host, port), _StubRequestHandler)
+        self._httpd.stub = self
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.connection_count = 0
+        self.rate_limited_count = 0
+        self._token_log: list[tuple[float, int]] = []  # (시각, 토큰 수)
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI 클라이언트의 base_url로 사용할 주소를 반환합니다."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def record_request(self) -> int:
+        """요청 수를 기록하고, 이번 요청의 순번(1부터 시작)을 반환합니다."""
+        with self._lock:
+            self.request_count += 1
+            return self.request_count
+
+    def record_connection(self):
+        with self._lock:
+            self.connection_count += 1
+
+    def consume_tokens(self, tokens: int) -> float | None:
+        """토큰 사용량을 기록합니다.
+
+        TPM 제한을 넘으면 기록하지 않고, 다시 시도할 때까지 기다려야 할 시간(초)을 반환합니다.
+        """
+        limit = self.behavior.tpm_limit
+        if limit is None:
+            return None
+
+        window = self.behavior.rate_window
+        with self._lock:
+            now = time.monotonic()
+            self._token_log = [(t, n) for t, n in self._token_log if now - t < window]
+            used = sum(n for _, n in self._token_log)
+            if used + tokens > limit:
+                self.rate_limited_count += 1
+                oldest = self._token_log[0][0] if self._token_log else now
+                return max(0.0, window - (now - oldest))
+            self._token_log.append((now, tokens))
+            return None
+
+    def make_completion(self, body: dict) -> dict:
+        """요청 본문에 대한 chat.completion 응답 JSON을 생성합니다."""
+        content = self.behavior.content
+        prompt_tokens = estimate_tokens(json.dumps(body.get("messages", []), ensure_ascii=False))
+        completion_tokens = estimate_tokens(content)
+        return {
+            "id": f"chatcmpl-stub-{self.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub-model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def make_chunks(self, completion: dict, include_usage: bool) -> list[dict]:
+        """완성된 응답을 스트리밍용 chat.completion.chunk 목록으로 나눕니다."""
+        content = completion["choices"][0]["message"]["content"]
+        size = self.behavior.stream_chunk_size
+        base = {
+            "id": completion["id"],
+            "object": "chat.completion.chunk",
+            "created": completion["created"],
+            "model": completion["model"],
+        }
+
+        deltas = [{"role": "assistant", "content": ""}] + [
+            {"content": content[i : i + size]} for i in range(0, len(content), size)
+        ]
+        chunks = [
+            {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            for delta in deltas
+        ]
+        chunks.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        # stream_options={"include_usage": True}이면 마지막에 usage만 담긴 조각을 보냅니다.
+        if include_usage:
+            chunks.append({**base, "choices": [], "usage": completion["usage"]})
+        return chunks
+
+    def start(self) -> "OpenAIStubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "OpenAIStubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with OpenAIStubServer(port=8765) as stub:
+        print(f"OpenAI 스텁 서버 실행 중: {stub.base_url} (Ctrl+C로 종료)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,262 @@
+"""
+PDF 텍스트 추출 엔진 (PyPDF2 / pdfplumber / PyMuPDF)
+
+streamlit_11_pdf_text_extractor.py와 benchmark_pdf_engines.py에서 함께 사용합니다.
+각 함수는 페이지별 텍스트 목록을 반환하며, Streamlit 없이도 사용할 수 있도록
+진행 상황은 on_progress(처리한 페이지 수, 전체 페이지 수) 콜백으로 알립니다.
+
+입력(source)은 파일 경로 또는 메모리의 PDF 내용(bytes, bytearray, memoryview)입니다.
+메모리 입력은 임시 파일 없이 같은 버퍼를 복사하지 않고 읽습니다.
+"""
+
+import io
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# PDF 라이브러리 임포트 (설치되지 않은 경우 None)
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+try:
+    import pymupdf  # PyMuPDF
+except ImportError:
+    pymupdf = None
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+PdfSource = Union[str, os.PathLike, bytes, bytearray, memoryview]
+
+# 메모리 입력을 읽을 때 사용하는 버퍼 크기 (작은 read 호출을 C 수준에서 처리)
+READ_BUFFER_SIZE = 64 * 1024
+
+
+class MemoryViewReader(io.RawIOBase):
+    """메모리의 PDF 내용을 복사하지 않고 읽는 파일 객체
+
+    io.BytesIO(memoryview)는 내용 전체를 복사하므로, memoryview를 그대로 참조하며
+    요청한 부분만 읽어 줍니다.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        size = max(0, min(len(b), len(self._view) - self._pos))
+        b[:size] = self._view[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        if base + offset < 0:
+            raise ValueError(f"음수 위치로 이동할 수 없습니다: {base + offset}")
+        self._pos = base + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def is_in_memory(source: PdfSource) -> bool:
+    """경로가 아니라 메모리의 PDF 내용인지 확인"""
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def open_source(source: PdfSource):
+    """PDF 입력을 바이너리 파일 객체로 열기 (with 문으로 사용)"""
+    if is_in_memory(source):
+        return io.BufferedReader(MemoryViewReader(source), buffer_size=READ_BUFFER_SIZE)
+    return open(source, "rb")
+
+
+def iter_pypdf2(source: PdfSource) -> Iterator[Tuple[int, str]]:
+    """PyPDF2를 사용한 페이지별 텍스트 추출 ((전체 페이지 수, 텍스트)를 차례로 반환)"""
+    try:
+        with open_source(source) as file:
+            reader = PyPDF2.PdfReader(file)
+            total_pages = len(reader.pages)
+            for page_num in range(total_pages):
+                yield total_pages, reader.pages[page_num].extract_text()
+    except Exception as e:
+        raise RuntimeError(f"PyPDF2 처리 오류: {e}") from e
+
+
+def iter_pdfplumber(source: PdfSource) -> Iterator[Tuple[int, str]]:
+    """pdfplumber를 사용한 페이지별 텍스트 추출 ((전체 페이지 수, 텍스트)를 차례로 반환)"""
+    try:
+        # 메모리 입력은 파일 객체로 전달 (pdfplumber는 직접 연 경로만 닫으므로 with로 관리)
+        with (open_source(source) if is_in_memory(source) else nullcontext(source)) as file:
+            with pdfplumber.open(file) as pdf:
+                total_pages = len(pdf.pages)
+                for page in pdf.pages:
+                    text = page.extract_text() or ""
+                    page.close()  # 페이지 파싱 캐시 해제
+                    yield total_pages, text
+    except Exception as e:
+        raise RuntimeError(f"pdfplumber 처리 오류: {e}") from e
+
+
+def iter_pymupdf(source: PdfSource) -> Iterator[Tuple[int, str]]:
+    """PyMuPDF를 사용한 페이지별 텍스트 추출 ((전체 페이지 수, 텍스트)를 차례로 반환)"""
+    try:
+        doc = pymupdf.open(stream=source) if is_in_memory(source) else pymupdf.open(source)
+        with doc:
+            total_pages = len(doc)
+            for page_num in range(total_pages):
+                yield total_pages, doc[page_num].get_text()
+    except Exception as e:
+        raise RuntimeError(f"PyMuPDF 처리 오류: {e}") from e
+
+
+def _collect(pages: Iterator[Tuple[int, str]], on_progress: ProgressCallback) -> List[str]:
+    """페이지별 추출 결과를 목록으로 모으면서 진행 상황 알림"""
+    pages_text = []
+    for total_pages, text in pages:
+        pages_text.append(text)
+        if on_progress:
+            on_progress(len(pages_text), total_pages)
+    return pages_text
+
+
+def extract_with_pypdf2(source: PdfSource, on_progress: ProgressCallback = None) -> List[str]:
+    """PyPDF2를 사용한 텍스트 추출"""
+    return _collect(iter_pypdf2(source), on_progress)
+
+
+def extract_with_pdfplumber(source: PdfSource, on_progress: ProgressCallback = None) -> List[str]:
+    """pdfplumber를 사용한 텍스트 추출"""
+    return _collect(iter_pdfplumber(source), on_progress)
+
+
+def extract_with_pymupdf(source: PdfSource, on_progress: ProgressCallback = None) -> List[str]:
+    """PyMuPDF를 사용한 텍스트 추출"""
+    return _collect(iter_pymupdf(source), on_progress)
+
+
+# 엔진 이름 → 추출 함수
+ENGINES: Dict[str, Callable[..., List[str]]] = {
+    "PyPDF2": extract_with_pypdf2,
+    "pdfplumber": extract_with_pdfplumber,
+    "PyMuPDF": extract_with_pymupdf,
+}
+
+# 엔진 이름 → 페이지별 추출 제너레이터
+PAGE_ITERATORS: Dict[str, Callable[[PdfSource], Iterator[Tuple[int, str]]]] = {
+    "PyPDF2": iter_pypdf2,
+    "pdfplumber": iter_pdfplumber,
+    "PyMuPDF": iter_pymupdf,
+}
+
+# 엔진 이름 → 라이브러리 모듈 (미설치면 None)
+ENGINE_MODULES = {"PyPDF2": PyPDF2, "pdfplumber": pdfplumber, "PyMuPDF": pymupdf}
+
+
+def available_engines() -> List[str]:
+    """설치된 라이브러리의 엔진 이름 목록"""
+    return [name for name, module in ENGINE_MODULES.items() if module is not None]
+
+
+def extract_text(engine: str, source: PdfSource, on_progress: ProgressCallback = None) -> List[str]:
+    """엔진 이름으로 페이지별 텍스트 추출 (source: 파일 경로 또는 메모리의 PDF 내용)"""
+    if engine not in ENGINES:
+        raise ValueError(f"지원하지 않는 엔진입니다: {engine} (사용 가능: {', '.join(ENGINES)})")
+    return ENGINES[engine](source, on_progress)
+
+
+def iter_text(engine: str, source: PdfSource) -> Iterator[Tuple[int, str]]:
+    """엔진 이름으로 페이지별 텍스트를 하나씩 추출 ((전체 페이지 수, 텍스트)를 차례로 반환)"""
+    if engine not in PAGE_ITERATORS:
+        raise ValueError(f"지원하지 않는 엔진입니다: {engine} (사용 가능: {', '.join(ENGINES)})")
+    return PAGE_ITERATORS[engine](source)
+
+
+class ExtractionJob:
+    """백그라운드 스레드에서 페이지별 텍스트를 추출하는 작업
+
+    추출한 페이지는 바로 pages_text에 추가되므로, 작업이 끝나기 전에도
+    지금까지 추출된 페이지를 읽어 표시할 수 있습니다.
+    cancel()을 호출하면 다음 페이지로 넘어가기 전에 추출을 멈춥니다.
+
+    Attributes:
+        pages_text: 지금까지 추출된 페이지별 텍스트 (스레드가 계속 추가)
+        total_pages: 전체 페이지 수 (첫 페이지를 추출하기 전에는 None)
+        error: 추출 중 발생한 예외 (없으면 None)
+        elapsed: 추출에 걸린 시간(초, 끝난 뒤에 설정)
+    """
+
+    def __init__(self, engine: str, source: PdfSource):
+        if engine not in PAGE_ITERATORS:
+            raise ValueError(f"지원하지 않는 엔진입니다: {engine} (사용 가능: {', '.join(ENGINES)})")
+        self.engine = engine
+        self.pages_text: List[str] = []
+        self.total_pages: Optional[int] = None
+        self.error: Optional[Exception] = None
+        self.elapsed: Optional[float] = None
+        self._source = source
+        self._cancel_event = threading.Event()
+        self._first_page_event = threading.Event()  # 첫 페이지 추출 또는 작업 종료 시 설정
+        self._done_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"extract-{engine}", daemon=True)
+
+    def start(self) -> "ExtractionJob":
+        """추출 스레드 시작"""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """추출 중단 요청"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        """추출이 끝났는지 (완료, 오류, 중단 모두 포함)"""
+        return self._done_event.is_set()
+
+    def wait_first_page(self, timeout: Optional[float] = None) -> bool:
+        """첫 페이지가 추출되거나 작업이 끝날 때까지 대기"""
+        return self._first_page_event.wait(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """작업이 끝날 때까지 대기"""
+        return self._done_event.wait(timeout)
+
+    def _run(self):
+        start_time = time.perf_counter()
+        pages = iter_text(self.engine, self._source)
+        try:
+            for total_pages, text in pages:
+                if self._cancel_event.is_set():
+                    break
+                self.total_pages = total_pages
+                self.pages_text.append(text)
+                self._first_page_event.set()
+        except Exception as e:
+            self.error = e
+        finally:
+            pages.close()  # 중단된 경우에도 문서를 닫음
+            self._source = None  # 입력 버퍼 참조 해제
+            self.elapsed = time.perf_counter() - start_time
+            if self.total_pages is None and self.error is None and not self.cancelled:
+                self.total_pages = 0  # 페이지가 없는 문서
+            self._first_page_event.set()
+            self._done_event.set()
@@ -22,5 +22,7 @@ question = st.text_input("질문을 입력하세요.")
 if st.button("전송") and question:
     # OpenAI API 활용 : 폐쇄망에서는 사용 불가.
     # 폐쇄망이라면 : 다운로드 오픈소스 모델을 활용 (ollama)
-    ai_content = make_response(user_content=question)
-    st.write(f"AI : {ai_content}")
+    # stream=True : 응답이 생성되는 대로 조금씩 화면에 출력
+    ai_content = make_response(user_content=question, stream=True)
+    st.write("AI :")
+    st.write_stream(ai_content)
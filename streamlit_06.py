@@ -15,16 +15,14 @@ image_file = st.file_uploader(
 if image_file is not None:
     # st.write(f"업로드 완료 : {image_file}")
 
-    # AI 응답 대기 중 spinner 표시
-    with st.spinner("AI가 응답을 생성하고 있습니다..."):
-        response = make_response(
-            user_content=user_content,
-            image_file=image_file,
-        )
-
-    # AI 응답 표시
+    # AI 응답 표시 (생성되는 대로 조금씩 출력)
     st.markdown("### 🤖 AI 응답")
-    st.markdown(response)
+    response = make_response(
+        user_content=user_content,
+        image_file=image_file,
+        stream=True,
+    )
+    st.write_stream(response)
 
     # Usage 정보 표시 (있는 경우)
     if response.usage:
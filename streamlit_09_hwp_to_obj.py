@@ -1,7 +1,7 @@
 import streamlit as st
 from dotenv import load_dotenv
 from pydantic import BaseModel
-from utils import hwp_to_html, make_response
+from utils import estimate_input_tokens, hwp_to_html, make_response
 
 
 class Person(BaseModel):
@@ -16,6 +16,9 @@ class ResponseModel(BaseModel):
 
 load_dotenv()
 
+# 입력 토큰 예산 (gpt-4o-mini 컨텍스트 128k 중 출력 여유분을 남김)
+MAX_INPUT_TOKENS = 100_000
+
 hwp_file = st.file_uploader("업무분장 HWP 파일을 업로드해주세요.")
 if hwp_file is not None:
     with st.spinner("HWP 파일을 HTML로 변환 중 ..."):
@@ -23,11 +26,25 @@ if hwp_file is not None:
 
     st.markdown(html_str, unsafe_allow_html=True)
 
+    user_content = "아래 HTML에서 지정 포맷을 추출해주세요.\n\n----\n\n" + html_str
+
+    # API 호출 전에 입력 토큰 수와 예상 비용 확인
+    estimate = estimate_input_tokens(user_content)
+    st.write(
+        f"예상 입력 토큰 : {estimate.input_tokens:,} "
+        f"(약 ${estimate.input_cost or 0:.4f})"
+    )
+    if estimate.input_tokens > MAX_INPUT_TOKENS:
+        st.warning(
+            f"문서가 너무 길어 앞부분 {MAX_INPUT_TOKENS:,} 토큰까지만 추출에 사용합니다."
+        )
+
     with st.spinner("OpenAI API를 통해 추출 중 ..."):
-        user_content = "아래 HTML에서 지정 포맷을 추출해주세요.\n\n----\n\n" + html_str
         response = make_response(
             user_content=user_content,
             response_format=ResponseModel,
+            max_input_tokens=MAX_INPUT_TOKENS,
+            on_budget_exceeded="truncate",
         )
         st.write(f"usage : {response.usage}")
         st.write(str(response.parsed))
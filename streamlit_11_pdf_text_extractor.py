@@ -1,22 +1,11 @@
 import streamlit as st
-import tempfile
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 
-# PDF 라이브러리 임포트 (설치되지 않은 경우 None)
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
-
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
-
-try:
-    import pymupdf  # PyMuPDF
-except ImportError:
-    pymupdf = None
+# PDF 라이브러리 및 백그라운드 추출 작업 (설치되지 않은 라이브러리는 None)
+from pdf_text_engines import ExtractionJob, PyPDF2, pdfplumber, pymupdf
 
 
 # 페이지 설정
@@ -57,72 +46,326 @@ with st.sidebar:
     """)
 
 
-# 텍스트 추출 함수들
-def extract_with_pypdf2(pdf_path):
-    """PyPDF2를 사용한 텍스트 추출"""
-    pages_text = []
-    try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            total_pages = len(reader.pages)
-            
-            # 진행 상황 표시
-            progress_bar = st.progress(0)
-            for page_num in range(total_pages):
-                page = reader.pages[page_num]
-                text = page.extract_text()
-                pages_text.append(text)
-                progress_bar.progress((page_num + 1) / total_pages)
-            progress_bar.empty()
-            
-    except Exception as e:
-        raise Exception(f"PyPDF2 처리 오류: {e}")
+# 추출 결과 캐시 설정 (위젯을 조작할 때마다 스크립트가 다시 실행되어도 다시 추출하지 않음)
+CACHE_MAX_ENTRIES = 16  # 캐시에 보관할 (파일, 라이브러리) 결과 수
+CACHE_MAX_TOTAL_MB = 200  # 캐시에 보관할 추출 텍스트의 전체 크기 (UTF-8 기준)
+
+
+# 백그라운드 추출 설정 (추출된 페이지부터 바로 표시)
+REFRESH_SECONDS = 0.5  # 추출 중 결과 화면을 다시 그리는 간격
+FIRST_PAGE_WAIT_SECONDS = 2  # 첫 화면을 그리기 전에 첫 페이지를 기다리는 최대 시간
+
+
+class ExtractionResultCache:
+    """끝난 추출 작업을 (파일 내용 해시, 라이브러리)별로 보관하는 LRU 캐시
+
+    모든 세션이 함께 사용하므로 진행 중인 작업은 넣지 않고, 끝난 작업만 보관합니다.
+    항목 수(max_entries)와 추출 텍스트의 전체 크기(max_bytes)를 모두 넘지 않도록
+    오래 사용하지 않은 항목부터 삭제하며, 혼자서 max_bytes를 넘는 결과는 보관하지 않습니다.
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._jobs = OrderedDict()  # 키 → (작업, 텍스트 크기)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """캐시된 작업 (없으면 None)"""
+        with self._lock:
+            if key not in self._jobs:
+                return None
+            self._jobs.move_to_end(key)
+            return self._jobs[key][0]
+
+    def put(self, key, job):
+        """끝난 작업을 보관하고, 제한을 넘으면 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            if key in self._jobs:
+                self._jobs.move_to_end(key)
+                return
+        
+        size = sum(len(text.encode("utf-8")) for text in job.pages_text)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._jobs:
+                return
+            self._jobs[key] = (job, size)
+            self._total_bytes += size
+            while len(self._jobs) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, old_size) = self._jobs.popitem(last=False)
+                self._total_bytes -= old_size
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache():
+    """모든 세션이 공유하는 추출 결과 캐시 (앱 프로세스에 하나)"""
+    return ExtractionResultCache(CACHE_MAX_ENTRIES, CACHE_MAX_TOTAL_MB * 1024 * 1024)
+
+
+# 텍스트 추출 함수
+def cancel_extraction():
+    """현재 세션에서 진행 중인 추출 작업 중단 (캐시된 작업은 이미 끝났으므로 영향 없음)"""
+    job = st.session_state.pop("extraction_job", None)
+    if job is not None and not job.done:
+        job.cancel()
+
+
+def get_extraction_job(file_hash, engine, pdf_bytes):
+    """현재 세션의 추출 작업 (파일이나 라이브러리가 바뀌면 이전 작업을 중단하고 새로 시작)
+
+    진행 중인 작업은 세션마다 따로 만들므로, 한 세션에서 중단해도 다른 세션에는 영향이 없습니다.
+    끝난 작업만 캐시에 넣어 다른 세션이나 나중의 같은 요청에서 재사용합니다.
+
+    Returns:
+        (추출 작업, 이미 끝난 결과를 캐시에서 가져왔는지 여부)
+    """
+    job_key = (file_hash, engine)
+    result_cache = get_result_cache()
+    job = st.session_state.get("extraction_job")
+    if job is not None and st.session_state.get("extraction_job_key") == job_key:
+        if job.done and job.error is None and not job.cancelled:
+            result_cache.put(job_key, job)
+        return job, st.session_state["extraction_cache_hit"]
     
-    return pages_text
-
-
-def extract_with_pdfplumber(pdf_path):
-    """pdfplumber를 사용한 텍스트 추출"""
-    pages_text = []
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            
-            # 진행 상황 표시
-            progress_bar = st.progress(0)
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text()
-                pages_text.append(text or "")
-                progress_bar.progress((i + 1) / total_pages)
-            progress_bar.empty()
-            
-    except Exception as e:
-        raise Exception(f"pdfplumber 처리 오류: {e}")
+    cancel_extraction()
+    job = result_cache.get(job_key)
+    cache_hit = job is not None
+    if job is None:
+        job = ExtractionJob(engine, pdf_bytes).start()
     
-    return pages_text
+    st.session_state["extraction_job"] = job
+    st.session_state["extraction_job_key"] = job_key
+    st.session_state["extraction_cache_hit"] = cache_hit
+    return job, cache_hit
+
+
+# 페이지 뷰어 설정 (큰 PDF도 보이는 범위의 페이지만 위젯으로 그림)
+PAGE_WINDOW_SIZES = [5, 10, 20, 50]  # 한 번에 표시할 페이지 수 선택지
+PREVIEW_CHARS = 500  # 미리보기 글자 수
+
+
+def build_all_text(pages_text):
+    """전체 텍스트 다운로드 내용 (페이지 구분 표시 포함)"""
+    return "\n\n" + "="*50 + "\n\n".join([
+        f"[페이지 {i}]\n{text}" 
+        for i, text in enumerate(pages_text, 1)
+    ])
+
+
+def find_pages(pages_text, query, page_numbers):
+    """검색어가 들어 있는 페이지 번호 목록 (대소문자 구분 없음)"""
+    query = query.lower()
+    return [i for i in page_numbers if query in pages_text[i - 1].lower()]
+
 
+def jump_to_search_result():
+    """검색 결과에서 고른 페이지부터 보이도록 시작 페이지 이동"""
+    if st.session_state.get("search_jump") is not None:
+        st.session_state["view_start"] = st.session_state["search_jump"]
 
-def extract_with_pymupdf(pdf_path):
-    """PyMuPDF를 사용한 텍스트 추출"""
-    pages_text = []
-    try:
-        doc = pymupdf.open(pdf_path)
-        total_pages = len(doc)
+
+def render_page(i, text, base_name, view_key):
+    """페이지 하나를 접기/펼치기 영역으로 표시
+
+    다운로드 내용은 버튼을 누를 때 만들어지므로 페이지 텍스트를 미리 브라우저로 보내지 않습니다.
+    """
+    # 페이지 헤더와 문자 수 표시
+    page_char_count = len(text)
+    page_word_count = len(text.split()) if text.strip() else 0
+    
+    with st.expander(
+        f"📄 페이지 {i} "
+        f"({page_char_count:,}자, {page_word_count:,}단어)"
+    ):
+        if not text.strip():
+            st.info("💭 이 페이지에는 추출 가능한 텍스트가 없습니다.")
+            return
         
-        # 진행 상황 표시
-        progress_bar = st.progress(0)
-        for page_num in range(total_pages):
-            page = doc[page_num]
-            text = page.get_text()
-            pages_text.append(text)
-            progress_bar.progress((page_num + 1) / total_pages)
-        progress_bar.empty()
+        # 텍스트 미리보기 (처음 PREVIEW_CHARS자)
+        if len(text) > PREVIEW_CHARS:
+            full_view = st.checkbox(
+                "전체 텍스트 보기", 
+                key=f"full_view_{view_key}_{i}"
+            )
+            if full_view:
+                st.text_area("추출된 텍스트", text, height=400, key=f"text_{view_key}_{i}")
+            else:
+                st.text_area(
+                    "추출된 텍스트 (미리보기)",
+                    text[:PREVIEW_CHARS] + "...",
+                    height=200,
+                    key=f"preview_{view_key}_{i}"
+                )
+        else:
+            st.text_area("추출된 텍스트", text, height=200, key=f"text_{view_key}_{i}")
         
-        doc.close()
-    except Exception as e:
-        raise Exception(f"PyMuPDF 처리 오류: {e}")
+        # 페이지별 다운로드 버튼 (누를 때 내용 생성)
+        st.download_button(
+            label=f"📥 페이지 {i} 다운로드",
+            data=lambda: text,
+            file_name=f"{base_name}_page_{i}.txt",
+            mime="text/plain",
+            key=f"download_{view_key}_{i}",
+            on_click="ignore"
+        )
+
+
+def render_page_viewer(pages_text, base_name, view_key, total_pages=None):
+    """검색과 페이지 범위 선택이 가능한 페이지 뷰어
+
+    선택한 범위(최대 PAGE_WINDOW_SIZES 중 고른 수)의 페이지만 그립니다.
+    view_key가 바뀌면(다른 파일/라이브러리) 첫 페이지부터 다시 표시합니다.
+    추출 중이면 pages_text는 지금까지 추출된 페이지이고, total_pages는 전체 페이지 수입니다.
+    """
+    total_pages = total_pages or len(pages_text)
+    if st.session_state.get("viewer_key") != view_key:
+        st.session_state["viewer_key"] = view_key
+        st.session_state["view_start"] = 1
+        st.session_state.pop("search_jump", None)
+    
+    # 페이지별 표시 옵션
+    display_option = st.radio(
+        "표시 옵션",
+        ["모든 페이지", "텍스트가 있는 페이지만"],
+        horizontal=True
+    )
+    page_numbers = [
+        i for i, text in enumerate(pages_text, 1)
+        if display_option == "모든 페이지" or text.strip()
+    ]
     
-    return pages_text
+    # 검색해서 페이지로 이동
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input("🔍 텍스트 검색", placeholder="찾을 단어를 입력하세요")
+    with col2:
+        window_size = st.selectbox("한 번에 표시할 페이지 수", PAGE_WINDOW_SIZES, index=1)
+    
+    if query:
+        matches = find_pages(pages_text, query, page_numbers)
+        if matches:
+            st.selectbox(
+                f"🔎 '{query}' 검색 결과: {len(matches):,}개 페이지",
+                matches,
+                index=None,
+                format_func=lambda i: f"페이지 {i}",
+                placeholder="이동할 페이지를 선택하세요",
+                key="search_jump",
+                on_change=jump_to_search_result
+            )
+        else:
+            st.warning(f"'{query}'이(가) 들어 있는 페이지가 없습니다.")
+    
+    # 표시할 페이지 범위 선택
+    start = st.number_input(
+        "시작 페이지", min_value=1, max_value=max(1, total_pages), step=1, key="view_start"
+    )
+    visible = [i for i in page_numbers if i >= start][:window_size]
+    earlier = [i for i in page_numbers if i < start]
+    later = [i for i in page_numbers if visible and i > visible[-1]]
+    
+    col1, col2, col3 = st.columns([1, 3, 1])
+    with col1:
+        st.button(
+            "◀ 이전",
+            disabled=not earlier,
+            on_click=st.session_state.update,
+            kwargs={"view_start": earlier[-window_size] if len(earlier) >= window_size else 1}
+        )
+    with col2:
+        if visible:
+            st.caption(
+                f"페이지 {visible[0]}~{visible[-1]} 표시 "
+                f"(표시 대상 {len(page_numbers):,}개 페이지 중 {len(earlier) + 1:,}번째부터)"
+            )
+    with col3:
+        st.button(
+            "다음 ▶",
+            disabled=not later,
+            on_click=st.session_state.update,
+            kwargs={"view_start": later[0] if later else start}
+        )
+    
+    if not visible and start > len(pages_text):
+        st.info(f"⏳ 페이지 {start}부터는 아직 추출 중입니다.")
+    elif not visible:
+        st.info("💭 이 범위에 표시할 페이지가 없습니다.")
+    for i in visible:
+        render_page(i, pages_text[i - 1], base_name, view_key)
+
+
+def show_extraction(job, cache_hit, base_name, view_key, refreshing):
+    """추출 결과 표시 (추출 중이면 지금까지 추출된 페이지와 진행 상황 표시)
+
+    추출 중에는 fragment로 REFRESH_SECONDS마다 이 부분만 다시 그리고(refreshing=True),
+    추출이 끝나면 앱 전체를 한 번 다시 실행하여 자동 갱신을 멈춥니다.
+    """
+    if refreshing and job.done:
+        st.rerun()
+    
+    if job.error is not None:
+        st.error(f"❌ 텍스트 추출 실패: {job.error}")
+        return
+    
+    if job.total_pages is None:
+        st.progress(0.0, text="⏳ 첫 페이지를 추출하는 중...")
+        return
+    
+    # 스레드가 계속 페이지를 추가하므로 지금까지의 목록을 복사해서 사용
+    pages_text = list(job.pages_text)
+    total_pages = job.total_pages
+    
+    # 통계 표시
+    total_chars = sum(len(text) for text in pages_text)
+    non_empty_pages = sum(1 for text in pages_text if text.strip())
+    
+    if job.done:
+        st.success(
+            f"✅ 텍스트 추출 완료! (처리 시간: {job.elapsed:.2f}초"
+            + (", ⚡ 캐시된 결과)" if cache_hit else ")")
+        )
+    else:
+        st.progress(
+            len(pages_text) / total_pages,
+            text=(
+                f"⏳ 텍스트 추출 중... ({len(pages_text):,}/{total_pages:,} 페이지, "
+                "추출된 페이지부터 볼 수 있습니다)"
+            )
+        )
+    
+    # 추출 통계
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("총 페이지", f"{total_pages}개")
+    with col2:
+        st.metric("텍스트 있는 페이지", f"{non_empty_pages}개")
+    with col3:
+        st.metric("총 문자 수", f"{total_chars:,}자")
+    with col4:
+        st.metric("처리 시간", f"{job.elapsed:.2f}초" if job.done else "추출 중")
+    
+    st.markdown("---")
+    
+    # 페이지별 텍스트 표시
+    st.header("📄 추출된 텍스트")
+    
+    # 전체 텍스트 다운로드 버튼 (누를 때 내용 생성, 추출이 끝난 뒤 사용 가능)
+    st.download_button(
+        label="📥 전체 텍스트 다운로드 (TXT)",
+        data=lambda: build_all_text(pages_text),
+        file_name=f"{base_name}_extracted.txt",
+        mime="text/plain",
+        on_click="ignore",
+        disabled=not job.done
+    )
+    
+    # 페이지 뷰어 (보이는 범위의 페이지만 표시)
+    render_page_viewer(pages_text, base_name, view_key, total_pages)
+
 
 
 # 메인 UI
@@ -201,146 +444,37 @@ if pdf_file is not None:
     with col3:
         st.info(f"🔧 라이브러리: {selected_lib}")
     
-    # 임시 파일로 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(pdf_file.read())
-        tmp_path = tmp_file.name
+    # 업로드 버퍼를 복사하지 않는 memoryview (해시와 추출에서 함께 사용)
+    pdf_bytes = pdf_file.getbuffer()
+    file_hash = hashlib.sha256(pdf_bytes).hexdigest()
     
-    # 텍스트 추출
+    # 백그라운드에서 텍스트 추출 (같은 파일/라이브러리면 캐시된 결과 사용)
+    job, cache_hit = get_extraction_job(file_hash, selected_lib, pdf_bytes)
+    
+    # 첫 페이지가 추출되면 바로 표시하고, 나머지는 추출되는 대로 채움
     with st.spinner(f"{selected_lib}로 텍스트 추출 중..."):
-        try:
-            import time
-            start_time = time.time()
-            
-            # 선택된 라이브러리로 추출
-            if selected_lib == "PyPDF2":
-                pages_text = extract_with_pypdf2(tmp_path)
-            elif selected_lib == "pdfplumber":
-                pages_text = extract_with_pdfplumber(tmp_path)
-            else:  # PyMuPDF
-                pages_text = extract_with_pymupdf(tmp_path)
-            
-            # 처리 시간 계산
-            elapsed_time = time.time() - start_time
-            
-            # 통계 표시
-            total_chars = sum(len(text) for text in pages_text)
-            non_empty_pages = sum(1 for text in pages_text if text.strip())
-            
-            st.success(f"✅ 텍스트 추출 완료! (처리 시간: {elapsed_time:.2f}초)")
-            
-            # 추출 통계
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("총 페이지", f"{len(pages_text)}개")
-            with col2:
-                st.metric("텍스트 있는 페이지", f"{non_empty_pages}개")
-            with col3:
-                st.metric("총 문자 수", f"{total_chars:,}자")
-            with col4:
-                st.metric("처리 시간", f"{elapsed_time:.2f}초")
-            
-            st.markdown("---")
-            
-            # 페이지별 텍스트 표시
-            st.header("📄 추출된 텍스트")
-            
-            # 전체 텍스트 다운로드 버튼
-            all_text = "\n\n" + "="*50 + "\n\n".join([
-                f"[페이지 {i}]\n{text}" 
-                for i, text in enumerate(pages_text, 1)
-            ])
-            
-            st.download_button(
-                label="📥 전체 텍스트 다운로드 (TXT)",
-                data=all_text,
-                file_name=f"{pdf_file.name.replace('.pdf', '')}_extracted.txt",
-                mime="text/plain"
-            )
-            
-            # 페이지별 표시 옵션
-            display_option = st.radio(
-                "표시 옵션",
-                ["모든 페이지", "텍스트가 있는 페이지만"],
-                horizontal=True
-            )
-            
-            # 페이지별 표시
-            for i, text in enumerate(pages_text, 1):
-                # 표시 옵션에 따라 필터링
-                if display_option == "텍스트가 있는 페이지만" and not text.strip():
-                    continue
-                
-                # 페이지 헤더와 문자 수 표시
-                page_char_count = len(text)
-                page_word_count = len(text.split()) if text.strip() else 0
-                
-                with st.expander(
-                    f"📄 페이지 {i} "
-                    f"({page_char_count:,}자, {page_word_count:,}단어)"
-                ):
-                    if text.strip():
-                        # 텍스트를 컨테이너에 표시
-                        text_container = st.container()
-                        with text_container:
-                            # 텍스트 미리보기 (처음 500자)
-                            if len(text) > 500:
-                                preview_text = text[:500] + "..."
-                                full_view = st.checkbox(
-                                    "전체 텍스트 보기", 
-                                    key=f"full_view_{i}"
-                                )
-                                if full_view:
-                                    st.text_area(
-                                        "추출된 텍스트",
-                                        text,
-                                        height=400,
-                                        key=f"text_{i}"
-                                    )
-                                else:
-                                    st.text_area(
-                                        "추출된 텍스트 (미리보기)",
-                                        preview_text,
-                                        height=200,
-                                        key=f"preview_{i}"
-                                    )
-                            else:
-                                st.text_area(
-                                    "추출된 텍스트",
-                                    text,
-                                    height=200,
-                                    key=f"text_{i}"
-                                )
-                            
-                            # 페이지별 다운로드 버튼
-                            st.download_button(
-                                label=f"📥 페이지 {i} 다운로드",
-                                data=text,
-                                file_name=f"{pdf_file.name.replace('.pdf', '')}_page_{i}.txt",
-                                mime="text/plain",
-                                key=f"download_{i}"
-                            )
-                    else:
-                        st.info("💭 이 페이지에는 추출 가능한 텍스트가 없습니다.")
-                        
-        except Exception as e:
-            st.error(f"❌ 텍스트 추출 실패: {e}")
-            
-        finally:
-            # 임시 파일 삭제
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+        job.wait_first_page(FIRST_PAGE_WAIT_SECONDS)
+    
+    refreshing = not job.done
+    st.fragment(show_extraction, run_every=REFRESH_SECONDS if refreshing else None)(
+        job,
+        cache_hit,
+        pdf_file.name.replace('.pdf', ''),
+        f"{file_hash[:16]}_{selected_lib}",
+        refreshing
+    )
 
 else:
+    # 파일을 지우면 진행 중인 추출도 중단
+    cancel_extraction()
+    
     # 업로드 전 안내 메시지
     st.info("""
     👆 PDF 파일을 업로드하면 텍스트 추출이 시작됩니다.
     
     **지원 기능:**
     - 페이지별 텍스트 추출
-    - 접기/펼치기 가능한 페이지 뷰
+    - 접기/펼치기 가능한 페이지 뷰 (페이지 범위 선택, 텍스트 검색)
     - 텍스트 다운로드 (전체/페이지별)
     - 추출 통계 표시
     """)
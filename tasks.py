@@ -1,5 +1,5 @@
 from typing import Optional
-from openai import OpenAI
+from utils import make_response
 
 
 def summarize_meeting(회의록: str, api_key: str) -> str:
@@ -38,17 +38,10 @@ def summarize_meeting(회의록: str, api_key: str) -> str:
 {회의록}"""
 
     user_content = user_prompt_template.format(회의록=회의록)
-    client = OpenAI(api_key=api_key)
     # OpenAI API가 모든 텍스트 응답을 생성하고 나서, 반환
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "user", "content": user_content},
-        ],
-    )
-    print("usage:", response.usage)  # 비용 확인 목적
-    ai_content = response.choices[0].message.content
-    return ai_content
+    # (토큰 사용량/비용은 llm_metrics에 등록한 싱크에 기록됩니다)
+    # temperature는 기존처럼 API 기본값(1.0)을 사용 (make_response의 기본값은 0.25)
+    return make_response(user_content, model="gpt-4o", temperature=1.0, api_key=api_key)
 
 
 def create_email_body(
@@ -80,14 +73,11 @@ def create_email_body(
         핵심내용=핵심내용,
     )
 
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
+    # temperature는 기존처럼 API 기본값(1.0)을 사용 (make_response의 기본값은 0.25)
+    return make_response(
+        user_content,
+        system_content=system_prompt,
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content},
-        ],
+        temperature=1.0,
+        api_key=api_key,
     )
-
-    print("response.usage :", response.usage)
-    return response.choices[0].message.content
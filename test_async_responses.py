@@ -0,0 +1,95 @@
+"""
+amake_response 테스트
+
+로컬 OpenAI 스텁 서버를 대상으로 비동기 동시 요청과
+세마포어(concurrency)로 동시 실행 수를 제한하는 동작을 확인합니다.
+"""
+
+import asyncio
+import json
+import time
+
+from pydantic import BaseModel
+from openai_stub_server import OpenAIStubServer, StubBehavior
+from utils import StructuredResponseWithUsage, amake_response, get_shared_semaphore
+
+API_KEY = "stub-key"
+
+
+class Person(BaseModel):
+    담당: str
+    업무: list[str]
+
+
+async def _gather(count: int, base_url: str, **kwargs) -> list:
+    """amake_response를 count번 동시에 호출합니다."""
+    tasks = [
+        amake_response(f"질문 {i}", api_key=API_KEY, base_url=base_url, **kwargs)
+        for i in range(count)
+    ]
+    return await asyncio.gather(*tasks)
+
+
+def test_concurrent_requests():
+    """여러 요청이 동시에 진행되어 직렬 실행보다 빨리 끝나는지 테스트"""
+    behavior = StubBehavior(delay=0.2)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        start = time.perf_counter()
+        responses = asyncio.run(_gather(10, stub.base_url))
+        elapsed = time.perf_counter() - start
+
+    assert responses == [behavior.content] * 10
+    assert all(r.usage is not None and r.usage.total_tokens > 0 for r in responses)
+    assert stub.request_count == 10
+    # 직렬이면 2초 이상 걸립니다.
+    assert elapsed < 1.0
+
+
+def test_concurrency_limit():
+    """concurrency로 지정한 수만큼만 동시에 요청하는지 테스트"""
+    with OpenAIStubServer(behavior=StubBehavior(delay=0.2)) as stub:
+        start = time.perf_counter()
+        asyncio.run(_gather(6, stub.base_url, concurrency=2))
+        elapsed = time.perf_counter() - start
+
+    # 2개씩 3번 나누어 처리되므로 최소 0.6초
+    assert stub.request_count == 6
+    assert elapsed >= 0.55
+
+
+def test_semaphore_shared_between_calls():
+    """정수 concurrency는 같은 루프에서 값별로 세마포어 하나를 공유하는지 테스트"""
+
+    async def main():
+        semaphore = get_shared_semaphore(3)
+        assert get_shared_semaphore(3) is semaphore
+        assert get_shared_semaphore(4) is not semaphore
+
+        with OpenAIStubServer(behavior=StubBehavior(delay=0.2)) as stub:
+            # 직접 넘긴 세마포어와 정수 3이 같은 제한을 함께 사용
+            task = asyncio.ensure_future(_gather(3, stub.base_url, concurrency=semaphore))
+            await asyncio.sleep(0.05)
+            assert semaphore.locked()
+            start = time.perf_counter()
+            await _gather(1, stub.base_url, concurrency=3)
+            waited = time.perf_counter() - start
+            await task
+        return waited
+
+    # 먼저 시작한 3개가 끝난 뒤에 실행되므로 대기(약 0.15초) + 응답(0.2초)
+    assert asyncio.run(main()) >= 0.3
+
+
+def test_structured_response():
+    """response_format을 지정하면 파싱된 객체를 반환하는지 테스트"""
+    content = json.dumps({"담당": "홍길동", "업무": ["회의록 작성"]}, ensure_ascii=False)
+    with OpenAIStubServer(behavior=StubBehavior(content=content)) as stub:
+        response = asyncio.run(
+            amake_response(
+                "담당자 정리", response_format=Person, api_key=API_KEY, base_url=stub.base_url
+            )
+        )
+
+    assert isinstance(response, StructuredResponseWithUsage)
+    assert response.parsed == Person(담당="홍길동", 업무=["회의록 작성"])
+    assert response.usage.input_tokens > 0
@@ -0,0 +1,72 @@
+"""
+make_base64_url 테스트
+
+조각 단위 인코딩 결과가 base64.b64encode와 같은지 조각 경계 주변 크기로 확인합니다.
+"""
+
+import base64
+import io
+import os
+from collections import OrderedDict
+
+import pytest
+import utils
+from utils import make_base64_url
+
+CHUNK = utils._BASE64_CHUNK_SIZE
+SIZES = [0, 1, 2, 3, 4, CHUNK - 2, CHUNK - 1, CHUNK, CHUNK + 1, CHUNK + 2, 2 * CHUNK + 1]
+
+
+def expected_url(data: bytes, mime_type: str) -> str:
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_chunked_encoding_matches_b64encode(tmp_path, size):
+    """파일 경로와 BytesIO 모두 b64encode와 같은 data URL을 만드는지 테스트"""
+    data = os.urandom(size)
+    pdf_path = tmp_path / f"sample_{size}.pdf"
+    pdf_path.write_bytes(data)
+
+    assert make_base64_url(file_path=str(pdf_path)) == expected_url(data, "application/pdf")
+    assert make_base64_url(file=io.BytesIO(data)) == expected_url(data, "application/octet-stream")
+
+
+def test_file_object_reads_from_current_position():
+    """파일 객체는 read()처럼 현재 위치부터 인코딩하고 위치를 끝으로 옮기는지 테스트"""
+    data = os.urandom(100)
+    file = io.BytesIO(data)
+    file.seek(10)
+
+    url = make_base64_url(file=file)
+
+    assert url == expected_url(data[10:], "application/octet-stream")
+    assert file.tell() == len(data)
+    file.write(b"more")  # 내부 버퍼를 계속 붙잡고 있지 않음
+
+
+def test_path_hashes_are_bounded(tmp_path, monkeypatch):
+    """(경로, 크기, 수정 시각) 기록이 최대 개수를 넘지 않는지 테스트"""
+    monkeypatch.setattr(utils, "_BASE64_PATH_HASHES_MAX", 3)
+    for i in range(5):
+        path = tmp_path / f"file_{i}.txt"
+        path.write_bytes(f"내용 {i}".encode("utf-8"))
+        make_base64_url(file_path=str(path))
+
+    assert len(utils._base64_path_hashes) == 3
+    assert not any(str(tmp_path / "file_0.txt") == key[0] for key in utils._base64_path_hashes)
+
+
+def test_memoize_opt_out_and_size_limit(tmp_path, monkeypatch):
+    """memoize=False면 저장하지 않고, 메모 캐시 전체 크기가 제한을 넘지 않는지 테스트"""
+    monkeypatch.setattr(utils, "_base64_url_memo", OrderedDict())
+    monkeypatch.setattr(utils, "_base64_memo_chars", 0)
+
+    make_base64_url(file=io.BytesIO(os.urandom(300)), memoize=False)
+    assert len(utils._base64_url_memo) == 0
+
+    monkeypatch.setattr(utils, "_BASE64_MEMO_MAX_CHARS", 1000)
+    for _ in range(5):
+        make_base64_url(file=io.BytesIO(os.urandom(300)))  # URL 약 440글자
+    assert len(utils._base64_url_memo) == 2
+    assert utils._base64_memo_chars <= 1000
@@ -0,0 +1,72 @@
+"""
+batch_extract_pdf_tables 일괄 추출 테스트
+"""
+
+import json
+import multiprocessing
+import time
+
+import pytest
+from batch_extract_pdf_tables import BatchManifest, collect_pdfs, run_batch
+from extract_pdf_tables import PDFExtractor
+from test_extract_pdf_tables import make_sample_pdf
+
+
+def make_archive(root):
+    """하위 폴더에 같은 이름의 PDF가 있는 문서 폴더와 깨진 PDF 생성"""
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    make_sample_pdf(root / "a" / "report.pdf", page_count=3)
+    make_sample_pdf(root / "b" / "report.pdf", page_count=4)
+    (root / "broken.pdf").write_bytes(b"not a pdf")
+    (root / "notes.txt").write_text("skip")
+
+
+def test_batch_manifest_and_resume(tmp_path):
+    """문서별 결과 폴더/매니페스트를 만들고, 다시 실행하면 끝난 문서를 건너뛰는지 테스트"""
+    make_archive(tmp_path / "docs")
+    pdfs = collect_pdfs([str(tmp_path / "docs")])
+    assert [p.name for p in pdfs] == ["report.pdf", "report.pdf", "broken.pdf"]
+
+    output_dir = tmp_path / "out"
+    summary = run_batch(pdfs, output_dir=str(output_dir), jobs=2, engine="pymupdf")
+    assert (summary["done"], summary["failed"], summary["pages"]) == (2, 1, 7)
+    assert (output_dir / "a" / "report" / "extracted_text.md").exists()
+    assert (output_dir / "b" / "report" / "extracted_text.md").exists()
+
+    manifest = BatchManifest(output_dir / "manifest.jsonl")
+    assert sorted(entry["status"] for entry in manifest.entries.values()) == [
+        "done",
+        "done",
+        "failed",
+    ]
+
+    # 이어서 실행: 끝난 문서와 실패한 문서는 건너뜀
+    summary = run_batch(pdfs, output_dir=str(output_dir), jobs=2, engine="pymupdf")
+    assert summary["skipped"] == 3 and summary["done"] == 0
+
+    # 실패한 문서만 다시 처리
+    summary = run_batch(
+        pdfs, output_dir=str(output_dir), jobs=2, retry_failed=True, engine="pymupdf"
+    )
+    assert (summary["skipped"], summary["failed"]) == (2, 1)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="fork를 지원하지 않는 플랫폼"
+)
+def test_batch_timeout(tmp_path, monkeypatch):
+    """제한 시간을 넘긴 문서는 종료하고 timeout으로 기록하는지 테스트"""
+    pdf = make_sample_pdf(tmp_path / "slow.pdf", page_count=1)
+    # 작업 프로세스가 부모의 패치를 물려받도록 fork로 시작
+    monkeypatch.setattr(PDFExtractor, "extract_all", lambda self: time.sleep(30))
+
+    started = time.perf_counter()
+    summary = run_batch(
+        collect_pdfs([pdf]), output_dir=str(tmp_path / "out"), timeout=0.5, start_method="fork"
+    )
+    assert summary["timeout"] == 1
+    assert time.perf_counter() - started < 10
+
+    entries = (tmp_path / "out" / "manifest.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(entries[-1])["status"] == "timeout"
@@ -0,0 +1,112 @@
+"""
+make_responses_batch 테스트
+
+로컬 OpenAI 스텁 서버(TPM 제한 적용)를 대상으로 동시 처리, 입력 순서 보존,
+항목별 오류 처리, 토큰/분 거버너 동작을 확인합니다.
+"""
+
+import time
+
+from pydantic import BaseModel
+from openai_stub_server import OpenAIStubServer, StubBehavior
+from utils import (
+    BatchResult,
+    StructuredResponseWithUsage,
+    TokenRateLimiter,
+    make_responses_batch,
+)
+
+API_KEY = "stub-key"
+
+
+class Person(BaseModel):
+    담당: str
+    업무: list[str]
+
+
+class PersonList(BaseModel):
+    persons: list[Person]
+
+
+def test_results_keep_input_order():
+    """결과가 입력 순서대로 반환되는지 테스트"""
+    with OpenAIStubServer(behavior=StubBehavior(delay=0.05)) as stub:
+        inputs = [f"질문 {i}" for i in range(20)]
+        results = make_responses_batch(
+            inputs, max_concurrency=10, api_key=API_KEY, base_url=stub.base_url
+        )
+
+    assert [r.index for r in results] == list(range(20))
+    assert all(r.ok for r in results)
+    assert stub.request_count == 20
+
+
+def test_concurrency_reduces_wall_time():
+    """동시 실행 시 전체 소요 시간이 직렬 실행보다 짧은지 테스트"""
+    with OpenAIStubServer(behavior=StubBehavior(delay=0.2)) as stub:
+        start = time.perf_counter()
+        make_responses_batch(
+            ["안녕"] * 10, max_concurrency=10, api_key=API_KEY, base_url=stub.base_url
+        )
+        elapsed = time.perf_counter() - start
+
+    # 직렬이면 2초 이상 걸립니다.
+    assert elapsed < 1.0
+
+
+def test_per_item_errors():
+    """일부 항목이 실패해도 나머지 결과가 반환되는지 테스트"""
+    with OpenAIStubServer() as stub:
+        results = make_responses_batch(
+            ["정상 요청", {"user_content": "파일 없음", "file_path": "./없는파일.png"}],
+            api_key=API_KEY,
+            base_url=stub.base_url,
+        )
+
+    assert isinstance(results[0], BatchResult)
+    assert results[0].ok
+    assert not results[1].ok
+    assert isinstance(results[1].error, FileNotFoundError)
+
+
+def test_structured_batch():
+    """response_format이 모든 항목에 적용되는지 테스트"""
+    content = PersonList(persons=[Person(담당="총무팀", 업무=["인사", "회계"])]).model_dump_json()
+    with OpenAIStubServer(behavior=StubBehavior(content=content)) as stub:
+        results = make_responses_batch(
+            ["업무분장 1", "업무분장 2"],
+            response_format=PersonList,
+            api_key=API_KEY,
+            base_url=stub.base_url,
+        )
+
+    for result in results:
+        assert isinstance(result.response, StructuredResponseWithUsage)
+        assert result.response.parsed.persons[0].담당 == "총무팀"
+
+
+def test_rate_limiter_prevents_429():
+    """TPM 거버너가 스텁 서버의 토큰 한도를 넘지 않는지 테스트"""
+    behavior = StubBehavior(tpm_limit=300, rate_window=1.0)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        results = make_responses_batch(
+            ["토큰 한도 테스트 " * 5] * 12,
+            max_concurrency=12,
+            rate_limiter=TokenRateLimiter(300, window=1.0),
+            api_key=API_KEY,
+            base_url=stub.base_url,
+        )
+
+    assert all(r.ok for r in results)
+    assert stub.rate_limited_count == 0
+
+
+def test_rate_limiter_waits_for_window():
+    """예산을 넘는 예약은 구간이 지날 때까지 대기하는지 테스트"""
+    limiter = TokenRateLimiter(100, window=0.3)
+    reserved = limiter.acquire(80)
+    limiter.settle(reserved, 80)
+
+    start = time.perf_counter()
+    limiter.acquire(50)
+    assert time.perf_counter() - start >= 0.25
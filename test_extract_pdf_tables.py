@@ -0,0 +1,260 @@
+"""
+extract_pdf_tables.PDFExtractor 테스트
+
+pymupdf로 텍스트와 선으로 그린 테이블이 섞인 PDF를 만들어 추출 결과를 확인합니다.
+"""
+
+import json
+
+import pandas as pd
+import pymupdf
+import pytest
+from block_classifier import BlockClassifier
+from extract_pdf_tables import PDFExtractor
+
+
+def make_sample_pdf(path, page_count: int = 9) -> str:
+    """3페이지마다 3x5 테이블이 있는 PDF 생성"""
+    doc = pymupdf.open()
+    for p in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"{p + 1}. Section {p + 1}", fontsize=16)
+        for i in range(5):
+            page.insert_text((72, 110 + i * 16), f"- item {i} on page {p + 1}", fontsize=11)
+        if p % 3 == 0:
+            for r in range(5):
+                for c in range(3):
+                    rect = pymupdf.Rect(72 + c * 120, 300 + r * 20, 192 + c * 120, 320 + r * 20)
+                    page.draw_rect(rect, color=(0, 0, 0), width=0.8)
+                    page.insert_text((rect.x0 + 4, rect.y1 - 6), f"r{r}c{c}", fontsize=10)
+    doc.save(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    return make_sample_pdf(tmp_path / "sample.pdf")
+
+
+def test_parallel_extraction_keeps_page_order(sample_pdf, tmp_path):
+    """여러 프로세스로 추출해도 순차 처리와 같은 결과(페이지 순서)인지 테스트"""
+    serial = PDFExtractor(sample_pdf, output_dir=str(tmp_path / "serial"))
+    serial._extract_pages()
+
+    parallel = PDFExtractor(sample_pdf, output_dir=str(tmp_path / "parallel"), workers=3)
+    parallel._extract_pages()
+
+    assert parallel.text_blocks == serial.text_blocks
+    assert parallel.tables == serial.tables
+    assert [t.page_num for t in parallel.tables] == [1, 4, 7]
+
+
+def test_camelot_candidate_pages(tmp_path):
+    """괘선 테이블은 lattice, 괘선 없는 정렬된 표는 stream 후보가 되는지 테스트"""
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), "Plain paragraph text only.\nSecond line here.")
+    lined = doc.new_page()
+    for r in range(3):
+        for c in range(3):
+            lined.draw_rect(pymupdf.Rect(72 + c * 100, 100 + r * 20, 172 + c * 100, 120 + r * 20))
+    borderless = doc.new_page()
+    for r in range(5):
+        for c, text in enumerate(["항목", f"{r * 100}", f"{r * 3.5:.1f}"]):
+            borderless.insert_text((72 + c * 150, 100 + r * 18), text, fontname="korea")
+    path = tmp_path / "candidates.pdf"
+    doc.save(str(path))
+
+    extractor = PDFExtractor(str(path), output_dir=str(tmp_path / "out"))
+    extractor._extract_pages()
+
+    assert extractor.camelot_pages == {"lattice": {2}, "stream": {3}}
+
+
+def test_streaming_mode_matches_in_memory(sample_pdf, tmp_path, monkeypatch):
+    """스트리밍 모드의 Markdown/HTML/JSON 결과가 일반 모드와 같은지 테스트"""
+    monkeypatch.setattr(PDFExtractor, "_extract_tables_with_camelot", lambda self: None)
+
+    outputs = {}
+    for name, options in [("memory", {}), ("stream", {"streaming": True, "workers": 2})]:
+        output_dir = tmp_path / name
+        extractor = PDFExtractor(sample_pdf, output_dir=str(output_dir), **options)
+        extractor.extract_all()
+        outputs[name] = {
+            file_name: (output_dir / file_name).read_text(encoding="utf-8")
+            for file_name in ["extracted_text.md", "extracted_text.html", "extracted_data.json"]
+        }
+
+    assert outputs["stream"] == outputs["memory"]
+    assert (tmp_path / "stream" / "extracted_stream.jsonl").exists()
+    assert extractor.text_blocks == []  # 블록은 메모리에 남기지 않음
+
+
+def test_markers_resolve_to_their_own_table(tmp_path, monkeypatch):
+    """한 페이지에 테이블이 여러 개면 마커마다 자기 테이블이 출력되는지 테스트"""
+    monkeypatch.setattr(PDFExtractor, "_extract_tables_with_camelot", lambda self: None)
+
+    doc = pymupdf.open()
+    page = doc.new_page()
+    for t, top in enumerate([100, 400]):
+        for r in range(3):
+            for c in range(2):
+                rect = pymupdf.Rect(72 + c * 150, top + r * 20, 222 + c * 150, top + 20 + r * 20)
+                page.draw_rect(rect)
+                page.insert_text((rect.x0 + 4, rect.y1 - 6), f"T{t + 1}R{r}C{c}")
+    path = tmp_path / "two_tables.pdf"
+    doc.save(str(path))
+
+    extractor = PDFExtractor(str(path), output_dir=str(tmp_path / "out"))
+    extractor.extract_all()
+
+    assert extractor.table_registry.selected(1, 2).data[0] == ["T2R0C0", "T2R0C1"]
+    markdown = (tmp_path / "out" / "extracted_text.md").read_text(encoding="utf-8")
+    assert "T1R1C0" in markdown and "T2R1C0" in markdown
+
+
+def test_heading_detected_by_font_size(tmp_path):
+    """본문보다 큰 글자의 줄은 패턴과 관계없이 제목으로 판별되는지 테스트"""
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "overview of the results", fontsize=22)
+    page.insert_text((72, 100), "sub section title", fontsize=14)
+    for i in range(6):
+        page.insert_text((72, 130 + i * 14), f"body text line number {i} goes here", fontsize=10)
+    path = tmp_path / "headings.pdf"
+    doc.save(str(path))
+
+    extractor = PDFExtractor(str(path), output_dir=str(tmp_path / "out"))
+    extractor._extract_pages()
+
+    blocks = [(b.block_type, b.level) for b in extractor.text_blocks]
+    assert blocks == [("heading", 1), ("heading", 2), ("paragraph", 0)]
+
+
+def test_body_font_size_weighted_by_text_length():
+    """본문 글자 크기는 단어 수가 아니라 글자 수가 가장 많은 크기인지 테스트"""
+    words = [
+        {"text": "제목", "size": 20.0},
+        {"text": "짧은", "size": 20.2},
+        {"text": "본문은 긴 문장입니다", "size": 10.1},
+    ]
+    assert PDFExtractor._body_font_size(words) == 10.0
+    assert PDFExtractor._body_font_size([]) == 12.0
+
+
+def test_block_classifier_rules(tmp_path):
+    """분류 규칙 우선순위와 설정 파일 로딩 테스트"""
+    classifier = BlockClassifier()
+    assert classifier.classify_batch(
+        ["1. 개요", "□ 추진 배경", "○ 상세 내용", "― 참고", "• item", "본문 " * 30, "가. 항목 " * 30]
+    ) == [
+        ("heading", 2),
+        ("list_item", 1),
+        ("list_item", 2),
+        ("list_item", 3),
+        ("list_item", 1),
+        ("paragraph", 0),
+        ("list_item", 2),
+    ]
+
+    # 대문자 판별은 str.isupper()와 같은 기준 (ASCII 외 문자 포함)
+    for text in ["ÉTAT DES LIEUX", "ΣΥΝΟΨΗ 2024", "Überblick", "été", "ǅungla"]:
+        expected = ("heading", 1) if text.isupper() or text[0].isupper() else ("paragraph", 0)
+        assert classifier.classify(text) == expected, text
+
+    config_path = tmp_path / "rules.json"
+    config_path.write_text(
+        json.dumps({"rules": [{"name": "note", "pattern": "※", "block_type": "list_item", "level": 1}]}),
+        encoding="utf-8",
+    )
+    custom = BlockClassifier.from_json(str(config_path))
+    assert custom.classify("※ 참고") == ("list_item", 1)
+    assert custom.classify("1. 개요") == ("paragraph", 0)
+
+
+def test_pymupdf_engine_matches_pdfplumber(sample_pdf, tmp_path):
+    """pymupdf 엔진도 같은 위치의 테이블과 제목/목록 블록을 찾는지 테스트"""
+    plumber = PDFExtractor(sample_pdf, output_dir=str(tmp_path / "plumber"))
+    plumber._extract_pages()
+
+    fast = PDFExtractor(sample_pdf, output_dir=str(tmp_path / "fast"), engine="pymupdf")
+    assert not fast.use_camelot
+    fast._extract_pages()
+
+    assert [(t.page_num, t.table_idx, t.data) for t in fast.tables] == [
+        (t.page_num, t.table_idx, t.data) for t in plumber.tables
+    ]
+    assert all(t.source == "pymupdf" for t in fast.tables)
+    for a, b in zip(fast.tables, plumber.tables):
+        assert a.bbox == pytest.approx(b.bbox, abs=1)
+
+    def headings_and_lists(extractor):
+        return [
+            (b.block_type, b.level, b.text)
+            for b in extractor.text_blocks
+            if b.block_type in ("heading", "list_item", "table")
+        ]
+
+    assert headings_and_lists(fast) == headings_and_lists(plumber)
+
+
+def test_cache_hit_skips_extraction(sample_pdf, tmp_path, monkeypatch):
+    """같은 PDF/옵션으로 다시 실행하면 추출 없이 캐시에서 같은 결과 파일을 만드는지 테스트"""
+    monkeypatch.setattr(PDFExtractor, "_extract_tables_with_camelot", lambda self: None)
+    cache_dir = tmp_path / "cache"
+
+    first = tmp_path / "first"
+    PDFExtractor(sample_pdf, output_dir=str(first), cache_dir=str(cache_dir)).extract_all()
+    assert len(list(cache_dir.glob("*.jsonl"))) == 1
+
+    def fail(self):
+        raise AssertionError("캐시 적중인데 추출함")
+
+    monkeypatch.setattr(PDFExtractor, "_extract_pages", fail)
+    for options in [{}, {"streaming": True}]:
+        output_dir = tmp_path / f"cached_{len(options)}"
+        PDFExtractor(
+            sample_pdf, output_dir=str(output_dir), cache_dir=str(cache_dir), **options
+        ).extract_all()
+        for name in ["extracted_text.md", "extracted_text.html", "extracted_data.json"]:
+            assert (output_dir / name).read_bytes() == (first / name).read_bytes()
+
+    # 옵션이 다르면 다른 캐시 키
+    monkeypatch.undo()
+    monkeypatch.setattr(PDFExtractor, "_extract_tables_with_camelot", lambda self: None)
+    PDFExtractor(
+        sample_pdf, output_dir=str(tmp_path / "fast"), cache_dir=str(cache_dir), engine="pymupdf"
+    ).extract_all()
+    assert len(list(cache_dir.glob("*.jsonl"))) == 2
+
+
+def test_columnar_table_export(sample_pdf, tmp_path):
+    """Parquet/Arrow long format 데이터셋과 write-only Excel 저장 테스트"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    extractor = PDFExtractor(
+        sample_pdf,
+        output_dir=str(tmp_path / "out"),
+        engine="pymupdf",
+        table_formats=("csv", "xlsx", "parquet", "arrow"),
+        excel_write_only=True,
+    )
+    extractor._extract_pages()
+    extractor._cross_validate_tables()
+    extractor._save_tables()
+
+    tables_dir = tmp_path / "out" / "tables"
+    cells = pq.read_table(tables_dir / "all_tables.parquet").to_pandas()
+    assert sorted(cells["page"].unique()) == [1, 4, 7]
+    assert set(cells["source"]) == {"pymupdf"}
+    first = cells[(cells["page"] == 1) & (cells["row"] == 0) & (cells["column"] == 1)]
+    assert first[["header", "value"]].values.tolist() == [["r0c1", "r1c1"]]
+
+    with pa.memory_map(str(tables_dir / "all_tables.arrow")) as source:
+        arrow_cells = pa.ipc.open_file(source).read_all()
+    assert arrow_cells.equals(pq.read_table(tables_dir / "all_tables.parquet"))
+
+    sheets = pd.read_excel(tables_dir / "all_tables.xlsx", sheet_name=None)
+    csv = pd.read_csv(tables_dir / "page1_table1.csv")
+    assert list(sheets) == ["Page1_T1", "Page4_T2", "Page7_T3"]
+    assert sheets["Page1_T1"].equals(csv)
@@ -0,0 +1,106 @@
+"""
+LLM 응답 캐시(llm_cache) 테스트
+
+LRU 삭제(accessed_at 기준), TTL 만료, 구조화된 응답의 저장/복원을 확인합니다.
+"""
+
+import json
+from types import SimpleNamespace
+
+import llm_cache
+import pytest
+from pydantic import BaseModel
+from llm_cache import ResponseCache
+from openai_stub_server import OpenAIStubServer, StubBehavior
+from utils import (
+    StructuredResponseWithUsage,
+    Usage,
+    _from_cache,
+    _to_cache,
+    make_response,
+)
+
+API_KEY = "stub-key"
+
+
+class Person(BaseModel):
+    담당: str
+    업무: list[str]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """llm_cache가 사용하는 현재 시각을 테스트에서 정할 수 있도록 바꿉니다."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_lru_evicts_least_recently_accessed(clock):
+    """최대 항목 수를 넘으면 가장 오래 사용하지 않은(accessed_at) 항목부터 삭제하는지 테스트"""
+    cache = ResponseCache(":memory:", max_entries=2, ttl=None)
+    cache.set("a", "A")
+    clock.now += 1
+    cache.set("b", "B")
+    clock.now += 1
+    assert cache.get("a") == ("A", None)  # a를 사용하여 b가 가장 오래된 항목이 됨
+
+    clock.now += 1
+    cache.set("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == ("A", None)
+    assert cache.get("c") == ("C", None)
+
+
+def test_ttl_expiry_on_get(clock):
+    """유효 기간이 지난 항목은 get에서 None을 반환하고 삭제되는지 테스트"""
+    cache = ResponseCache(":memory:", ttl=10)
+    cache.set("key", "응답", {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3})
+
+    clock.now += 10
+    assert cache.get("key") == ("응답", {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3})
+
+    # 사용해도 유효 기간은 저장 시각(created_at) 기준
+    clock.now += 0.5
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_structured_round_trip():
+    """구조화된 응답이 JSON으로 저장되었다가 같은 모델 객체로 복원되는지 테스트"""
+    cache = ResponseCache(":memory:")
+    response = StructuredResponseWithUsage(
+        parsed=Person(담당="홍길동", 업무=["회의록 작성", "일정 관리"]),
+        usage=Usage(input_tokens=10, output_tokens=5, total_tokens=15),
+    )
+    _to_cache(cache, "key", response)
+
+    restored = _from_cache(*cache.get("key"), response_format=Person)
+    assert isinstance(restored, StructuredResponseWithUsage)
+    assert restored.parsed == response.parsed
+    assert restored.usage == response.usage
+    assert restored.cache_hit
+
+
+def test_refusal_is_not_cached():
+    """응답 거부(parsed가 None)는 오류 없이 캐시에 저장하지 않는지 테스트"""
+    cache = ResponseCache(":memory:")
+    _to_cache(cache, "key", StructuredResponseWithUsage(parsed=None))
+    assert len(cache) == 0
+
+
+def test_make_response_uses_cache():
+    """같은 요청을 다시 하면 API를 호출하지 않고 캐시된 응답을 반환하는지 테스트"""
+    content = json.dumps({"담당": "홍길동", "업무": ["회의록 작성"]}, ensure_ascii=False)
+    cache = ResponseCache(":memory:")
+    with OpenAIStubServer(behavior=StubBehavior(content=content)) as stub:
+        options = dict(response_format=Person, api_key=API_KEY, base_url=stub.base_url, cache=cache)
+        first = make_response("담당자 정리", **options)
+        second = make_response("담당자 정리", **options)
+
+    assert stub.request_count == 1
+    assert not first.cache_hit and second.cache_hit
+    assert second.parsed == first.parsed
+    assert second.usage == first.usage
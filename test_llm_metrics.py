@@ -0,0 +1,124 @@
+"""
+LLM 호출 계측(llm_metrics) 테스트
+
+로컬 OpenAI 스텁 서버로 make_response를 호출하여
+지연 시간, 토큰 수, 비용, 오류가 싱크에 기록되는지 확인합니다.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+import pytest
+from llm_cache import ResponseCache
+from llm_metrics import (
+    MemoryMetricsSink,
+    PrometheusFileSink,
+    add_metrics_sink,
+    make_call_metrics,
+    remove_metrics_sink,
+)
+from openai_stub_server import OpenAIStubServer, StubBehavior
+from utils import make_response
+
+API_KEY = "stub-key"
+
+
+@pytest.fixture
+def sink():
+    sink = add_metrics_sink(MemoryMetricsSink())
+    yield sink
+    remove_metrics_sink(sink)
+
+
+def test_records_text_response(sink):
+    """일반 응답의 지연 시간, 토큰 수, 비용이 기록되는지 테스트"""
+    with OpenAIStubServer() as stub:
+        response = make_response("안녕", api_key=API_KEY, base_url=stub.base_url)
+
+    [metrics] = sink.records()
+    assert metrics.model == "gpt-4o-mini"
+    assert metrics.latency > 0
+    assert metrics.ttfb == metrics.latency
+    assert metrics.output_tokens == response.usage.output_tokens
+    assert metrics.cost > 0
+    assert metrics.error is None
+
+
+def test_records_stream_after_completion(sink):
+    """스트리밍 응답은 끝까지 받은 뒤 첫 토큰 시간과 함께 기록되는지 테스트"""
+    with OpenAIStubServer(behavior=StubBehavior(stream_delay=0.01)) as stub:
+        stream = make_response("안녕", api_key=API_KEY, base_url=stub.base_url, stream=True)
+        assert sink.records() == []
+        "".join(stream)
+
+    [metrics] = sink.records()
+    assert metrics.stream
+    assert 0 < metrics.ttfb < metrics.latency
+    assert metrics.output_tokens_per_sec > 0
+
+
+def test_records_cache_hit_and_error(sink):
+    """캐시 적중은 비용 없이, 실패한 호출은 오류 종류와 함께 기록되는지 테스트"""
+    cache = ResponseCache(":memory:")
+    with OpenAIStubServer() as stub:
+        make_response("안녕", api_key=API_KEY, base_url=stub.base_url, cache=cache)
+        make_response("안녕", api_key=API_KEY, base_url=stub.base_url, cache=cache)
+
+    behavior = StubBehavior(fail_first=1, fail_status=400)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        with pytest.raises(openai.BadRequestError):
+            make_response("안녕", api_key=API_KEY, base_url=stub.base_url)
+
+    miss, hit, failed = sink.records()
+    assert not miss.cache_hit and miss.cost > 0
+    assert hit.cache_hit and hit.cost is None
+    assert failed.error == "BadRequestError"
+    assert sink.summary()["errors"] == 1
+
+
+def test_prometheus_file_sink(tmp_path):
+    """Prometheus 텍스트 포맷 파일이 기록되는지 테스트"""
+    path = tmp_path / "llm.prom"
+    sink = add_metrics_sink(PrometheusFileSink(str(path)))
+    try:
+        with OpenAIStubServer() as stub:
+            make_response("안녕", api_key=API_KEY, base_url=stub.base_url)
+    finally:
+        remove_metrics_sink(sink)
+
+    text = path.read_text(encoding="utf-8")
+    assert 'llm_requests_total{model="gpt-4o-mini",outcome="success"} 1' in text
+    assert 'llm_request_duration_seconds_count{model="gpt-4o-mini"} 1' in text
+
+
+def test_prometheus_file_sink_concurrent_records(tmp_path):
+    """여러 스레드에서 동시에 기록해도 파일 교체가 실패하거나 섞이지 않는지 테스트"""
+    path = tmp_path / "llm.prom"
+    sink = PrometheusFileSink(str(path))
+
+    def record_many():
+        for _ in range(50):
+            sink.record(make_call_metrics("gpt-4o-mini", time.perf_counter()))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(record_many) for _ in range(8)]:
+            future.result()
+
+    text = path.read_text(encoding="utf-8")
+    assert 'llm_requests_total{model="gpt-4o-mini",outcome="success"} 400' in text
+    assert not (tmp_path / "llm.prom.tmp").exists()
+
+
+def test_prometheus_label_values_are_escaped(tmp_path):
+    """모델 이름의 큰따옴표, 역슬래시, 줄바꿈을 텍스트 형식 규칙대로 이스케이프하는지 테스트"""
+    path = tmp_path / "llm.prom"
+    sink = PrometheusFileSink(str(path))
+    sink.record(make_call_metrics('my"model\\v1\nbeta', time.perf_counter()))
+
+    text = path.read_text(encoding="utf-8")
+    assert 'llm_requests_total{model="my\\"model\\\\v1\\nbeta",outcome="success"} 1' in text
+    # 주석이 아닌 모든 줄이 "이름{레이블} 값" 형식 (레이블 값의 줄바꿈으로 줄이 나뉘지 않음)
+    samples = [line for line in text.splitlines() if not line.startswith("#")]
+    assert all(re.fullmatch(r"\w+\{.*\} \S+", line) for line in samples)
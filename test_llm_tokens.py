@@ -0,0 +1,149 @@
+"""
+토큰 계산 / 예산 관리(llm_tokens) 테스트
+
+tokenizer 없이 쓰는 문자 수 기반 추정치, 예산 초과 시 오류/자르기 동작,
+모델별 비용 계산을 확인합니다.
+"""
+
+import llm_tokens
+import pytest
+from llm_tokens import (
+    TOKENS_PER_MESSAGE,
+    TOKENS_PER_REPLY,
+    TokenBudgetExceededError,
+    count_message_tokens,
+    count_tokens,
+    estimate_cost,
+    fit_messages_to_budget,
+)
+from openai_stub_server import OpenAIStubServer
+from utils import make_response
+
+API_KEY = "stub-key"
+
+
+@pytest.fixture
+def no_tokenizer(monkeypatch):
+    """tiktoken을 쓸 수 없는 환경처럼 문자 수 기반 추정치를 사용합니다."""
+    monkeypatch.setattr(llm_tokens, "get_encoding", lambda model: None)
+
+
+def test_count_tokens_fallback(no_tokenizer):
+    """ASCII는 4글자당 1토큰, 한글 등은 글자당 1토큰으로 추정하는지 테스트"""
+    assert count_tokens("abcdefgh") == 2
+    assert count_tokens("안녕하세요") == 5
+    assert count_tokens("ab 안녕") == 2  # ASCII 3글자(0토큰) + 한글 2글자
+    assert count_tokens("") == 0
+
+
+def test_count_tokens_with_tokenizer():
+    """tiktoken을 사용할 수 있으면 인코딩한 토큰 수를 반환하는지 테스트"""
+    encoding = llm_tokens.get_encoding("gpt-4o-mini")
+    if encoding is None:
+        pytest.skip("tiktoken 인코딩을 사용할 수 없는 환경")
+    text = "Hello, 안녕하세요! <|endoftext|>"
+    assert count_tokens(text) == len(encoding.encode(text, disallowed_special=()))
+
+
+def test_count_message_tokens(no_tokenizer):
+    """메시지별 형식 토큰을 더하고 이미지 파트는 제외하는지 테스트"""
+    messages = [
+        {"role": "system", "content": "abcdefgh"},
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": "안녕"},
+                {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}},
+            ],
+        },
+    ]
+    assert count_message_tokens(messages) == TOKENS_PER_REPLY + 2 * TOKENS_PER_MESSAGE + 2 + 2
+
+
+def test_fit_messages_truncates_last_message(no_tokenizer):
+    """마지막 사용자 메시지만 잘라 예산 안으로 맞추는지 테스트"""
+    system = {"role": "system", "content": "요약해줘"}
+    user = {"role": "user", "content": "가" * 100}
+    messages = [system, user]
+
+    fitted = fit_messages_to_budget(messages, max_input_tokens=50)
+
+    assert count_message_tokens(fitted) <= 50
+    assert fitted[0] is system
+    assert fitted[1]["content"] == "가" * (50 - count_message_tokens([system, {"content": ""}]))
+    assert messages[1]["content"] == "가" * 100  # 원본은 바뀌지 않음
+
+    # 예산 안이면 그대로 반환
+    assert fit_messages_to_budget(messages, max_input_tokens=1000) is messages
+
+
+def test_fit_messages_truncates_text_parts(no_tokenizer):
+    """텍스트 파트가 여러 개면 앞쪽부터 예산을 배분하고, 이미지 파트는 유지하는지 테스트"""
+    image = {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}}
+    messages = [
+        {
+            "role": "user",
+            "content": [{"type": "text", "text": "가" * 10}, image, {"type": "text", "text": "나" * 10}],
+        }
+    ]
+    budget = TOKENS_PER_REPLY + TOKENS_PER_MESSAGE + 15
+
+    [fitted] = fit_messages_to_budget(messages, max_input_tokens=budget)
+
+    assert [part.get("text") for part in fitted["content"]] == ["가" * 10, None, "나" * 5]
+    assert fitted["content"][1] is image
+
+
+def test_fit_messages_error_when_other_messages_exceed(no_tokenizer):
+    """마지막 메시지를 제외한 부분만으로 예산을 넘으면 TokenBudgetExceededError"""
+    messages = [
+        {"role": "system", "content": "가" * 100},
+        {"role": "user", "content": "질문"},
+    ]
+    with pytest.raises(TokenBudgetExceededError) as exc_info:
+        fit_messages_to_budget(messages, max_input_tokens=50)
+
+    assert exc_info.value.input_tokens == count_message_tokens(messages)
+    assert exc_info.value.max_input_tokens == 50
+
+
+def test_make_response_budget_modes(no_tokenizer):
+    """error 모드는 API 호출 전에 예외, truncate 모드는 잘라서 요청하는지 테스트"""
+    with OpenAIStubServer() as stub:
+        options = dict(api_key=API_KEY, base_url=stub.base_url, max_input_tokens=20)
+        with pytest.raises(TokenBudgetExceededError):
+            make_response("가" * 100, **options)
+        assert stub.request_count == 0
+
+        response = make_response("가" * 100, on_budget_exceeded="truncate", **options)
+
+    assert response
+    assert stub.request_count == 1
+
+
+def test_estimate_cost():
+    """모델별 단가로 비용을 계산하고, 날짜가 붙은 모델명도 찾는지 테스트"""
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0) == pytest.approx(0.15)
+    # gpt-4o-2024-08-06은 gpt-4o 단가 (gpt-4o-mini와 혼동하지 않음)
+    assert estimate_cost("gpt-4o-2024-08-06", 1_000_000, 1_000_000) == pytest.approx(12.5)
+    assert estimate_cost("unknown-model", 100, 100) is None
+
+
+def test_fit_messages_mixed_text_stays_within_budget(no_tokenizer):
+    """한글과 영문이 섞여 글자당 토큰 수가 다른 텍스트도 예산을 넘지 않게 자르는지 테스트"""
+    messages = [{"role": "user", "content": "가" * 100 + "a" * 400}]
+
+    fitted = fit_messages_to_budget(messages, max_input_tokens=106)
+
+    assert count_message_tokens(fitted) <= 106
+    # 형식 토큰을 뺀 남은 예산(100토큰)은 한글 100글자로 모두 채워짐
+    assert fitted[0]["content"] == "가" * 100 + "a" * 3
+
+
+def test_truncate_text_keeps_longest_prefix(no_tokenizer):
+    """예산을 넘지 않는 가장 긴 앞부분을 남기는지 테스트"""
+    text = "a" * 400 + "가" * 100
+    assert llm_tokens.truncate_text(text, 50) == "a" * 203
+    assert llm_tokens.truncate_text(text, 101) == "a" * 400 + "가"
+    assert llm_tokens.truncate_text(text, 200) == text
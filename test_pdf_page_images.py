@@ -0,0 +1,81 @@
+"""
+render_pdf_pages / make_pdf_page_responses 테스트
+
+페이지마다 크기가 다른 작은 PDF를 만들어, 프로세스 풀에서 렌더링한 이미지가
+요청한 페이지 순서대로 나오고 DPI가 반영되는지 확인합니다.
+"""
+
+import pymupdf
+import pytest
+import utils
+from openai_stub_server import OpenAIStubServer
+from utils import make_pdf_page_responses, render_pdf_pages
+
+API_KEY = "stub-key"
+PAGE_WIDTHS = [150, 200, 250]  # 페이지 번호별 너비(pt)로 어느 페이지인지 구분
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "pages.pdf"
+    doc = pymupdf.open()
+    for page_no, width in enumerate(PAGE_WIDTHS, 1):
+        page = doc.new_page(width=width, height=100)
+        page.insert_text((10, 50), f"page {page_no}")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def image_size(image: bytes) -> tuple[int, int]:
+    pixmap = pymupdf.Pixmap(image)
+    return pixmap.width, pixmap.height
+
+
+def test_pages_in_requested_order(pdf_path):
+    """워커 프로세스에서 렌더링해도 요청한 페이지 순서대로 반환하는지 테스트"""
+    results = list(render_pdf_pages(pdf_path, pages=[3, 1, 2], dpi=72, max_workers=2))
+
+    assert [page_no for page_no, _ in results] == [3, 1, 2]
+    assert [image_size(image)[0] for _, image in results] == [250, 150, 200]
+    # 렌더링은 워커 프로세스에서만 문서를 엶
+    assert utils._worker_pdf_doc is None
+
+
+def test_dpi_and_format(pdf_path):
+    """DPI에 비례한 이미지 크기와 이미지 포맷이 반영되는지 테스트"""
+    [(_, image_72)] = render_pdf_pages(pdf_path, pages=[1], dpi=72, max_workers=1)
+    [(_, image_144)] = render_pdf_pages(
+        pdf_path, pages=[1], dpi=144, image_format="jpeg", max_workers=1
+    )
+
+    assert image_72.startswith(b"\x89PNG")
+    assert image_144.startswith(b"\xff\xd8")  # JPEG
+    assert image_size(image_72) == (150, 100)
+    assert image_size(image_144) == (300, 200)
+
+
+def test_all_pages_and_invalid_page(pdf_path):
+    """pages를 생략하면 전체 페이지, 범위를 벗어난 페이지는 ValueError"""
+    assert [page_no for page_no, _ in render_pdf_pages(pdf_path, dpi=36)] == [1, 2, 3]
+    with pytest.raises(ValueError):
+        list(render_pdf_pages(pdf_path, pages=[4]))
+
+
+def test_page_responses_batches(pdf_path):
+    """pages_per_request만큼 페이지를 묶어 요청하는지 테스트"""
+    with OpenAIStubServer() as stub:
+        results = list(
+            make_pdf_page_responses(
+                "설명해줘",
+                pdf_path,
+                pages_per_request=2,
+                dpi=36,
+                max_workers=2,
+                api_key=API_KEY,
+                base_url=stub.base_url,
+            )
+        )
+
+    assert [page_numbers for page_numbers, _ in results] == [[1, 2], [3]]
+    assert stub.request_count == 2
@@ -0,0 +1,87 @@
+"""
+pdf_text_engines / benchmark_pdf_engines 테스트
+"""
+
+import json
+import threading
+
+import pdf_text_engines
+from benchmark_pdf_engines import char_agreement, make_corpus_pdf
+from pdf_text_engines import ExtractionJob, MemoryViewReader, available_engines, extract_text
+
+
+def test_engines_extract_synthetic_corpus(tmp_path):
+    """모든 엔진이 합성 PDF의 페이지별 텍스트를 추출하는지 테스트"""
+    pdf_path = make_corpus_pdf("text", 3, tmp_path)
+    truth = json.loads(pdf_path.with_suffix(".truth.json").read_text(encoding="utf-8"))
+
+    for engine in available_engines():
+        progress = []
+        pages_text = extract_text(engine, str(pdf_path), lambda done, total: progress.append(done))
+        assert len(pages_text) == 3
+        assert progress == [1, 2, 3]
+        assert char_agreement(truth, pages_text) > 0.99
+
+    # 같은 seed면 같은 코퍼스
+    again = make_corpus_pdf("text", 3, tmp_path / "again")
+    assert again.with_suffix(".truth.json").read_text(encoding="utf-8") == json.dumps(
+        truth, ensure_ascii=False
+    )
+
+
+def test_engines_extract_from_memory(tmp_path):
+    """메모리 입력(memoryview)에서도 파일 경로와 같은 결과를 추출하는지 테스트"""
+    pdf_path = make_corpus_pdf("korean", 2, tmp_path)
+    view = memoryview(pdf_path.read_bytes())
+
+    for engine in available_engines():
+        assert extract_text(engine, view) == extract_text(engine, str(pdf_path))
+
+
+def test_memoryview_reader():
+    """MemoryViewReader는 파일 객체처럼 읽기/이동을 지원"""
+    reader = MemoryViewReader(memoryview(b"%PDF-1.7 ... %%EOF"))
+    assert reader.read(4) == b"%PDF"
+    reader.seek(-5, 2)
+    assert reader.read() == b"%%EOF"
+    assert reader.read(10) == b""
+    assert reader.seek(2, 1) == 20  # 끝을 지나서 이동해도 읽을 내용만 없음
+
+
+def test_extraction_job(tmp_path, monkeypatch):
+    """백그라운드 추출 결과가 extract_text와 같고, cancel()로 도중에 멈추는지 테스트"""
+    pdf_path = make_corpus_pdf("text", 30, tmp_path)
+    view = memoryview(pdf_path.read_bytes())
+
+    job = ExtractionJob("PyMuPDF", view).start()
+    assert job.wait(timeout=60)
+    assert job.error is None and job.total_pages == 30
+    assert job.pages_text == extract_text("PyMuPDF", str(pdf_path))
+
+    first_page = extract_text("pdfplumber", str(pdf_path))[:1]
+
+    # 첫 페이지를 넘긴 뒤 cancel()이 호출될 때까지 다음 페이지 추출을 멈춤
+    resume = threading.Event()
+    iter_pdfplumber = pdf_text_engines.PAGE_ITERATORS["pdfplumber"]
+
+    def paused_after_first_page(source):
+        for page_no, page in enumerate(iter_pdfplumber(source), 1):
+            yield page
+            if page_no == 1:
+                resume.wait(timeout=60)
+
+    monkeypatch.setitem(pdf_text_engines.PAGE_ITERATORS, "pdfplumber", paused_after_first_page)
+    job = ExtractionJob("pdfplumber", view).start()
+    assert job.wait_first_page(timeout=60)
+    job.cancel()
+    resume.set()
+    assert job.wait(timeout=60)
+    assert job.cancelled and job.error is None
+    assert job.pages_text == first_page
+
+
+def test_char_agreement():
+    """문자 일치율은 공백을 무시하고 빠지거나 잘못 읽은 문자를 반영"""
+    assert char_agreement(["a b c"], ["abc\n"]) == 1.0
+    assert char_agreement(["abcd"], ["ab"]) == 2 * 2 / 6
+    assert char_agreement(["abcd", "ef"], ["abcd"]) == 2 * 4 / 10
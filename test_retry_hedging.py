@@ -0,0 +1,88 @@
+"""
+make_response 재시도 / 타임아웃 / 헤징 테스트
+
+로컬 OpenAI 스텁 서버에 5xx 오류와 응답 지연을 주입하여
+tail latency 대응 기능이 동작하는지 확인합니다.
+"""
+
+import time
+
+import openai
+import pytest
+from openai_stub_server import OpenAIStubServer, StubBehavior
+from utils import RetryPolicy, make_response
+
+API_KEY = "stub-key"
+FAST_RETRY = RetryPolicy(max_retries=3, base_delay=0.01, max_delay=0.05)
+
+
+def test_retry_on_server_error():
+    """5xx 오류 후 재시도하여 성공하는지 테스트"""
+    with OpenAIStubServer(behavior=StubBehavior(fail_first=2)) as stub:
+        response = make_response(
+            "안녕", api_key=API_KEY, base_url=stub.base_url, retry=FAST_RETRY
+        )
+
+    assert response == StubBehavior().content
+    assert stub.request_count == 3
+
+
+def test_retry_gives_up():
+    """재시도 횟수를 넘으면 마지막 오류를 그대로 발생시키는지 테스트"""
+    policy = RetryPolicy(max_retries=1, base_delay=0.01)
+    with OpenAIStubServer(behavior=StubBehavior(fail_first=5, fail_status=503)) as stub:
+        with pytest.raises(openai.InternalServerError):
+            make_response("안녕", api_key=API_KEY, base_url=stub.base_url, retry=policy)
+
+    assert stub.request_count == 2
+
+
+def test_no_retry_on_client_error():
+    """4xx(429 제외) 오류는 재시도하지 않는지 테스트"""
+    with OpenAIStubServer(behavior=StubBehavior(fail_first=1, fail_status=400)) as stub:
+        with pytest.raises(openai.BadRequestError):
+            make_response("안녕", api_key=API_KEY, base_url=stub.base_url, retry=FAST_RETRY)
+
+    assert stub.request_count == 1
+
+
+def test_timeout_then_retry():
+    """응답이 멈춘 요청은 타임아웃 후 재시도하는지 테스트"""
+    behavior = StubBehavior(stall_first=1, stall_delay=3.0)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        start = time.perf_counter()
+        response = make_response(
+            "안녕",
+            api_key=API_KEY,
+            base_url=stub.base_url,
+            timeout=0.3,
+            retry=FAST_RETRY,
+        )
+        elapsed = time.perf_counter() - start
+
+    assert response == behavior.content
+    assert elapsed < 2.0
+
+
+def test_hedged_request_wins():
+    """첫 요청이 늦으면 중복 요청의 응답을 먼저 사용하는지 테스트"""
+    behavior = StubBehavior(stall_first=1, stall_delay=2.0)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        start = time.perf_counter()
+        response = make_response(
+            "안녕", api_key=API_KEY, base_url=stub.base_url, timeout=5, hedge_after=0.1
+        )
+        elapsed = time.perf_counter() - start
+
+    assert response == behavior.content
+    assert elapsed < 1.0
+    assert stub.request_count == 2
+
+
+def test_retry_policy_delay():
+    """지수 백오프 대기 시간이 max_delay를 넘지 않는지 테스트"""
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0, jitter=False)
+    assert [policy.get_delay(i) for i in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+
+    jittered = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    assert all(0 <= jittered.get_delay(3) <= 4.0 for _ in range(100))
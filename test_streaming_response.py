@@ -0,0 +1,90 @@
+"""
+make_response(stream=True) 테스트
+
+로컬 OpenAI 스텁 서버의 SSE 응답으로 텍스트 조각이 도착 순서대로 전달되고,
+stream_options={"include_usage": True}의 마지막 조각에서 usage를 받는지 확인합니다.
+"""
+
+import time
+
+import pytest
+from llm_cache import ResponseCache
+from llm_metrics import MemoryMetricsSink, add_metrics_sink, remove_metrics_sink
+from openai_stub_server import OpenAIStubServer, StubBehavior, estimate_tokens
+from utils import StreamClosedError, StreamingResponse, make_response
+
+API_KEY = "stub-key"
+
+
+def test_stream_chunks_in_order_with_usage():
+    """조각이 순서대로 이어 붙여지고, 마지막 조각의 usage가 기록되는지 테스트"""
+    behavior = StubBehavior(content="가나다라마바사아자차카타파하 0123456789", stream_chunk_size=3)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        stream = make_response("안녕", api_key=API_KEY, base_url=stub.base_url, stream=True)
+        assert isinstance(stream, StreamingResponse)
+        assert stream.usage is None  # 끝까지 받기 전에는 usage가 없음
+
+        deltas = list(stream)
+
+    content = behavior.content
+    assert deltas == [content[i : i + 3] for i in range(0, len(content), 3)]
+    assert stream.response == content
+    assert stream.error is None
+
+    # usage는 include_usage로 요청한 마지막 조각(choices 없음)에서 받음
+    assert stream.usage is not None
+    assert stream.usage.output_tokens == estimate_tokens(content)
+    assert stream.usage.total_tokens == stream.usage.input_tokens + stream.usage.output_tokens
+    assert stream.response.usage == stream.usage
+
+
+def test_stream_delivers_first_chunk_early():
+    """전체 응답을 기다리지 않고 첫 조각부터 전달하는지 테스트"""
+    behavior = StubBehavior(content="a" * 40, stream_chunk_size=4, stream_delay=0.05)
+    with OpenAIStubServer(behavior=behavior) as stub:
+        start = time.perf_counter()
+        stream = make_response("안녕", api_key=API_KEY, base_url=stub.base_url, stream=True)
+        deltas = iter(stream)
+        first = next(deltas)
+        first_elapsed = time.perf_counter() - start
+        for _ in deltas:  # 나머지를 끝까지 받음
+            pass
+        rest = stream.response
+        total_elapsed = time.perf_counter() - start
+
+    assert first == "aaaa"
+    assert rest == behavior.content
+    assert stream.first_token_at is not None
+    # 조각 12개(역할/본문 10개/종료) + usage 조각 사이마다 0.05초씩 대기
+    assert first_elapsed < total_elapsed - 0.3
+
+
+def test_abandoned_stream_is_closed():
+    """순회를 도중에 중단하면 HTTP 스트림을 닫고, 오류로 계측하며 캐시에 저장하지 않는지 테스트"""
+    behavior = StubBehavior(content="a" * 40, stream_chunk_size=4, stream_delay=0.05)
+    cache = ResponseCache(":memory:")
+    sink = add_metrics_sink(MemoryMetricsSink())
+    try:
+        with OpenAIStubServer(behavior=behavior) as stub:
+            options = dict(api_key=API_KEY, base_url=stub.base_url, stream=True, cache=cache)
+            stream = make_response("안녕", **options)
+            for delta in stream:
+                break  # Streamlit rerun 등으로 순회가 중단된 경우
+
+            assert isinstance(stream.error, StreamClosedError)
+            assert stream._chunks.response.is_closed
+            with pytest.raises(StreamClosedError):
+                stream.response
+
+            # with 문을 벗어나면 닫힘
+            with make_response("안녕", **options) as stream:
+                deltas = iter(stream)
+                next(deltas)
+            assert isinstance(stream.error, StreamClosedError)
+            assert stream._chunks.response.is_closed
+    finally:
+        remove_metrics_sink(sink)
+
+    assert delta == "aaaa"
+    assert len(cache) == 0
+    assert [record.error for record in sink.records()] == ["StreamClosedError"] * 2
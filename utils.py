@@ -1,17 +1,55 @@
 import os
+import functools
+import hashlib
+import inspect
 import mimetypes
 import requests
 import tempfile
-from base64 import b64encode
-from dataclasses import dataclass
-from typing import BinaryIO, Protocol, TypeVar, Generic, overload
+import random
+import threading
+import time
+import asyncio
+import weakref
+from binascii import b2a_base64
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import asdict, dataclass
+from typing import (
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Protocol,
+    Sequence,
+    TypeVar,
+    Generic,
+    overload,
+)
+import openai
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from openai.types.shared.chat_model import ChatModel
 from bs4 import BeautifulSoup
 from hwp5.xmlmodel import Hwp5File
 from hwp5.hwp5html import HTMLTransform
-from contextlib import closing
+from contextlib import closing, nullcontext
+from llm_cache import ResponseCache
+from llm_metrics import has_metrics_sinks, make_call_metrics, record_call
+from llm_tokens import (
+    TokenBudgetExceededError,
+    TokenEstimate,
+    count_message_tokens,
+    estimate_cost,
+    estimate_messages,
+    fit_messages_to_budget,
+)
 
 
 class FileUploadProtocol(Protocol):
@@ -49,12 +87,13 @@ class ResponseWithUsage(str):
     토큰 사용량 정보에 접근할 수 있습니다.
     """
 
-    def __new__(cls, content: str, usage: Usage | None = None):
+    def __new__(cls, content: str, usage: Usage | None = None, cache_hit: bool = False):
         """ResponseWithUsage 인스턴스 생성.
 
         Args:
             content: 응답 내용 문자열
             usage: 토큰 사용량 정보 (선택사항)
+            cache_hit: 캐시에서 가져온 응답인지 여부
 
         주의: __init__ 대신 __new__를 사용하는 이유
         - str은 불변(immutable) 객체라서 생성 후에는 값을 변경할 수 없음
@@ -65,6 +104,7 @@ class ResponseWithUsage(str):
         instance = super().__new__(cls, content)
         # 2. 생성된 인스턴스에 usage 정보를 속성으로 추가
         instance._usage = usage
+        instance._cache_hit = cache_hit
         # 3. 완성된 인스턴스 반환
         return instance
 
@@ -73,6 +113,11 @@ class ResponseWithUsage(str):
         """토큰 사용량 정보를 반환합니다."""
         return self._usage
 
+    @property
+    def cache_hit(self) -> bool:
+        """캐시에서 가져온 응답이면 True를 반환합니다."""
+        return self._cache_hit
+
 
 # TypeVar for Generic support
 T = TypeVar("T", bound=BaseModel)
@@ -86,17 +131,211 @@ class StructuredResponseWithUsage(Generic[T]):
     Attributes:
         parsed: 파싱된 Pydantic 모델 인스턴스
         usage: 토큰 사용량 정보 (선택사항)
+        cache_hit: 캐시에서 가져온 응답인지 여부
     """
 
-    def __init__(self, parsed: T, usage: Usage | None = None):
+    def __init__(self, parsed: T, usage: Usage | None = None, cache_hit: bool = False):
         """StructuredResponseWithUsage 인스턴스 생성.
 
         Args:
             parsed: 파싱된 Pydantic 모델 인스턴스
             usage: 토큰 사용량 정보 (선택사항)
+            cache_hit: 캐시에서 가져온 응답인지 여부
         """
         self.parsed = parsed
         self.usage = usage
+        self.cache_hit = cache_hit
+
+
+class StreamClosedError(Exception):
+    """스트림을 끝까지 받기 전에 닫았을 때 error 속성에 기록되는 예외."""
+
+
+class StreamingResponse:
+    """스트리밍 응답을 텍스트 조각(delta) 단위로 전달하는 클래스.
+
+    make_response(stream=True)의 반환값입니다. 순회하면 도착하는 순서대로
+    텍스트 조각을 생성하므로 st.write_stream 등에 바로 넘길 수 있고,
+    순회가 끝나면 response 속성으로 전체 내용과 usage를 담은
+    ResponseWithUsage를 얻을 수 있습니다.
+
+    순회를 끝까지 하지 않고 중단하면(break, Streamlit rerun 등) HTTP 스트림을 닫고
+    StreamClosedError로 끝난 것으로 처리합니다. (계측/캐시 콜백도 이때 호출됩니다)
+    with 문으로 사용하면 블록을 벗어날 때 닫습니다.
+
+    Examples:
+        >>> with make_response("안녕하세요", stream=True) as stream:
+        ...     for delta in stream:
+        ...         print(delta, end="", flush=True)
+        >>> print(stream.response.usage)
+    """
+
+    def __init__(self, chunks: Iterable):
+        """StreamingResponse 인스턴스 생성.
+
+        Args:
+            chunks: Chat Completion 스트림 (ChatCompletionChunk 객체의 iterable)
+        """
+        self._chunks = chunks
+        self._callbacks: list[Callable[["StreamingResponse"], None]] = []
+        self._parts: list[str] = []
+        self._usage: Usage | None = None
+        self._response: ResponseWithUsage | None = None
+        self._error: Exception | None = None
+        self.first_token_at: float | None = None  # 첫 텍스트 조각 도착 시각 (perf_counter)
+
+    def add_done_callback(self, fn: Callable[["StreamingResponse"], None]) -> None:
+        """스트림이 끝나거나(성공/실패) 이미 끝났으면 fn(self)를 호출하도록 등록합니다."""
+        if self._response is not None or self._error is not None:
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def _finish(self) -> None:
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def close(self) -> None:
+        """아직 받는 중인 스트림의 HTTP 연결을 닫습니다. 이미 끝난 스트림이면 아무 일도 하지 않습니다."""
+        if self._response is not None or self._error is not None:
+            return
+        self._error = StreamClosedError("스트림을 끝까지 받기 전에 닫았습니다.")
+        close = getattr(self._chunks, "close", None)
+        if close:
+            close()
+        self._finish()
+
+    def __enter__(self) -> "StreamingResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def from_response(cls, response: ResponseWithUsage) -> "StreamingResponse":
+        """이미 완성된 응답(예: 캐시된 응답)을 한 조각짜리 스트림으로 감쌉니다."""
+        instance = cls(chunks=())
+        instance._parts = [str(response)]
+        instance._usage = response.usage
+        instance._response = response
+        return instance
+
+    def __iter__(self) -> Iterator[str]:
+        if self._response is not None:
+            # 이미 모두 받은 경우, 받은 내용을 다시 돌려줍니다.
+            yield from self._parts
+            return
+        if self._error is not None:
+            raise self._error
+
+        finished = False
+        try:
+            for chunk in self._chunks:
+                # stream_options={"include_usage": True}이면 마지막 조각에 usage가 담겨옵니다.
+                if chunk.usage:
+                    self._usage = _make_usage(chunk.usage)
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if self.first_token_at is None:
+                            self.first_token_at = time.perf_counter()
+                        self._parts.append(delta)
+                        yield delta
+            finished = True
+        except Exception as e:
+            self._error = e
+            self._finish()
+            raise
+        finally:
+            if not finished:
+                self.close()  # 순회를 도중에 중단한 경우(GeneratorExit) 연결을 닫음
+
+        self._response = ResponseWithUsage(content="".join(self._parts), usage=self._usage)
+        self._finish()
+
+    @property
+    def response(self) -> ResponseWithUsage:
+        """전체 응답을 반환합니다. 아직 다 받지 않았다면 끝까지 받습니다.
+
+        도중에 닫은 스트림이면 StreamClosedError가 발생합니다.
+        """
+        if self._response is None:
+            for _ in self:
+                pass
+        return self._response
+
+    @property
+    def usage(self) -> Usage | None:
+        """토큰 사용량 정보를 반환합니다. (스트림을 끝까지 받은 뒤에 채워집니다)"""
+        return self._usage
+
+    @property
+    def cache_hit(self) -> bool:
+        """캐시에서 가져온 응답이면 True를 반환합니다."""
+        return self._response is not None and self._response.cache_hit
+
+    @property
+    def error(self) -> Exception | None:
+        """스트림을 받는 도중 발생한 예외를 반환합니다."""
+        return self._error
+
+
+# 프로세스 전역 OpenAI 클라이언트 레지스트리
+# (api_key, base_url, timeout, max_retries) 조합마다 클라이언트를 하나만 만들어 재사용합니다.
+_openai_clients: dict[tuple, OpenAI] = {}
+_openai_clients_lock = threading.Lock()
+
+
+def get_openai_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+) -> OpenAI:
+    """설정별로 공유되는 OpenAI 클라이언트를 반환합니다.
+
+    OpenAI 클라이언트는 내부에 HTTP 커넥션 풀(keep-alive)과 TLS 세션을
+    가지고 있으므로, 호출마다 새로 만들지 않고 재사용해야 연결 수립 비용을
+    아낄 수 있습니다. Streamlit처럼 여러 스크립트 스레드에서 동시에 호출해도
+    안전하도록 생성 시점에 락을 사용합니다.
+
+    Args:
+        api_key (str | None, optional): OpenAI API 키. None이면 OPENAI_API_KEY 환경변수 사용.
+        base_url (str | None, optional): API 주소. None이면 OPENAI_BASE_URL 환경변수 또는 기본 주소 사용.
+        timeout (float | None, optional): 요청 타임아웃(초). None이면 라이브러리 기본값.
+        max_retries (int | None, optional): 라이브러리 자체 재시도 횟수. None이면 라이브러리 기본값.
+
+    Returns:
+        OpenAI: 재사용 가능한 OpenAI 클라이언트
+    """
+    # 환경변수 값까지 반영하여 키를 만들어야, 키가 바뀌었을 때 다른 클라이언트를 사용합니다.
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+    key = (api_key, base_url, timeout, max_retries)
+
+    client = _openai_clients.get(key)
+    if client is None:
+        with _openai_clients_lock:
+            # 락을 기다리는 동안 다른 스레드가 먼저 생성했을 수 있습니다.
+            client = _openai_clients.get(key)
+            if client is None:
+                options = {"api_key": api_key, "base_url": base_url}
+                if timeout is not None:
+                    options["timeout"] = timeout
+                if max_retries is not None:
+                    options["max_retries"] = max_retries
+                client = OpenAI(**options)
+                _openai_clients[key] = client
+    return client
+
+
+def clear_openai_clients() -> None:
+    """레지스트리에 보관된 OpenAI 클라이언트를 모두 닫고 비웁니다."""
+    with _openai_clients_lock:
+        for client in _openai_clients.values():
+            client.close()
+        _openai_clients.clear()
 
 
 def get_mime_type(file_path: str) -> str:
@@ -116,6 +355,228 @@ def get_mime_type(file_path: str) -> str:
     return mime_type or "application/octet-stream"
 
 
+@dataclass
+class RetryPolicy:
+    """make_response의 재시도 정책.
+
+    타임아웃, 연결 오류, 그리고 retry_statuses에 해당하는 HTTP 오류(429, 5xx 등)에 대해
+    지수 백오프로 재시도합니다. jitter=True이면 대기 시간을 0~백오프 사이에서 무작위로
+    골라(full jitter), 여러 요청이 동시에 재시도하며 몰리는 것을 막습니다.
+
+    Attributes:
+        max_retries: 최대 재시도 횟수
+        base_delay: 첫 재시도 전 기본 대기 시간(초)
+        max_delay: 최대 대기 시간(초)
+        jitter: 대기 시간에 무작위성 적용 여부
+        retry_statuses: 재시도할 HTTP 상태 코드
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    jitter: bool = True
+    retry_statuses: tuple[int, ...] = (408, 409, 429, 500, 502, 503, 504)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """재시도할 오류인지 판단합니다."""
+        # APITimeoutError는 APIConnectionError의 하위 클래스입니다.
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in self.retry_statuses
+        return False
+
+    def get_delay(self, attempt: int, error: Exception | None = None) -> float:
+        """attempt번째(0부터 시작) 재시도 전에 기다릴 시간(초)을 계산합니다."""
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        # 서버가 Retry-After 헤더로 대기 시간을 알려준 경우 그 이상 기다림
+        if isinstance(error, openai.APIStatusError):
+            try:
+                retry_after = float(error.response.headers.get("retry-after", 0))
+            except ValueError:
+                retry_after = 0
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class _LatencyStats:
+    """(모델, 스트리밍 여부)별 최근 응답 시간을 기록하여 백분위수를 계산합니다."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[tuple, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: tuple, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: tuple, q: float) -> float | None:
+        """q 백분위수(0~100)를 반환합니다. 표본이 부족하면 None."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+
+_latency_stats = _LatencyStats()
+_hedge_executor: ThreadPoolExecutor | None = None
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _openai_clients_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+    return _hedge_executor
+
+
+def _close_unused_response(future: Future) -> None:
+    """헤징에서 사용하지 않은 쪽 응답이 스트림이면 연결을 닫습니다."""
+    if not future.cancelled() and future.exception() is None:
+        close = getattr(future.result(), "close", None)
+        if close:
+            close()
+
+
+def _hedged_request(request: Callable, hedge_after: float):
+    """request를 실행하되, hedge_after초 안에 끝나지 않으면 한 번 더 보내 먼저 끝난 결과를 사용합니다."""
+    executor = _get_hedge_executor()
+    primary = executor.submit(request)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    backup = executor.submit(request)
+    futures = [primary, backup]
+    error = None
+    for future in as_completed(futures):
+        try:
+            response = future.result()
+        except Exception as e:
+            error = e  # 다른 쪽 결과를 기다림
+            continue
+        for other in futures:
+            if other is not future:
+                other.add_done_callback(_close_unused_response)
+        return response
+    raise error
+
+
+def _request_with_policy(
+    request: Callable,
+    retry: RetryPolicy | None,
+    hedge_after: float | Literal["p95"] | None,
+    latency_key: tuple,
+):
+    """재시도 정책과 헤징을 적용하여 request를 실행합니다."""
+    attempt = 0
+    while True:
+        deadline = (
+            _latency_stats.percentile(latency_key, 95) if hedge_after == "p95" else hedge_after
+        )
+        start = time.perf_counter()
+        try:
+            response = _hedged_request(request, deadline) if deadline else request()
+        except Exception as e:
+            if retry is None or attempt >= retry.max_retries or not retry.is_retryable(e):
+                raise
+            time.sleep(retry.get_delay(attempt, e))
+            attempt += 1
+            continue
+        _latency_stats.record(latency_key, time.perf_counter() - start)
+        return response
+
+
+def _record_response_metrics(model: str, started_at: float, response) -> None:
+    """응답의 계측 정보를 기록합니다. 스트리밍이면 스트림이 끝난 뒤에 기록합니다."""
+
+    def cost_of(usage: Usage | None) -> float | None:
+        if usage is None:
+            return None
+        return estimate_cost(model, usage.input_tokens, usage.output_tokens)
+
+    if isinstance(response, StreamingResponse):
+        response.add_done_callback(
+            lambda s: record_call(
+                make_call_metrics(
+                    model,
+                    started_at,
+                    usage=s.usage,
+                    cost=cost_of(s.usage),
+                    first_token_at=s.first_token_at,
+                    cache_hit=s.cache_hit,
+                    stream=True,
+                    error=s.error,
+                )
+            )
+        )
+        return
+
+    record_call(
+        make_call_metrics(
+            model,
+            started_at,
+            usage=response.usage,
+            cost=cost_of(response.usage),
+            cache_hit=response.cache_hit,
+        )
+    )
+
+
+def _instrumented(func: Callable) -> Callable:
+    """make_response / amake_response 호출을 계측하여 llm_metrics 싱크에 기록합니다.
+
+    등록된 싱크가 없으면 계측 없이 그대로 호출합니다.
+    """
+    signature = inspect.signature(func)
+
+    def call_info(args: tuple, kwargs: dict) -> tuple[str, bool]:
+        arguments = signature.bind(*args, **kwargs).arguments
+        model = arguments.get("model", signature.parameters["model"].default)
+        return model, arguments.get("stream", False)
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not has_metrics_sinks():
+                return await func(*args, **kwargs)
+            model, stream = call_info(args, kwargs)
+            started_at = time.perf_counter()
+            try:
+                response = await func(*args, **kwargs)
+            except Exception as e:
+                record_call(make_call_metrics(model, started_at, stream=stream, error=e))
+                raise
+            _record_response_metrics(model, started_at, response)
+            return response
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not has_metrics_sinks():
+            return func(*args, **kwargs)
+        model, stream = call_info(args, kwargs)
+        started_at = time.perf_counter()
+        try:
+            response = func(*args, **kwargs)
+        except Exception as e:
+            record_call(make_call_metrics(model, started_at, stream=stream, error=e))
+            raise
+        _record_response_metrics(model, started_at, response)
+        return response
+
+    return wrapper
+
+
 # Overload for when response_format is provided (returns StructuredResponseWithUsage)
 @overload
 def make_response(
@@ -130,9 +591,44 @@ def make_response(
     model: str | ChatModel = "gpt-4o-mini",
     temperature: float = 0.25,
     api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    stream: Literal[False] = False,
+    cache: ResponseCache | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+    retry: RetryPolicy | None = None,
+    hedge_after: float | Literal["p95"] | None = None,
 ) -> StructuredResponseWithUsage[T]: ...
 
 
+# Overload for when stream=True (returns StreamingResponse)
+@overload
+def make_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    *,
+    response_format: None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    stream: Literal[True],
+    cache: ResponseCache | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+    retry: RetryPolicy | None = None,
+    hedge_after: float | Literal["p95"] | None = None,
+) -> StreamingResponse: ...
+
+
 # Overload for when response_format is not provided (returns ResponseWithUsage)
 @overload
 def make_response(
@@ -147,9 +643,19 @@ def make_response(
     api_key: str | None = None,
     *,
     response_format: None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    stream: Literal[False] = False,
+    cache: ResponseCache | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+    retry: RetryPolicy | None = None,
+    hedge_after: float | Literal["p95"] | None = None,
 ) -> ResponseWithUsage: ...
 
 
+@_instrumented
 def make_response(
     user_content: str,
     file_path: str | None = None,  # 새로운 범용 파일 경로 (이미지/PDF)
@@ -163,7 +669,16 @@ def make_response(
     temperature: float = 0.25,
     api_key: str | None = None,
     response_format: type[BaseModel] | None = None,  # 새로운 파라미터
-) -> ResponseWithUsage | StructuredResponseWithUsage:
+    base_url: str | None = None,
+    timeout: float | None = None,
+    stream: bool = False,
+    cache: ResponseCache | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+    retry: RetryPolicy | None = None,
+    hedge_after: float | Literal["p95"] | None = None,
+) -> ResponseWithUsage | StructuredResponseWithUsage | StreamingResponse:
     """OpenAI의 Chat Completion API를 사용하여 AI의 응답을 생성합니다.
 
     이미지 파일(.png, .jpg, .jpeg)과 PDF 파일을 지원하며,
@@ -180,11 +695,30 @@ def make_response(
         temperature (float, optional): 생성 결과의 창의성. 기본값은 0.25.
         api_key (str | None, optional): OpenAI API 키. 기본값은 None.
         response_format (type[BaseModel] | None, optional): Pydantic 모델 클래스. 기본값은 None.
+        base_url (str | None, optional): OpenAI 호환 API 주소. 기본값은 None.
+        timeout (float | None, optional): 요청 타임아웃(초). 기본값은 None.
+        stream (bool, optional): True이면 응답을 조각 단위로 받는 StreamingResponse 반환.
+            response_format과 함께 사용할 수 없습니다. 기본값은 False.
+        cache (ResponseCache | None, optional): 응답 캐시. 지정하면 같은 요청에 대해
+            API를 호출하지 않고 저장된 응답(cache_hit=True)을 반환합니다. 기본값은 None.
+        image_urls (list[str] | None, optional): 함께 보낼 이미지 URL(data URL 포함) 목록.
+            PDF 페이지 이미지처럼 여러 장을 한 번에 보낼 때 사용합니다. 기본값은 None.
+        max_input_tokens (int | None, optional): 입력 토큰 예산. 호출 전에 로컬에서
+            토큰 수를 계산하여 예산을 넘으면 on_budget_exceeded에 따라 처리합니다. 기본값은 None.
+        on_budget_exceeded ("error" | "truncate", optional): 예산 초과 시
+            "error"면 TokenBudgetExceededError 발생, "truncate"면 사용자 메시지를 잘라서 요청합니다.
+            기본값은 "error".
+        retry (RetryPolicy | None, optional): 재시도 정책. 지정하면 라이브러리 자체 재시도 대신
+            지터(jitter)가 적용된 지수 백오프로 재시도합니다. 기본값은 None.
+        hedge_after (float | "p95" | None, optional): 첫 요청이 이 시간(초) 안에 응답하지 않으면
+            같은 요청을 한 번 더 보내고 먼저 도착한 응답을 사용합니다(hedging).
+            "p95"이면 최근 응답 시간의 95 백분위수를 기준으로 합니다. 기본값은 None.
 
     Returns:
-        ResponseWithUsage | StructuredResponseWithUsage:
+        ResponseWithUsage | StructuredResponseWithUsage | StreamingResponse:
             - response_format이 None인 경우: ResponseWithUsage (문자열처럼 사용 가능)
             - response_format이 제공된 경우: StructuredResponseWithUsage (파싱된 Pydantic 모델 포함)
+            - stream=True인 경우: StreamingResponse (순회하면 텍스트 조각 생성)
 
     Examples:
         일반 텍스트 응답:
@@ -202,17 +736,107 @@ def make_response(
         ... )
         >>> print(response.parsed.name)  # "철수"
         >>> print(response.parsed.age)  # 25
+
+        스트리밍 응답:
+        >>> stream = make_response("안녕하세요", stream=True)
+        >>> st.write_stream(stream)
+        >>> print(stream.usage.total_tokens)
     """
-    # 1. 호환성 처리 (간단하게)
-    file_path = file_path or image_path
-    file = file or image_file
+    if stream and response_format is not None:
+        raise ValueError("stream=True는 response_format과 함께 사용할 수 없습니다.")
+
+    # 1~3. 메시지 구성
+    messages = _build_messages(
+        user_content,
+        file_path=file_path or image_path,  # 호환성 처리
+        file=file or image_file,
+        system_content=system_content,
+        image_urls=image_urls,
+    )
+
+    # 입력 토큰 예산 확인 (API 호출 전에 로컬에서 계산)
+    if max_input_tokens is not None:
+        messages = _apply_token_budget(messages, model, max_input_tokens, on_budget_exceeded)
+
+    # 캐시 확인 (opt-in)
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(messages, model, temperature, response_format)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cached_response = _from_cache(*cached, response_format=response_format)
+            return StreamingResponse.from_response(cached_response) if stream else cached_response
+
+    # 4. API 호출 (커넥션 풀 재사용을 위해 공유 클라이언트 사용)
+    # 재시도 정책을 지정한 경우에는 라이브러리 자체 재시도를 끄고 정책에 따라 재시도합니다.
+    client = get_openai_client(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=0 if retry is not None else None,
+    )
+
+    def request():
+        # Pydantic 모델이 제공된 경우 - Structured Output 사용
+        if response_format is not None:
+            # beta.chat.completions.parse를 사용하여 구조화된 출력 생성
+            return client.beta.chat.completions.parse(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+                temperature=temperature,
+            )
+
+        # 스트리밍 - 텍스트 조각을 받는 대로 전달하고, 마지막 조각에서 usage를 받음
+        if stream:
+            return client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
 
-    # 2. 메시지 리스트 초기화
+        # 기존 방식 - 일반 텍스트 응답
+        return client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+        )
+
+    response = _request_with_policy(
+        request, retry=retry, hedge_after=hedge_after, latency_key=(model, stream)
+    )
+
+    if stream:
+        streaming = StreamingResponse(response)
+        if cache is not None:
+            streaming.add_done_callback(
+                lambda s: s.error is None and _to_cache(cache, cache_key, s.response)
+            )
+        return streaming
+
+    # 5. Usage 정보 추출 및 반환
+    result = _to_response(response, response_format)
+    if cache is not None:
+        _to_cache(cache, cache_key, result)
+    return result
+
+
+def _build_messages(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    image_urls: list[str] | None = None,
+) -> list[dict]:
+    """make_response/amake_response에서 사용할 메시지 리스트를 구성합니다."""
+    # 메시지 리스트 초기화
     messages = []
     if system_content:
         messages.append({"role": "system", "content": system_content})
 
-    # 3. 사용자 메시지 구성
+    # 사용자 메시지 구성
     user_message_content = user_content  # 기본값: 텍스트만
 
     if file_path or file:
@@ -242,61 +866,429 @@ def make_response(
             file_dict,
         ]
 
+    if image_urls:
+        # 여러 장의 이미지를 image_url 파트로 추가
+        if isinstance(user_message_content, str):
+            user_message_content = [{"type": "text", "text": user_content}]
+        user_message_content += [
+            {"type": "image_url", "image_url": {"url": url, "detail": "high"}}
+            for url in image_urls
+        ]
+
     messages.append({"role": "user", "content": user_message_content})
+    return messages
 
-    # 4. API 호출
-    client = OpenAI(api_key=api_key)
 
-    # Pydantic 모델이 제공된 경우 - Structured Output 사용
-    if response_format is not None:
-        # beta.chat.completions.parse를 사용하여 구조화된 출력 생성
-        response = client.beta.chat.completions.parse(
-            model=model,
-            messages=messages,
-            response_format=response_format,
-            temperature=temperature,
-        )
+def _apply_token_budget(
+    messages: list[dict],
+    model: str,
+    max_input_tokens: int,
+    on_budget_exceeded: Literal["error", "truncate"],
+) -> list[dict]:
+    """입력 토큰 수가 예산을 넘으면 예외를 발생시키거나 메시지를 자릅니다."""
+    input_tokens = count_message_tokens(messages, model)
+    if input_tokens <= max_input_tokens:
+        return messages
+    if on_budget_exceeded == "truncate":
+        return fit_messages_to_budget(messages, max_input_tokens, model)
+    raise TokenBudgetExceededError(input_tokens, max_input_tokens)
 
-        # Usage 정보 추출
-        usage = (
-            Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            )
-            if response.usage
-            else None
-        )
 
+def estimate_input_tokens(
+    user_content: str,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+) -> TokenEstimate:
+    """make_response를 호출하기 전에 입력 토큰 수와 예상 비용을 계산합니다.
+
+    Args:
+        user_content (str): 사용자 메시지
+        system_content (str | None, optional): 시스템 메시지. 기본값은 None.
+        model (str | ChatModel, optional): 사용할 모델. 기본값은 "gpt-4o-mini".
+
+    Returns:
+        TokenEstimate: 예상 입력 토큰 수와 비용(USD)
+
+    Examples:
+        >>> estimate = estimate_input_tokens(html_str)
+        >>> print(estimate.input_tokens, estimate.input_cost)
+    """
+    messages = _build_messages(user_content, system_content=system_content)
+    return estimate_messages(messages, model)
+
+
+def _make_usage(completion_usage) -> Usage | None:
+    """OpenAI 응답의 usage 객체를 Usage로 변환합니다."""
+    if not completion_usage:
+        return None
+    return Usage(
+        input_tokens=completion_usage.prompt_tokens,
+        output_tokens=completion_usage.completion_tokens,
+        total_tokens=completion_usage.total_tokens,
+    )
+
+
+def _to_response(
+    response, response_format: type[BaseModel] | None
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """Chat Completion 응답을 ResponseWithUsage 계열 객체로 변환합니다."""
+    usage = _make_usage(response.usage)
+
+    if response_format is not None:
         # 파싱된 객체와 usage 정보를 함께 반환
         return StructuredResponseWithUsage(
             parsed=response.choices[0].message.parsed,
             usage=usage,
         )
 
-    # 기존 방식 - 일반 텍스트 응답
-    else:
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-        )
+    return ResponseWithUsage(
+        content=response.choices[0].message.content or "",
+        usage=usage,
+    )
 
-        # 5. Usage 정보 추출 및 반환
-        usage = (
-            Usage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            )
-            if response.usage
-            else None
-        )
 
-        return ResponseWithUsage(
-            content=response.choices[0].message.content or "",
+def _to_cache(
+    cache: ResponseCache,
+    key: str,
+    response: ResponseWithUsage | StructuredResponseWithUsage,
+) -> None:
+    """응답을 캐시에 저장합니다. 구조화된 응답은 JSON 문자열로 저장합니다.
+
+    모델이 응답을 거부하여 parsed가 None인 구조화된 응답은 저장하지 않습니다.
+    """
+    if isinstance(response, StructuredResponseWithUsage) and response.parsed is None:
+        return
+    content = (
+        response.parsed.model_dump_json()
+        if isinstance(response, StructuredResponseWithUsage)
+        else str(response)
+    )
+    usage = asdict(response.usage) if response.usage else None
+    cache.set(key, content, usage)
+
+
+def _from_cache(
+    content: str, usage: dict | None, response_format: type[BaseModel] | None
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """캐시에 저장된 값을 응답 객체로 되돌립니다."""
+    usage = Usage(**usage) if usage else None
+    if response_format is not None:
+        return StructuredResponseWithUsage(
+            parsed=response_format.model_validate_json(content),
             usage=usage,
+            cache_hit=True,
         )
+    return ResponseWithUsage(content=content, usage=usage, cache_hit=True)
+
+
+# 이벤트 루프별 AsyncOpenAI 클라이언트 레지스트리
+# 비동기 HTTP 커넥션은 생성된 이벤트 루프에 묶이므로 루프마다 따로 관리합니다.
+_async_openai_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_shared_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_async_openai_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+) -> AsyncOpenAI:
+    """현재 이벤트 루프에서 공유되는 AsyncOpenAI 클라이언트를 반환합니다.
+
+    Args:
+        api_key (str | None, optional): OpenAI API 키. None이면 OPENAI_API_KEY 환경변수 사용.
+        base_url (str | None, optional): API 주소. None이면 OPENAI_BASE_URL 환경변수 또는 기본 주소 사용.
+        timeout (float | None, optional): 요청 타임아웃(초). None이면 라이브러리 기본값.
+
+    Returns:
+        AsyncOpenAI: 현재 이벤트 루프에서 재사용 가능한 비동기 클라이언트
+    """
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+    key = (api_key, base_url, timeout)
+
+    loop = asyncio.get_running_loop()
+    with _openai_clients_lock:
+        clients = _async_openai_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            options = {"api_key": api_key, "base_url": base_url}
+            if timeout is not None:
+                options["timeout"] = timeout
+            client = AsyncOpenAI(**options)
+            clients[key] = client
+    return client
+
+
+def get_shared_semaphore(limit: int) -> asyncio.Semaphore:
+    """현재 이벤트 루프에서 limit 값별로 공유되는 세마포어를 반환합니다.
+
+    amake_response(concurrency=10)처럼 정수로 동시 실행 수를 지정하면,
+    같은 값을 지정한 모든 호출이 이 세마포어 하나를 함께 사용합니다.
+    """
+    loop = asyncio.get_running_loop()
+    semaphores = _shared_semaphores.setdefault(loop, {})
+    if limit not in semaphores:
+        semaphores[limit] = asyncio.Semaphore(limit)
+    return semaphores[limit]
+
+
+# Overload for when response_format is provided (returns StructuredResponseWithUsage)
+@overload
+async def amake_response(
+    user_content: str,
+    *,
+    response_format: type[T],
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    concurrency: asyncio.Semaphore | int | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+) -> StructuredResponseWithUsage[T]: ...
+
+
+# Overload for when response_format is not provided (returns ResponseWithUsage)
+@overload
+async def amake_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    *,
+    response_format: None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    concurrency: asyncio.Semaphore | int | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+) -> ResponseWithUsage: ...
+
+
+@_instrumented
+async def amake_response(
+    user_content: str,
+    file_path: str | None = None,
+    file: FileUploadProtocol | BinaryIO | None = None,
+    image_path: str | None = None,
+    image_file: FileUploadProtocol | BinaryIO | None = None,
+    system_content: str | None = None,
+    model: str | ChatModel = "gpt-4o-mini",
+    temperature: float = 0.25,
+    api_key: str | None = None,
+    response_format: type[BaseModel] | None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    concurrency: asyncio.Semaphore | int | None = None,
+    image_urls: list[str] | None = None,
+    max_input_tokens: int | None = None,
+    on_budget_exceeded: Literal["error", "truncate"] = "error",
+) -> ResponseWithUsage | StructuredResponseWithUsage:
+    """make_response의 비동기(asyncio) 버전입니다.
+
+    AsyncOpenAI를 사용하므로 하나의 프로세스에서 여러 요청을 동시에
+    진행할 수 있습니다. 인자와 반환 타입은 make_response와 같습니다.
+
+    Args:
+        concurrency (asyncio.Semaphore | int | None, optional): 동시 요청 수 제한.
+            세마포어를 직접 넘기거나, 정수를 지정하면 같은 값을 쓰는 호출끼리
+            공유하는 세마포어를 사용합니다. None이면 제한하지 않습니다.
+        그 외 인자는 make_response를 참고하세요.
+
+    Returns:
+        ResponseWithUsage | StructuredResponseWithUsage: make_response와 동일
+
+    Examples:
+        >>> async def main():
+        ...     tasks = [amake_response(q, concurrency=20) for q in questions]
+        ...     return await asyncio.gather(*tasks)
+        >>> responses = asyncio.run(main())
+    """
+    messages = _build_messages(
+        user_content,
+        file_path=file_path or image_path,
+        file=file or image_file,
+        system_content=system_content,
+        image_urls=image_urls,
+    )
+
+    # 입력 토큰 예산 확인 (API 호출 전에 로컬에서 계산)
+    if max_input_tokens is not None:
+        messages = _apply_token_budget(messages, model, max_input_tokens, on_budget_exceeded)
+
+    if isinstance(concurrency, int):
+        concurrency = get_shared_semaphore(concurrency)
+
+    client = get_async_openai_client(api_key=api_key, base_url=base_url, timeout=timeout)
+
+    async with concurrency or nullcontext():
+        if response_format is not None:
+            response = await client.beta.chat.completions.parse(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+                temperature=temperature,
+            )
+        else:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+            )
+
+    return _to_response(response, response_format)
+
+
+class TokenRateLimiter:
+    """토큰/분(TPM) 예산을 지키도록 요청 시작을 조절하는 거버너.
+
+    요청 전에 예상 토큰 수만큼 예약(acquire)하고, 응답을 받으면 Usage의
+    실제 토큰 수로 정산(settle)합니다. 최근 window초 동안 사용한 토큰과
+    진행 중인 요청의 예약분 합계가 한도를 넘지 않도록 대기합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, tokens_per_window: int, window: float = 60.0):
+        """
+        Args:
+            tokens_per_window: window초 동안 허용할 토큰 수 (TPM이면 window=60)
+            window: 사용량을 합산하는 구간(초)
+        """
+        self.limit = tokens_per_window
+        self.window = window
+        self._cond = threading.Condition()
+        self._used: deque[tuple[float, int]] = deque()  # (정산 시각, 토큰 수)
+        self._reserved = 0
+
+    def _expire(self, now: float) -> None:
+        while self._used and now - self._used[0][0] >= self.window:
+            self._used.popleft()
+
+    def acquire(self, estimated_tokens: int) -> int:
+        """예산이 생길 때까지 기다린 뒤 estimated_tokens를 예약하고 예약량을 반환합니다."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                in_use = sum(n for _, n in self._used) + self._reserved
+                # 단일 요청이 한도보다 크더라도 다른 요청이 없으면 진행 (교착 방지)
+                if in_use + estimated_tokens <= self.limit or in_use == 0:
+                    self._reserved += estimated_tokens
+                    return estimated_tokens
+                # 가장 오래된 사용량이 만료되거나 다른 요청이 정산될 때까지 대기
+                wait = self.window - (now - self._used[0][0]) if self._used else None
+                self._cond.wait(timeout=wait)
+
+    def settle(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """예약을 해제하고 실제 사용한 토큰 수를 기록합니다."""
+        with self._cond:
+            self._reserved -= reserved_tokens
+            if actual_tokens:
+                self._used.append((time.monotonic(), actual_tokens))
+            self._cond.notify_all()
+
+
+@dataclass
+class BatchResult:
+    """make_responses_batch의 항목별 결과.
+
+    Attributes:
+        index: 입력 목록에서의 위치
+        response: 성공 시 응답 (ResponseWithUsage | StructuredResponseWithUsage)
+        error: 실패 시 발생한 예외
+    """
+
+    index: int
+    response: ResponseWithUsage | StructuredResponseWithUsage | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def make_responses_batch(
+    inputs: Sequence[str | dict],
+    *,
+    response_format: type[BaseModel] | None = None,
+    max_concurrency: int = 8,
+    tpm_limit: int | None = None,
+    rate_limiter: TokenRateLimiter | None = None,
+    **kwargs,
+) -> list[BatchResult]:
+    """여러 프롬프트를 동시에 make_response로 처리합니다.
+
+    스레드 풀로 최대 max_concurrency개의 요청을 동시에 보내고, tpm_limit이
+    지정되면 응답의 Usage로 토큰/분 예산을 관리하여 429 오류를 피합니다.
+    일부 항목이 실패해도 나머지는 계속 처리하며, 결과는 입력 순서대로 반환합니다.
+
+    Args:
+        inputs (Sequence[str | dict]): 사용자 메시지 목록.
+            dict인 경우 make_response의 키워드 인자로 사용합니다 (user_content 필수).
+        response_format (type[BaseModel] | None, optional): 모든 항목에 적용할 Pydantic 모델.
+        max_concurrency (int, optional): 동시에 진행할 최대 요청 수. 기본값은 8.
+        tpm_limit (int | None, optional): 분당 토큰 한도. None이면 제한하지 않습니다.
+        rate_limiter (TokenRateLimiter | None, optional): 직접 만든 거버너 (tpm_limit 대신 사용).
+        **kwargs: 모든 항목에 공통으로 적용할 make_response 인자 (model, api_key 등).
+
+    Returns:
+        list[BatchResult]: 입력 순서와 같은 결과 목록
+
+    Examples:
+        >>> results = make_responses_batch(
+        ...     documents, response_format=PersonList, max_concurrency=16, tpm_limit=200_000
+        ... )
+        >>> for result in results:
+        ...     print(result.response.parsed if result.ok else result.error)
+    """
+    if rate_limiter is None and tpm_limit is not None:
+        rate_limiter = TokenRateLimiter(tpm_limit)
+
+    # 문자 수 대비 실제 토큰 수 비율 (처음에는 1문자=1토큰으로 보수적으로 추정)
+    tokens_per_char = [1.0]
+    ratio_lock = threading.Lock()
+
+    def run(index: int, item: str | dict) -> BatchResult:
+        options = {**kwargs, **(item if isinstance(item, dict) else {"user_content": item})}
+        if response_format is not None:
+            options["response_format"] = response_format
+
+        chars = len(options["user_content"]) + len(options.get("system_content") or "")
+        reserved = 0
+        actual = 0
+        try:
+            if rate_limiter is not None:
+                reserved = rate_limiter.acquire(max(1, int(chars * tokens_per_char[0])))
+            response = make_response(**options)
+            if response.usage:
+                actual = response.usage.total_tokens
+                with ratio_lock:
+                    tokens_per_char[0] = max(tokens_per_char[0] * 0.8, actual / max(chars, 1))
+            else:
+                actual = reserved
+            return BatchResult(index=index, response=response)
+        except Exception as e:
+            return BatchResult(index=index, error=e)
+        finally:
+            if rate_limiter is not None:
+                rate_limiter.settle(reserved, actual)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [executor.submit(run, i, item) for i, item in enumerate(inputs)]
+        return [future.result() for future in futures]
 
 
 def download_file(
@@ -346,6 +1338,95 @@ def multiply(a: int, b: int) -> int:
     return a * b
 
 
+# base64 data URL 메모 캐시 (LRU)
+# 같은 내용의 파일을 다시 보낼 때(Streamlit rerun 등) 읽기/인코딩을 건너뜁니다.
+# 메모한 URL은 프로세스가 끝날 때까지 남으므로 전체 크기를 _BASE64_MEMO_MAX_CHARS로 제한하고,
+# 한 번만 보내는 파일은 make_base64_url(..., memoize=False)로 메모하지 않을 수 있습니다.
+_BASE64_CHUNK_SIZE = 3 * 1024 * 1024  # 3의 배수여야 조각 사이에 패딩(=)이 생기지 않습니다.
+_BASE64_MEMO_MAX_CHARS = 32 * 1024 * 1024  # 메모할 URL의 전체 글자 수 (0이면 메모하지 않음)
+_BASE64_PATH_HASHES_MAX = 1024  # 기억할 (경로, 크기, 수정 시각) 수
+_base64_url_memo: OrderedDict[tuple[str, str], str] = OrderedDict()  # (내용 해시, MIME) → URL
+_base64_path_hashes: OrderedDict[tuple, str] = OrderedDict()  # (경로, 크기, 수정 시각) → 내용 해시
+_base64_memo_chars = 0
+_base64_memo_lock = threading.Lock()
+
+
+def _get_memoized_url(key: tuple[str, str]) -> str | None:
+    with _base64_memo_lock:
+        url = _base64_url_memo.get(key)
+        if url is not None:
+            _base64_url_memo.move_to_end(key)
+        return url
+
+
+def _memoize_url(key: tuple[str, str], url: str) -> None:
+    global _base64_memo_chars
+    if len(url) > _BASE64_MEMO_MAX_CHARS:
+        return
+    with _base64_memo_lock:
+        if key in _base64_url_memo:
+            return
+        _base64_url_memo[key] = url
+        _base64_memo_chars += len(url)
+        # 용량을 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+        while _base64_memo_chars > _BASE64_MEMO_MAX_CHARS:
+            _, old_url = _base64_url_memo.popitem(last=False)
+            _base64_memo_chars -= len(old_url)
+
+
+def _get_path_hash(signature: tuple) -> str | None:
+    with _base64_memo_lock:
+        content_hash = _base64_path_hashes.get(signature)
+        if content_hash is not None:
+            _base64_path_hashes.move_to_end(signature)
+        return content_hash
+
+
+def _remember_path_hash(signature: tuple, content_hash: str) -> None:
+    with _base64_memo_lock:
+        _base64_path_hashes[signature] = content_hash
+        _base64_path_hashes.move_to_end(signature)
+        # 파일이 바뀔 때마다 새 항목이 생기므로 오래 사용하지 않은 항목부터 삭제
+        while len(_base64_path_hashes) > _BASE64_PATH_HASHES_MAX:
+            _base64_path_hashes.popitem(last=False)
+
+
+def _read_aligned_chunks(f: BinaryIO, hasher) -> Iterator[bytes]:
+    """파일을 3바이트 배수 크기의 조각으로 읽으면서 해시를 갱신합니다."""
+    rest = b""
+    while chunk := f.read(_BASE64_CHUNK_SIZE):
+        hasher.update(chunk)
+        if rest:
+            chunk = rest + chunk
+        cut = len(chunk) - len(chunk) % 3
+        rest = chunk[cut:]
+        yield chunk[:cut]
+    if rest:
+        yield rest
+
+
+def _encode_data_url(mime_type: str, chunks: Iterable, size: int) -> str:
+    """조각 단위로 base64 인코딩하여 data URL 문자열을 만듭니다.
+
+    결과 크기만큼 bytearray를 한 번만 할당하고 인코딩한 조각을 제자리에 채우므로,
+    원본 전체 bytes나 base64 bytes의 중간 사본이 생기지 않습니다.
+    만든 URL은 호출한 쪽에서 메모 캐시에 저장하며, 메모 캐시는 전체 크기가
+    _BASE64_MEMO_MAX_CHARS(기본 32M 글자, 약 24MB 파일)를 넘지 않도록 오래된 항목부터 삭제합니다.
+    """
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    buffer = bytearray(len(prefix) + (size + 2) // 3 * 4)
+    buffer[: len(prefix)] = prefix
+
+    pos = len(prefix)
+    for chunk in chunks:
+        encoded = b2a_base64(chunk, newline=False)
+        buffer[pos : pos + len(encoded)] = encoded
+        pos += len(encoded)
+    del buffer[pos:]  # 예상보다 짧게 읽힌 경우 남은 공간 제거
+
+    return buffer.decode("ascii")
+
+
 def make_base64_url(
     file_path: str | None = None,
     file: FileUploadProtocol | BinaryIO | None = None,
@@ -353,14 +1434,21 @@ def make_base64_url(
     image_file: (
         FileUploadProtocol | BinaryIO | None
     ) = None,  # deprecated but kept for compatibility
+    memoize: bool = True,
 ) -> str:
     """파일을 base64 URL로 변환합니다.
 
+    파일을 조각 단위로 인코딩하여 메모리 사용량을 줄이고, 내용 해시로
+    결과를 메모해 두어 같은 파일을 다시 변환할 때는 읽기/인코딩을 생략합니다.
+    파일 경로는 (경로, 크기, 수정 시각)이 같으면 다시 읽지 않습니다.
+    메모 캐시의 전체 크기는 _BASE64_MEMO_MAX_CHARS로 제한됩니다.
+
     Args:
         file_path (str | None): 파일 경로 (새로운 방식)
         file (FileUploadProtocol | BinaryIO | None): 파일 객체 (새로운 방식)
         image_path (str | None): 이미지 파일 경로 (호환성 유지)
         image_file (FileUploadProtocol | BinaryIO | None): 이미지 파일 객체 (호환성 유지)
+        memoize (bool): False이면 결과를 메모 캐시에 저장하지 않습니다. (한 번만 보내는 큰 파일 등)
 
     Returns:
         str: base64로 인코딩된 data URL
@@ -374,18 +1462,185 @@ def make_base64_url(
     if file_path:
         # 파일 경로에서 MIME 타입 추론
         mime_type = get_mime_type(file_path)
+        stat = os.stat(file_path)
+        signature = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+        content_hash = _get_path_hash(signature)
+        if content_hash:
+            url = _get_memoized_url((content_hash, mime_type))
+            if url is not None:
+                return url
+
+        # 읽기, 해시 계산, 인코딩을 한 번에 처리
+        hasher = hashlib.sha256()
         with open(file_path, "rb") as f:
-            data: bytes = f.read()
+            url = _encode_data_url(mime_type, _read_aligned_chunks(f, hasher), stat.st_size)
+        content_hash = hasher.hexdigest()
+        if memoize:
+            _remember_path_hash(signature, content_hash)
+            _memoize_url((content_hash, mime_type), url)
+        return url
+
     elif file:
         # 파일 객체에서 MIME 타입 가져오기
         mime_type = file.type if hasattr(file, "type") else "application/octet-stream"
-        data = file.read()
+        # BytesIO 계열(Streamlit UploadedFile 포함)은 복사 없이 내부 버퍼를 사용
+        # read()처럼 현재 위치부터 끝까지 사용하고, 위치를 끝으로 옮깁니다.
+        if hasattr(file, "getbuffer"):
+            buffer = file.getbuffer()[file.tell() :]
+            file.seek(0, os.SEEK_END)
+        else:
+            buffer = memoryview(file.read())
+        with buffer:
+            key = (hashlib.sha256(buffer).hexdigest(), mime_type)
+            url = _get_memoized_url(key)
+            if url is None:
+                chunks = (
+                    buffer[i : i + _BASE64_CHUNK_SIZE]
+                    for i in range(0, len(buffer), _BASE64_CHUNK_SIZE)
+                )
+                url = _encode_data_url(mime_type, chunks, len(buffer))
+                if memoize:
+                    _memoize_url(key, url)
+        return url
+
     else:
         raise ValueError("file_path 혹은 file 인자를 지정해주세요.")
 
-    b64_str: str = b64encode(data).decode()
-    url = f"data:{mime_type};base64," + b64_str
-    return url
+
+# PDF 페이지 렌더링 워커 프로세스에서 열어둔 문서 (프로세스마다 한 번만 엽니다)
+_worker_pdf_doc = None
+
+
+def _open_pdf_in_worker(pdf_path: str) -> None:
+    """ProcessPoolExecutor initializer: 워커 프로세스에서 PDF를 한 번 엽니다."""
+    import pymupdf
+
+    global _worker_pdf_doc
+    _worker_pdf_doc = pymupdf.open(pdf_path)
+
+
+def _render_page_in_worker(page_index: int, dpi: int, image_format: str) -> bytes:
+    """워커 프로세스에서 PDF 한 페이지를 이미지(bytes)로 렌더링합니다."""
+    pixmap = _worker_pdf_doc[page_index].get_pixmap(dpi=dpi)
+    return pixmap.tobytes(output=image_format)
+
+
+def render_pdf_pages(
+    pdf_path: str,
+    pages: Sequence[int] | None = None,
+    dpi: int = 300,
+    image_format: Literal["png", "jpeg"] = "png",
+    max_workers: int | None = None,
+) -> Iterator[tuple[int, bytes]]:
+    """PDF 페이지들을 프로세스 풀에서 병렬로 이미지로 렌더링합니다.
+
+    렌더링이 끝난 페이지부터 페이지 순서대로 (페이지 번호, 이미지 bytes)를 생성합니다.
+    동시에 진행하는 페이지 수를 워커 수의 2배로 제한하므로, 받는 쪽(API 요청 등)이
+    느려도 렌더링된 이미지가 메모리에 무한정 쌓이지 않습니다.
+
+    Args:
+        pdf_path (str): PDF 파일 경로
+        pages (Sequence[int] | None, optional): 렌더링할 페이지 번호(1부터 시작). None이면 전체.
+        dpi (int, optional): 해상도. 기본값은 300.
+        image_format ("png" | "jpeg", optional): 이미지 포맷. 기본값은 "png".
+        max_workers (int | None, optional): 워커 프로세스 수. None이면 CPU 수.
+
+    Yields:
+        tuple[int, bytes]: (페이지 번호, 이미지 bytes)
+    """
+    import pymupdf
+
+    with pymupdf.open(pdf_path) as doc:
+        page_count = len(doc)
+    page_numbers = list(pages) if pages is not None else list(range(1, page_count + 1))
+    for page_no in page_numbers:
+        if not 1 <= page_no <= page_count:
+            raise ValueError(f"페이지 번호가 범위를 벗어났습니다: {page_no} (전체 {page_count}쪽)")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_open_pdf_in_worker,
+        initargs=(pdf_path,),
+    ) as executor:
+        pending: deque = deque()
+        remaining = iter(page_numbers)
+
+        def submit_next() -> None:
+            page_no = next(remaining, None)
+            if page_no is not None:
+                future = executor.submit(_render_page_in_worker, page_no - 1, dpi, image_format)
+                pending.append((page_no, future))
+
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        try:
+            while pending:
+                page_no, future = pending.popleft()
+                image = future.result()
+                submit_next()
+                yield page_no, image
+        finally:
+            # 중간에 순회를 멈춘 경우 아직 시작하지 않은 렌더링은 취소
+            for _, future in pending:
+                future.cancel()
+
+
+def make_pdf_page_responses(
+    user_content: str,
+    pdf_path: str,
+    pages: Sequence[int] | None = None,
+    pages_per_request: int = 1,
+    dpi: int = 300,
+    image_format: Literal["png", "jpeg"] = "png",
+    max_workers: int | None = None,
+    **kwargs,
+) -> Iterator[tuple[list[int], ResponseWithUsage | StructuredResponseWithUsage]]:
+    """PDF 페이지를 이미지로 변환하여 make_response(vision)로 보냅니다.
+
+    페이지 렌더링은 프로세스 풀에서 미리 진행되므로, API 응답을 기다리는 동안
+    다음 페이지들이 준비됩니다. pages_per_request로 여러 페이지를 한 요청에 묶을 수 있습니다.
+
+    Args:
+        user_content (str): 각 요청에 함께 보낼 지시사항
+        pdf_path (str): PDF 파일 경로
+        pages (Sequence[int] | None, optional): 보낼 페이지 번호(1부터 시작). None이면 전체.
+        pages_per_request (int, optional): 한 요청에 묶을 페이지 수. 기본값은 1.
+        dpi (int, optional): 렌더링 해상도. 기본값은 300.
+        image_format ("png" | "jpeg", optional): 이미지 포맷. 기본값은 "png".
+        max_workers (int | None, optional): 렌더링 워커 프로세스 수. None이면 CPU 수.
+        **kwargs: make_response에 전달할 인자 (model, response_format 등)
+
+    Yields:
+        tuple[list[int], ResponseWithUsage | StructuredResponseWithUsage]:
+            (요청에 포함된 페이지 번호 목록, 응답)
+
+    Examples:
+        >>> for page_numbers, response in make_pdf_page_responses(
+        ...     "도면의 표제란 정보를 추출해주세요", "drawings.pdf", dpi=200, pages_per_request=4
+        ... ):
+        ...     print(page_numbers, response)
+    """
+    mime_type = "image/png" if image_format == "png" else "image/jpeg"
+    batch: list[tuple[int, bytes]] = []
+
+    def send(batch: list[tuple[int, bytes]]):
+        image_urls = [_encode_data_url(mime_type, [image], len(image)) for _, image in batch]
+        response = make_response(user_content, image_urls=image_urls, **kwargs)
+        return [page_no for page_no, _ in batch], response
+
+    for page_no, image in render_pdf_pages(
+        pdf_path, pages=pages, dpi=dpi, image_format=image_format, max_workers=max_workers
+    ):
+        batch.append((page_no, image))
+        if len(batch) >= pages_per_request:
+            yield send(batch)
+            batch = []
+
+    if batch:
+        yield send(batch)
 
 
 def hwp_to_html(